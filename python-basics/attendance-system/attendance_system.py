@@ -11,7 +11,8 @@ Requisitos (resumen mapeado):
   1) Solicitar nombre/nickname.
   2) Mensaje de bienvenida usando operadores de cadena.
   3) Función de 'loading' <= 5 seg con mensaje.
-  4) Menú (while) en formato matricial con opciones: leer, escribir, crear, cambiar usuario, salir.
+  4) Menú (while) en formato matricial con opciones: leer, escribir, crear, cambiar usuario, salir
+     (y búsqueda de texto).
   5) Medir tiempo de selección con for; si >10 minutos, preguntar si desea continuar.
   6) Capturar fecha dd/mm/aaaa, almacenarla en tupla (día, mes, año) y usarla al crear/modificar.
   7) Contar con >=4 archivos disponibles para lectura (se crean si no existen) y permitir abrir por nombre.
@@ -22,25 +23,249 @@ Requisitos (resumen mapeado):
 """
 from __future__ import annotations
 
+import argparse
+import bisect
+import os
 import sys
+import threading
 import time
-from dataclasses import dataclass
-from datetime import datetime
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from contextlib import nullcontext
 from itertools import cycle
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from busqueda import IndiceBusqueda
+from diario import VENTANA_POR_DEFECTO, DiarioEscrituras, reproducir_diario
+from fechas import parsear_fecha
+from metricas import METRICAS, medir, perfilar
+from registros import AlmacenRegistros, Registro, encabezado_archivo, formatear_cabecera
+from rotacion import BloqueoCarpeta
+from seguimiento import seguir_archivo
 
 
 # ================================
 # Utilidades y Estructuras de Datos
 # ================================
 
-@dataclass
+T = TypeVar("T")
+
+# Políticas de sincronización para las escrituras en modo anexo:
+#   "ninguna" -> solo el búfer de Python (más rápido, se vacía al cerrar la sesión)
+#   "flush"   -> vacía el búfer tras cada anexo (otros lectores ven el texto al momento)
+#   "fsync"   -> además fuerza al disco con os.fsync (más lento, sobrevive a un apagón)
+POLITICAS_SINCRONIZACION = ("ninguna", "flush", "fsync")
+
+
+def escribir_atomico(ruta: Path, contenido: str) -> None:
+    """
+    Reescribe un archivo completo de forma segura ante fallos.
+    - Escribe en un temporal dentro de la misma carpeta, hace fsync y lo renombra
+      con os.replace (operación atómica): el archivo queda con el contenido viejo o el nuevo,
+      nunca truncado a la mitad.
+    """
+    temporal = ruta.with_name(f".{ruta.name}.tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        f.write(contenido)
+        f.flush()
+        os.fsync(f.fileno())
+        METRICAS.sumar_bytes("escritura_atomica", escritos=os.fstat(f.fileno()).st_size)
+    os.replace(temporal, ruta)
+
+
+class EscritorAnexos:
+    """
+    Escritor en modo anexo ("ab") que mantiene abiertos los archivos usados por una sesión.
+    - Cada anexo cuesta O(texto) y no O(tamaño del archivo): no se relee el contenido previo.
+    - Se escribe en binario (UTF-8) para conocer el offset en bytes de cada entrada sin vaciar el búfer.
+    - `politica` controla cuándo se vacía el búfer (ver POLITICAS_SINCRONIZACION).
+    - `max_abiertos` limita los descriptores abiertos; se cierra el menos usado recientemente.
+    - Mientras tenga archivos de una carpeta abiertos, sostiene el candado compartido de esa
+      carpeta (ver rotacion.BloqueoCarpeta): una rotación no puede reemplazarlos por debajo.
+    """
+
+    def __init__(self, politica: str = "flush", max_abiertos: int = 16) -> None:
+        if politica not in POLITICAS_SINCRONIZACION:
+            raise ValueError(f"Política de sincronización desconocida: {politica!r}")
+        self.politica = politica
+        self.max_abiertos = max_abiertos
+        self._abiertos: "OrderedDict[Path, BinaryIO]" = OrderedDict()
+        self._bloqueos: Dict[Path, BloqueoCarpeta] = {}   # carpeta -> candado compartido
+
+    def _obtener(self, ruta: Path) -> BinaryIO:
+        """Regresa el manejador abierto para `ruta` (lo abre en modo anexo si hace falta)."""
+        f = self._abiertos.get(ruta)
+        if f is not None:
+            self._abiertos.move_to_end(ruta)
+            return f
+        if len(self._abiertos) >= self.max_abiertos:
+            _, viejo = self._abiertos.popitem(last=False)
+            viejo.close()
+        if ruta.parent not in self._bloqueos:
+            # Si hay una rotación en curso se espera a que termine: el anexo va al archivo nuevo
+            bloqueo = BloqueoCarpeta(ruta.parent)
+            bloqueo.compartido()
+            self._bloqueos[ruta.parent] = bloqueo
+        f = open(ruta, "ab")
+        self._abiertos[ruta] = f
+        return f
+
+    def anexar(self, ruta: Path, texto: str) -> int:
+        """
+        Anexa `texto` al final de `ruta` aplicando la política de sincronización.
+        Regresa el offset en bytes donde comenzó el texto anexado.
+        """
+        f = self._obtener(ruta)
+        offset = f.tell()
+        datos = texto.encode("utf-8")
+        f.write(datos)
+        METRICAS.sumar_bytes("escritor_anexos", escritos=len(datos))
+        if self.politica != "ninguna":
+            f.flush()
+            if self.politica == "fsync":
+                os.fsync(f.fileno())
+        return offset
+
+    def tamano(self, ruta: Path) -> int:
+        """Tamaño real de `ruta` en disco, incluido lo que esta sesión tenga en el búfer."""
+        f = self._abiertos.get(ruta)
+        if f is None:
+            return ruta.stat().st_size if ruta.exists() else 0
+        f.flush()
+        return os.fstat(f.fileno()).st_size
+
+    def soltar(self, ruta: Path) -> None:
+        """Cierra el manejador de `ruta` si está abierto (p. ej. antes de reemplazar el archivo)."""
+        f = self._abiertos.pop(ruta, None)
+        if f is not None:
+            f.close()
+
+    def vaciar(self) -> None:
+        """Vacía los búferes de todos los archivos abiertos (sin cerrarlos)."""
+        for f in self._abiertos.values():
+            f.flush()
+
+    def cerrar(self) -> None:
+        """Vacía y cierra todos los archivos abiertos por la sesión y suelta los candados."""
+        while self._abiertos:
+            _, f = self._abiertos.popitem()
+            f.close()
+        while self._bloqueos:
+            _, bloqueo = self._bloqueos.popitem()
+            bloqueo.liberar()
+
+
+class LectorPaginado:
+    """
+    Lector por páginas que nunca carga el archivo completo en memoria.
+    - Lee en modo binario por bloques de `tam_bloque` bytes y decodifica línea por línea.
+    - Guarda un índice disperso (cada `cada_lineas` líneas -> offset en bytes) para que
+      saltar a una línea ya visitada no vuelva a recorrer el archivo desde el inicio.
+    - `ultimas_lineas` busca desde el final del archivo (como `tail`).
+    """
+
+    def __init__(self, ruta: Path, lineas_por_pagina: int = 20,
+                 tam_bloque: int = 64 * 1024, cada_lineas: int = 1000) -> None:
+        self.ruta = ruta
+        self.lineas_por_pagina = lineas_por_pagina
+        self.tam_bloque = tam_bloque
+        self.cada_lineas = cada_lineas
+        self.linea_actual = 0          # número (0-indexado) de la siguiente línea a mostrar
+        self._offset = 0               # posición en bytes de esa línea
+        self._indice: Dict[int, int] = {0: 0}  # {número de línea: offset en bytes}
+
+    @staticmethod
+    def _decodificar(linea: bytes) -> str:
+        return linea.rstrip(b"\r\n").decode("utf-8", errors="replace")
+
+    def pagina(self) -> List[str]:
+        """Regresa la siguiente página de líneas (lista vacía al llegar al final)."""
+        lineas: List[str] = []
+        with open(self.ruta, "rb", buffering=self.tam_bloque) as f:
+            inicio = f.seek(self._offset)
+            while len(lineas) < self.lineas_por_pagina:
+                linea = f.readline()
+                if not linea:
+                    break
+                lineas.append(self._decodificar(linea))
+                self.linea_actual += 1
+                self._offset += len(linea)
+                if self.linea_actual % self.cada_lineas == 0:
+                    self._indice[self.linea_actual] = self._offset
+            METRICAS.sumar_bytes("lector_paginado", leidos=f.tell() - inicio)
+        return lineas
+
+    def saltar_a_linea(self, numero: int) -> bool:
+        """
+        Coloca el lector en la línea `numero` (1-indexada).
+        Parte del punto del índice más cercano y cuenta saltos de línea por bloques.
+        Devuelve False si el archivo tiene menos líneas.
+        """
+        objetivo = max(numero - 1, 0)
+        base = max(k for k in self._indice if k <= objetivo)
+        linea, offset = base, self._indice[base]
+        with open(self.ruta, "rb") as f:
+            f.seek(offset)
+            while linea < objetivo:
+                bloque = f.read(self.tam_bloque)
+                if not bloque:
+                    return False
+                METRICAS.sumar_bytes("lector_paginado", leidos=len(bloque))
+                encontrados = bloque.count(b"\n")
+                # Camino rápido: el bloque completo queda antes del objetivo y no cruza checkpoints
+                if (linea + encontrados < objetivo
+                        and (linea + encontrados) // self.cada_lineas == linea // self.cada_lineas):
+                    linea += encontrados
+                    offset += len(bloque)
+                    continue
+                pos = -1
+                while linea < objetivo:
+                    pos = bloque.find(b"\n", pos + 1)
+                    if pos < 0:
+                        break
+                    linea += 1
+                    if linea % self.cada_lineas == 0:
+                        self._indice[linea] = offset + pos + 1
+                offset += len(bloque) if linea < objetivo else pos + 1
+            if objetivo > 0 and offset >= os.fstat(f.fileno()).st_size:
+                return False
+        self.linea_actual, self._offset = linea, offset
+        return True
+
+    def ultimas_lineas(self, n: int) -> List[str]:
+        """Regresa las últimas `n` líneas leyendo bloques hacia atrás desde el final."""
+        if n <= 0:
+            return []
+        with open(self.ruta, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            datos = b""
+            # Se necesitan n+1 saltos de línea para asegurar n líneas completas
+            while pos > 0 and datos.count(b"\n") <= n:
+                leer = min(self.tam_bloque, pos)
+                pos -= leer
+                f.seek(pos)
+                datos = f.read(leer) + datos
+            METRICAS.sumar_bytes("lector_paginado", leidos=len(datos))
+        lineas = datos.splitlines()
+        return [self._decodificar(l) for l in lineas[-n:]]
+
+
+@dataclass(slots=True)
 class Session:
-    """Representa una sesión de usuario en la aplicación."""
+    """Representa una sesión de usuario en la aplicación (con __slots__: sin __dict__ por instancia)."""
     nickname: str
     fecha_tuple: Tuple[int, int, int]  # (día, mes, año)
     base_dir: Path                     # Carpeta donde se gestionan los archivos
+    # Escritor en modo anexo que vive mientras dure la sesión
+    escritor: EscritorAnexos = field(default_factory=EscritorAnexos, repr=False, compare=False)
+    # Almacén estructurado (SQLite) donde también se registra cada entrada escrita
+    almacen: Optional[AlmacenRegistros] = field(default=None, repr=False, compare=False)
+    # Índice de búsqueda de texto (se carga del disco la primera vez que se busca)
+    indice: Optional[IndiceBusqueda] = field(default=None, repr=False, compare=False)
+    # Diario de escrituras sobre `escritor`: si está, escribir/crear pasan por él (duraderas)
+    diario: Optional[DiarioEscrituras] = field(default=None, repr=False, compare=False)
 
     @property
     def fecha_str(self) -> str:
@@ -54,46 +279,85 @@ def limpiar_pantalla() -> None:
     print("\n" * 50)
 
 
-def loading(max_seconds: int = 5) -> None:
+def loading(max_seconds: int = 5, trabajo: Optional[Callable[[], T]] = None,
+            animar: bool = True) -> Optional[T]:
     """
     3) Muestra una animación de carga por hasta `max_seconds` segundos.
        Justifica el límite <= 5 segundos por rúbrica.
+    - Si se indica `trabajo`, se ejecuta en un hilo de fondo y el spinner se detiene en cuanto
+      termina (la espera refleja trabajo real y no un tiempo fijo). Regresa su resultado.
+      Si el trabajo tarda más de `max_seconds`, se deja de animar y se espera en silencio.
+    - Con `animar=False` (modo rápido/headless) no se imprime nada y el trabajo corre directo.
     """
+    if not animar:
+        return trabajo() if trabajo is not None else None
+
+    resultado: Dict[str, object] = {}
+
+    def _ejecutar() -> None:
+        try:
+            resultado["valor"] = trabajo()  # type: ignore[misc]
+        except BaseException as e:  # Se vuelve a lanzar en el hilo principal
+            resultado["error"] = e
+
+    hilo = None
+    if trabajo is not None:
+        hilo = threading.Thread(target=_ejecutar, name="carga-inicial", daemon=True)
+        hilo.start()
+
     print("Cargando programa, por favor espera...", end="", flush=True)
     spinner = cycle([" ⠋", " ⠙", " ⠹", " ⠸", " ⠼", " ⠴", " ⠦", " ⠧", " ⠇", " ⠏"])
     start = time.perf_counter()
-    # Bucle de espera (máximo max_seconds, por default 5)
+    # Bucle de espera (máximo max_seconds, por default 5; termina antes si el trabajo acabó)
     while time.perf_counter() - start < max_seconds:
+        if hilo is not None and not hilo.is_alive():
+            break
         # Imprime el siguiente frame del spinner y pausa ligeramente
         sys.stdout.write(next(spinner))
         sys.stdout.flush()
-        time.sleep(0.12)
+        if hilo is not None:
+            hilo.join(timeout=0.12)
+        else:
+            time.sleep(0.12)
         # Retrocede 2 caracteres para sobreescribir en la misma línea
         sys.stdout.write("\b\b")
     print("\n")
 
+    if hilo is None:
+        return None
+    hilo.join()
+    if "error" in resultado:
+        raise resultado["error"]  # type: ignore[misc]
+    return resultado["valor"]  # type: ignore[return-value]
+
+
+def normalizar_nickname(nombre: str) -> str:
+    """
+    2) Demostración de operadores de cadena: concatenación y métodos.
+    'Juan Pérez' -> '@Juan_Pérez' (si ya trae '@' no se duplica).
+    """
+    nombre = nombre.strip().replace(" ", "_")
+    return nombre if nombre.startswith("@") else "@" + nombre
+
 
 def pedir_nickname() -> str:
     """1) Solicita el nombre o nickname al usuario con validación básica."""
     while True:
         nick = input("Escribe tu nombre o nickname: ").strip()
         if nick:
-            # 2) Demostración de operadores de cadena: concatenación y métodos
-            nick = "@" + nick.replace(" ", "_")  # e.g., 'Juan Pérez' -> '@Juan_Pérez'
-            return nick
+            return normalizar_nickname(nick)
         print("El nickname no puede estar vacío. Intenta de nuevo.")
 
 
 def pedir_fecha_tuple() -> Tuple[int, int, int]:
     """
     6) Pide una fecha en formato dd/mm/aaaa, valida y regresa una tupla (día, mes, año).
-    - Se usa datetime.strptime para validación.
+    - Se usa fechas.parsear_fecha para validación (formato y existencia en el calendario).
     """
     while True:
         raw = input("Ingresa la fecha en formato dd/mm/aaaa (ej. 12/06/2023): ").strip()
         try:
-            dt = datetime.strptime(raw, "%d/%m/%Y")
-            return (dt.day, dt.month, dt.year)
+            return parsear_fecha(raw)
         except ValueError:
             print("Formato inválido. Asegúrate de usar dd/mm/aaaa y que la fecha exista.")
 
@@ -101,9 +365,17 @@ def pedir_fecha_tuple() -> Tuple[int, int, int]:
 def asegurar_archivos_iniciales(base_dir: Path) -> List[Path]:
     """
     7) Crea una carpeta 'files' y, si faltan, genera >=4 archivos de ejemplo para lectura.
+    Antes reproduce el diario de escrituras: lo confirmado antes de una caída queda aplicado.
     Devuelve la lista de rutas disponibles.
     """
     base_dir.mkdir(parents=True, exist_ok=True)
+    # Con el candado compartido: una rotación en curso termina antes de reaplicar anexos
+    bloqueo = BloqueoCarpeta(base_dir)
+    bloqueo.compartido()
+    try:
+        reproducir_diario(base_dir)
+    finally:
+        bloqueo.liberar()
     # Archivos base (si no existen, se crean con contenido inicial)
     nombres = ["alumnos.txt", "asistencias.txt", "notas.txt", "reporte.txt"]
     rutas: List[Path] = []
@@ -120,10 +392,74 @@ def asegurar_archivos_iniciales(base_dir: Path) -> List[Path]:
     return rutas
 
 
-def listar_archivos(base_dir: Path) -> Dict[int, Path]:
-    """Devuelve un diccionario {índice: ruta} con los archivos del directorio base."""
-    archivos = sorted(p for p in base_dir.glob("*") if p.is_file())
-    return {i + 1: p for i, p in enumerate(archivos)}
+class CacheDirectorio:
+    """
+    Caché del listado de archivos por carpeta, invalidado por el mtime del directorio.
+    - Crear, borrar o renombrar un archivo cambia el mtime de la carpeta, así que si el mtime
+      no cambió el listado guardado sigue siendo válido: cada consulta cuesta un solo stat.
+    - `agregar` actualiza el listado de forma incremental (inserción ordenada) cuando es la
+      propia aplicación quien crea el archivo, sin volver a recorrer la carpeta.
+    """
+
+    def __init__(self) -> None:
+        # {carpeta: (mtime_ns, nombres ordenados, {índice: ruta})}
+        self._entradas: Dict[Path, Tuple[int, List[str], Dict[int, Path]]] = {}
+
+    @staticmethod
+    def escanear(base_dir: Path) -> List[str]:
+        """Recorre la carpeta (os.scandir evita un stat extra por entrada) y ordena los nombres."""
+        with os.scandir(base_dir) as it:
+            return sorted(e.name for e in it if not e.name.startswith(".") and e.is_file())
+
+    @staticmethod
+    def _indexar(base_dir: Path, nombres: List[str]) -> Dict[int, Path]:
+        return {i + 1: base_dir / nombre for i, nombre in enumerate(nombres)}
+
+    def listar(self, base_dir: Path) -> Dict[int, Path]:
+        """Listado {índice: ruta} de `base_dir` (no debe modificarse: es compartido)."""
+        mtime = base_dir.stat().st_mtime_ns
+        guardado = self._entradas.get(base_dir)
+        if guardado is not None and guardado[0] == mtime:
+            return guardado[2]
+        nombres = self.escanear(base_dir)
+        indice = self._indexar(base_dir, nombres)
+        self._entradas[base_dir] = (mtime, nombres, indice)
+        return indice
+
+    def agregar(self, ruta: Path) -> None:
+        """Registra un archivo recién creado en `ruta.parent` sin reescanear la carpeta."""
+        base_dir = ruta.parent
+        guardado = self._entradas.get(base_dir)
+        if guardado is None:
+            return  # Sin listado previo: se construirá completo en la próxima consulta
+        nombres = guardado[1]
+        pos = bisect.bisect_left(nombres, ruta.name)
+        if pos == len(nombres) or nombres[pos] != ruta.name:
+            nombres.insert(pos, ruta.name)
+        self._entradas[base_dir] = (base_dir.stat().st_mtime_ns, nombres, self._indexar(base_dir, nombres))
+
+    def invalidar(self, base_dir: Optional[Path] = None) -> None:
+        """Descarta el listado de una carpeta (o de todas si no se indica)."""
+        if base_dir is None:
+            self._entradas.clear()
+        else:
+            self._entradas.pop(base_dir, None)
+
+
+# Caché compartida por todas las sesiones del proceso
+CACHE_DIRECTORIO = CacheDirectorio()
+
+
+@medir("listar_archivos")
+def listar_archivos(base_dir: Path, usar_cache: bool = True) -> Dict[int, Path]:
+    """
+    Devuelve un diccionario {índice: ruta} con los archivos del directorio base.
+    Los archivos ocultos (temporales y datos internos) no se listan.
+    Con `usar_cache` (por defecto) se reutiliza el listado mientras la carpeta no cambie.
+    """
+    if usar_cache:
+        return CACHE_DIRECTORIO.listar(base_dir)
+    return CacheDirectorio._indexar(base_dir, CacheDirectorio.escanear(base_dir))
 
 
 def imprimir_matriz_menu() -> None:
@@ -136,7 +472,8 @@ def imprimir_matriz_menu() -> None:
         ("2", "Escribir archivo"),
         ("3", "Crear archivo"),
         ("4", "Cambiar usuario"),
-        ("5", "Salir")
+        ("5", "Salir"),
+        ("6", "Buscar texto"),
     ]
     # Construcción de una tabla simple de 2 columnas (celdas: código y descripción)
     ancho_cod, ancho_desc = 4, 22
@@ -160,17 +497,15 @@ def medir_tiempo_seleccion_y_preguntar() -> bool:
     5) Mide el tiempo que tarda el usuario en seleccionar una opción.
        - Limitación técnica: input() es bloqueante; no podemos interrumpirlo de forma portable.
          Estrategia: registramos timestamps antes y después de input; después calculamos elapsed.
-       - Uso del ciclo for: recorremos 'elapsed' segundos para simular conteo/medición (requisito).
+       - El tiempo se registra en el histograma "seleccion_menu" de las métricas (ver
+         metricas.Histograma); el aviso de los 10 minutos se decide con un solo if.
        Devuelve True si se debe continuar en el menú, False si se debe regresar a pantalla inicial.
     """
     inicio = time.perf_counter()
     opcion = input("Selecciona una opción: ").strip()
     fin = time.perf_counter()
     elapsed = fin - inicio
-
-    # 'Uso de for' para medir/recorrer los segundos consumidos (propósito pedagógico)
-    for _ in range(int(elapsed)):
-        pass  # No hacemos nada, solo cumplimos el requisito de usar 'for' para la medición
+    METRICAS.observar("seleccion_menu", elapsed)
 
     # Si tardó más de 10 minutos (600 s), preguntar si continúa
     if elapsed >= 600:
@@ -209,14 +544,77 @@ def seleccionar_archivo(base_dir: Path) -> Path:
     raise FileNotFoundError("Archivo no encontrado. Verifica el nombre y vuelve a intentar.")
 
 
+def _seguir_en_pantalla(ruta: Path) -> None:
+    """Modo seguimiento: imprime solo lo que se anexa a `ruta` hasta Ctrl+C."""
+    # Al volver a seguir el mismo archivo se muestra lo anexado desde la última vez
+    print(f"Siguiendo '{ruta.name}': se muestran solo las entradas nuevas (Ctrl+C para dejar de seguir).")
+    seguir_archivo(ruta, mostrar=lambda linea: print(f"{'+':>6} | {linea}"))
+    print("-- Seguimiento detenido --")
+
+
+def paginar_archivo(ruta: Path, lineas_por_pagina: int = 20) -> None:
+    """
+    Muestra un archivo página por página con memoria acotada.
+    Controles: Enter = siguiente página, l <n> = ir a la línea n,
+               t <n> = últimas n líneas, f = seguir (solo lo nuevo, como tail -f), q = salir.
+    """
+    lector = LectorPaginado(ruta, lineas_por_pagina=lineas_por_pagina)
+    # Solo las lecturas cuentan en "leer_archivo": el tiempo frente a input() no es E/S
+    with medir("leer_archivo"):
+        pagina: Optional[List[str]] = lector.pagina()
+    while True:
+        # `pagina` es None cuando el último comando no avanzó el lector (tail, error, etc.)
+        if pagina is not None:
+            inicio = lector.linea_actual - len(pagina) + 1
+            for i, linea in enumerate(pagina, start=inicio):
+                print(f"{i:>6} | {linea}")
+            if len(pagina) < lineas_por_pagina:
+                print("-- Fin del archivo --")
+                # Un archivo pequeño se muestra completo; solo se ofrece seguirlo
+                if inicio == 1:
+                    if input("[Enter] volver | f seguir: ").strip().lower() == "f":
+                        _seguir_en_pantalla(ruta)
+                    return
+        comando = input("[Enter] siguiente | l <n> ir a línea | t <n> últimas n | f seguir | q salir: ").strip().lower()
+        partes = comando.split()
+        try:
+            if not partes:
+                with medir("leer_archivo"):
+                    pagina = lector.pagina()
+            elif partes[0] == "q":
+                return
+            elif partes[0] == "l" and len(partes) == 2:
+                numero = int(partes[1])
+                with medir("leer_archivo"):
+                    pagina = lector.pagina() if lector.saltar_a_linea(numero) else None
+                if pagina is None:
+                    print("El archivo no tiene tantas líneas.")
+            elif partes[0] == "t" and len(partes) == 2:
+                n = int(partes[1])
+                with medir("leer_archivo"):
+                    ultimas = lector.ultimas_lineas(n)
+                for linea in ultimas:
+                    print(f"{'':>6} | {linea}")
+                pagina = None
+            elif partes[0] == "f":
+                _seguir_en_pantalla(ruta)
+                pagina = None
+            else:
+                print("Comando no reconocido.")
+                pagina = None
+        except ValueError:
+            print("El número de línea debe ser un entero.")
+            pagina = None
+
+
 def leer_archivo(base_dir: Path) -> None:
-    """Opción 1: Lee e imprime el contenido de un archivo existente."""
+    """Opción 1: Lee e imprime el contenido de un archivo existente (por páginas)."""
     try:
         ruta = seleccionar_archivo(base_dir)
         print("\n" + "=" * 60)
         print(f"Contenido de: {ruta.name}")
         print("=" * 60)
-        print(ruta.read_text(encoding="utf-8"))
+        paginar_archivo(ruta)
         print("=" * 60 + "\n")
     except FileNotFoundError as e:
         print(f"[Aviso] {e}")
@@ -227,7 +625,7 @@ def leer_archivo(base_dir: Path) -> None:
 def escribir_archivo(session: Session) -> None:
     """
     Opción 2: Escribe (anexa) texto a un archivo existente.
-    - Inserta metadatos con usuario y fecha (tupla).
+    - Inserta metadatos con usuario y fecha (tupla) y registra la entrada en el almacén.
     """
     try:
         ruta = seleccionar_archivo(session.base_dir)
@@ -236,9 +634,15 @@ def escribir_archivo(session: Session) -> None:
         if not texto:
             print("No se escribió contenido. Operación cancelada.")
             return
-        d, m, a = session.fecha_tuple
-        cabecera = f"[Usuario: {session.nickname}] [Fecha: {d:02d}/{m:02d}/{a:04d}]\n"
-        ruta.write_text(ruta.read_text(encoding="utf-8") + cabecera + texto + "\n", encoding="utf-8")
+        cabecera = formatear_cabecera(session.nickname, session.fecha_tuple)
+        with medir("escribir_archivo"):
+            # Anexo directo (modo "ab"): no se relee ni se reescribe el archivo completo
+            if session.diario is not None:
+                offset = session.diario.anexar(ruta, cabecera + texto + "\n")
+            else:
+                offset = session.escritor.anexar(ruta, cabecera + texto + "\n")
+            if session.almacen is not None:
+                session.almacen.agregar(Registro(session.nickname, session.fecha_tuple, ruta.name, offset, texto))
         print(f"Texto anexado correctamente a '{ruta.name}'.\n")
     except FileNotFoundError as e:
         print(f"[Aviso] {e}")
@@ -261,13 +665,13 @@ def crear_archivo(session: Session) -> None:
         if ruta.exists():
             print("El archivo ya existe. Elige 'Escribir archivo' si deseas anexar contenido.\n")
             return
-        d, m, a = session.fecha_tuple
-        contenido = (
-            f"Archivo creado por {session.nickname}\n"
-            f"Fecha de creación: {d:02d}/{m:02d}/{a:04d}\n"
-            "---------------------------------------------\n"
-        )
-        ruta.write_text(contenido, encoding="utf-8")
+        contenido = encabezado_archivo(session.nickname, session.fecha_tuple)
+        with medir("crear_archivo"):
+            if session.diario is not None:
+                session.diario.crear(ruta, contenido)
+            else:
+                escribir_atomico(ruta, contenido)
+            CACHE_DIRECTORIO.agregar(ruta)
         print(f"Archivo '{ruta.name}' creado correctamente.\n")
     except OSError as e:
         print(f"[Error del sistema de archivos] {e}")
@@ -275,10 +679,58 @@ def crear_archivo(session: Session) -> None:
         print(f"[Error] No se pudo crear el archivo: {e}")
 
 
-def pantalla_inicial(base_dir: Path) -> Session:
+def buscar_texto(session: Session) -> None:
+    """
+    Opción 6: Busca palabras en todos los archivos usando el índice invertido.
+    - Antes de consultar solo se reindexan los archivos que cambiaron desde la última vez.
+    """
+    try:
+        consulta = input("Palabras a buscar: ").strip()
+        if not consulta:
+            print("Consulta vacía. Operación cancelada.")
+            return
+        with medir("buscar_texto"):
+            if session.indice is None:
+                session.indice = IndiceBusqueda(session.base_dir)
+            # Lo anexado en esta sesión puede seguir en el búfer del escritor
+            session.escritor.vaciar()
+            session.indice.actualizar()
+            resultados = session.indice.buscar(consulta, limite=50)
+        if not resultados:
+            print(f"Sin resultados para '{consulta}'.\n")
+            return
+        for r in resultados:
+            print(f"--- {r.archivo}")
+            print(r.texto)
+        print(f"{len(resultados)} resultado(s).\n")
+    except OSError as e:
+        print(f"[Error del sistema de archivos] {e}")
+    except Exception as e:
+        print(f"[Error] No se pudo realizar la búsqueda: {e}")
+
+
+def inicializar_entorno(base_dir: Path) -> AlmacenRegistros:
+    """
+    Trabajo real de arranque (se ejecuta detrás del spinner de `loading`):
+    - Garantiza los archivos iniciales.
+    - Abre (y crea si hace falta) el almacén de registros.
+    - Llena la caché del listado de la carpeta.
+    La rotación a segmentos no se hace aquí: es explícita (`python rotacion.py rotar`) y se
+    rechaza mientras una sesión tenga archivos abiertos.
+    """
+    asegurar_archivos_iniciales(base_dir)
+    almacen = AlmacenRegistros.para_directorio(base_dir)
+    CACHE_DIRECTORIO.listar(base_dir)
+    return almacen
+
+
+def pantalla_inicial(base_dir: Path, rapido: bool = False,
+                     ventana_diario: float = VENTANA_POR_DEFECTO) -> Session:
     """
     Pantalla inicial: pide nickname, muestra bienvenida y solicita fecha.
     Regresa una Session lista para trabajar.
+    Con `rapido=True` se omite la animación de carga (la inicialización se hace igual).
+    `ventana_diario`: segundos que el diario junta escrituras antes de cada fsync.
     """
     limpiar_pantalla()
     print("=" * 60)
@@ -289,17 +741,20 @@ def pantalla_inicial(base_dir: Path) -> Session:
     # 2) Mensaje de bienvenida con operadores de cadena (concatenación y f-string)
     bienvenida = "Bienvenido/a, " + f"{nick.upper()}"
     print(bienvenida.center(60))
-    loading(max_seconds=5)
+    almacen = loading(max_seconds=5, trabajo=lambda: inicializar_entorno(base_dir), animar=not rapido)
 
     fecha_tuple = pedir_fecha_tuple()
-    session = Session(nickname=nick, fecha_tuple=fecha_tuple, base_dir=base_dir)
+    escritor = EscritorAnexos()
+    session = Session(nickname=nick, fecha_tuple=fecha_tuple, base_dir=base_dir, almacen=almacen,
+                      escritor=escritor,
+                      diario=DiarioEscrituras(base_dir, escritor, ventana=ventana_diario))
     print(f"Sesión iniciada para {session.nickname} en fecha {session.fecha_str}.\n")
     return session
 
 
 def bucle_menu(session: Session) -> None:
     """
-    4) Menú principal con while; opciones: leer, escribir, crear, cambiar usuario, salir.
+    4) Menú principal con while; opciones: leer, escribir, crear, cambiar usuario, salir, buscar.
     5) Medición de tiempo con for; si >10 min, preguntar si continuar.
     7-8) Gestión de archivos con excepciones.
     """
@@ -328,34 +783,78 @@ def bucle_menu(session: Session) -> None:
         elif opcion == "5":
             print("¡Gracias por usar el sistema! Hasta pronto.")
             break
+        elif opcion == "6":
+            buscar_texto(session)
         else:
             print("Opción inválida. Intenta nuevamente.\n")
 
 
-def main() -> None:
+def ejecutar_sesiones(base_dir: Path, rapido: bool = False,
+                      ventana_diario: float = VENTANA_POR_DEFECTO) -> None:
     """
-    Punto de entrada del programa.
-    - Prepara carpeta de trabajo.
-    - Garantiza archivos iniciales.
-    - Orquesta el flujo de pantalla inicial + menú con manejo de reintentos.
+    Orquesta el flujo de pantalla inicial + menú con manejo de reintentos.
+    Al terminar (o cambiar) de sesión se cierran los archivos que quedaron abiertos.
     """
-    base_dir = Path.cwd() / "files"
-    asegurar_archivos_iniciales(base_dir)
-
+    pausa = 0.0 if rapido else 1.2
     while True:
+        session = None
         try:
-            session = pantalla_inicial(base_dir)
+            session = pantalla_inicial(base_dir, rapido=rapido, ventana_diario=ventana_diario)
             bucle_menu(session)
             break  # Si el usuario elige 'Salir', salimos del programa
         except KeyboardInterrupt:
             # Se usa para 'cambiar usuario' o regresar a pantalla inicial voluntariamente
             print("\nRegresando a pantalla inicial...\n")
-            time.sleep(1.2)
+            time.sleep(pausa)
             continue
         except Exception as e:
             print(f"[Error inesperado] {e}")
             print("Reiniciando a pantalla inicial...\n")
-            time.sleep(1.2)
+            time.sleep(pausa)
+        finally:
+            if session is not None:
+                # Primero el diario: su checkpoint final todavía usa el escritor
+                if session.diario is not None:
+                    session.diario.cerrar()
+                session.escritor.cerrar()
+                if session.almacen is not None:
+                    session.almacen.cerrar()
+                if session.indice is not None:
+                    session.indice.cerrar()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Punto de entrada del programa.
+    - Prepara carpeta de trabajo.
+    - Garantiza archivos iniciales (en segundo plano, durante la animación de carga).
+    - `--rapido` (alias `--fast`) omite la animación y las pausas entre pantallas.
+    - `--metricas ARCHIVO` guarda al salir las métricas de las operaciones
+      (formato Prometheus si termina en .prom, JSON en otro caso).
+    - `--perfil ARCHIVO` ejecuta todo bajo cProfile (ver con `python -m pstats ARCHIVO`).
+    - `--ventana-diario MS` tiempo que el diario de escrituras junta escrituras por fsync.
+    """
+    parser = argparse.ArgumentParser(description="Control de Asistencia - Fase II")
+    parser.add_argument("--rapido", "--fast", action="store_true",
+                        help="Omite la animación de carga y las pausas (modo headless)")
+    parser.add_argument("--base-dir", type=Path, default=Path.cwd() / "files",
+                        help="Carpeta de trabajo (por defecto ./files)")
+    parser.add_argument("--metricas", type=Path, metavar="ARCHIVO",
+                        help="Guarda las métricas al salir (.prom = Prometheus, otro = JSON)")
+    parser.add_argument("--perfil", type=Path, metavar="ARCHIVO",
+                        help="Guarda un perfil de cProfile de toda la ejecución")
+    parser.add_argument("--ventana-diario", type=float, default=VENTANA_POR_DEFECTO * 1000, metavar="MS",
+                        help="Ventana de confirmación en grupo del diario, en milisegundos (por defecto 0)")
+    args = parser.parse_args(argv)
+
+    try:
+        with perfilar(args.perfil) if args.perfil else nullcontext():
+            ejecutar_sesiones(args.base_dir, rapido=args.rapido,
+                              ventana_diario=max(0.0, args.ventana_diario) / 1000)
+    finally:
+        if args.metricas:
+            METRICAS.exportar(args.metricas)
+            print(f"Métricas guardadas en '{args.metricas}'.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks del Sistema de Control de Asistencia
+Autor: Alexis Ayala
+Descripción:
+  - Mide el costo de las operaciones de archivos con datos sintéticos (sin entrada interactiva).
+  - Cada benchmark trabaja en una carpeta temporal y no toca la carpeta 'files' real.
+Uso:
+  python bench_attendance.py            -> corre todos los benchmarks
+  python bench_attendance.py anexos     -> corre solo el indicado
+  python bench_attendance.py memoria    -> bytes por entrada en memoria (tracemalloc)
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import fechas
+from attendance_system import (
+    CACHE_DIRECTORIO,
+    EscritorAnexos,
+    inicializar_entorno,
+    listar_archivos,
+    loading,
+)
+from diario import DiarioEscrituras
+from importador import importar_paralelo
+from registros import ColumnasRegistros, Registro, parsear_cabecera
+from seguimiento import SeguidorArchivos
+
+
+def _linea_asistencia(i: int) -> str:
+    """Genera una entrada con el mismo formato que escribe escribir_archivo."""
+    return f"[Usuario: @alumno_{i % 2000}] [Fecha: 12/06/2023]\nPresente en clase {i}\n"
+
+
+def bench_anexos(tamanos_mb=(1, 8, 32), muestras: int = 200) -> None:
+    """
+    Costo por anexo a medida que crece el archivo:
+      - 'releer+reescribir': el método anterior (read_text + write_text del archivo completo).
+      - 'EscritorAnexos': modo "a" con el archivo abierto durante la sesión.
+    El costo del escritor debe mantenerse plano sin importar el tamaño.
+    """
+    print("Costo por anexo (microsegundos) según tamaño del archivo")
+    print(f"{'Tamaño':>8} | {'releer+reescribir':>18} | {'EscritorAnexos':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = Path(tmp) / "asistencias.txt"
+        bloque = "".join(_linea_asistencia(i) for i in range(20_000))
+        for mb in tamanos_mb:
+            # Prepara un archivo de ~mb megabytes
+            with open(ruta, "w", encoding="utf-8") as f:
+                while f.tell() < mb * 1024 * 1024:
+                    f.write(bloque)
+
+            # Pocas muestras para el método viejo: cada una reescribe todo el archivo
+            lentas = max(1, min(muestras, 64 // mb))
+            inicio = time.perf_counter()
+            for i in range(lentas):
+                texto = _linea_asistencia(i)
+                ruta.write_text(ruta.read_text(encoding="utf-8") + texto, encoding="utf-8")
+            viejo = (time.perf_counter() - inicio) / lentas
+
+            escritor = EscritorAnexos(politica="flush")
+            inicio = time.perf_counter()
+            for i in range(muestras):
+                escritor.anexar(ruta, _linea_asistencia(i))
+            nuevo = (time.perf_counter() - inicio) / muestras
+            escritor.cerrar()
+
+            print(f"{mb:>6}MB | {viejo * 1e6:>18.1f} | {nuevo * 1e6:>15.1f}")
+
+
+def bench_directorio(tamanos=(100, 1_000, 10_000), repeticiones: int = 50) -> None:
+    """
+    Costo por acción del menú (listar los archivos de la carpeta) con y sin caché:
+      - 'glob+sort': el método original (glob, is_file por entrada y ordenamiento).
+      - 'sin caché': os.scandir + ordenamiento en cada acción.
+      - 'con caché': un stat de la carpeta mientras no cambie.
+    """
+    print("Costo por acción de menú (microsegundos) según cantidad de archivos")
+    print(f"{'Archivos':>9} | {'glob+sort':>10} | {'sin caché':>10} | {'con caché':>10}")
+    for n in tamanos:
+        with tempfile.TemporaryDirectory() as tmp:
+            base_dir = Path(tmp)
+            for i in range(n):
+                (base_dir / f"clase_{i:05d}.txt").touch()
+
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                archivos = sorted(p for p in base_dir.glob("*") if p.is_file())
+                {i + 1: p for i, p in enumerate(archivos)}
+            glob_sort = (time.perf_counter() - inicio) / repeticiones
+
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                listar_archivos(base_dir, usar_cache=False)
+            sin_cache = (time.perf_counter() - inicio) / repeticiones
+
+            CACHE_DIRECTORIO.invalidar(base_dir)
+            listar_archivos(base_dir)  # primera consulta: llena la caché
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                listar_archivos(base_dir)
+            con_cache = (time.perf_counter() - inicio) / repeticiones
+            CACHE_DIRECTORIO.invalidar(base_dir)
+
+            print(f"{n:>9} | {glob_sort * 1e6:>10.1f} | {sin_cache * 1e6:>10.1f} | {con_cache * 1e6:>10.1f}")
+
+
+def bench_arranque(tamanos=(4, 1_000, 10_000), repeticiones: int = 5) -> None:
+    """
+    Tiempo de arranque de sesión (lo que antes era un loading fijo de 5 s):
+      - 'con spinner': inicialización real en hilo de fondo con la animación.
+      - 'rápido': modo --rapido/--fast, sin animación.
+    """
+    print("Tiempo de arranque (milisegundos); referencia anterior: 5000 ms fijos")
+    print(f"{'Archivos':>9} | {'con spinner':>12} | {'rápido':>10}")
+    for n in tamanos:
+        with tempfile.TemporaryDirectory() as tmp:
+            base_dir = Path(tmp) / "files"
+            base_dir.mkdir()
+            for i in range(n):
+                (base_dir / f"clase_{i:05d}.txt").touch()
+            tiempos = {}
+            for animar in (True, False):
+                inicio = time.perf_counter()
+                for _ in range(repeticiones):
+                    CACHE_DIRECTORIO.invalidar()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        almacen = loading(trabajo=lambda: inicializar_entorno(base_dir), animar=animar)
+                    almacen.cerrar()
+                tiempos[animar] = (time.perf_counter() - inicio) / repeticiones
+            print(f"{n:>9} | {tiempos[True] * 1e3:>12.1f} | {tiempos[False] * 1e3:>10.1f}")
+
+
+def bench_fechas(n: int = 200_000, distintas: int = 365) -> None:
+    """
+    Interpretación de `n` fechas 'dd/mm/aaaa' (con `distintas` valores repetidos, como en un log):
+    strptime contra el camino rápido, con caché LRU y la versión vectorizada.
+    """
+    from datetime import datetime
+
+    random.seed(0)
+    base = [f"{random.randint(1, 28):02d}/{random.randint(1, 12):02d}/{random.randint(2015, 2025)}"
+            for _ in range(distintas)]
+    cadenas = [random.choice(base) for _ in range(n)]
+
+    def _strptime() -> None:
+        for raw in cadenas:
+            dt = datetime.strptime(raw, "%d/%m/%Y")
+            (dt.day, dt.month, dt.year)
+
+    def _rapido() -> None:
+        for raw in cadenas:
+            fechas.parsear_fecha_sin_cache(raw)
+
+    def _cache() -> None:
+        fechas.parsear_fecha.cache_clear()
+        for raw in cadenas:
+            fechas.parsear_fecha(raw)
+
+    def _vectorizado() -> None:
+        fechas.parsear_fechas(cadenas)
+
+    print(f"Interpretar {n:,} fechas ({distintas} distintas)")
+    print(f"{'Método':<14} | {'ns/fecha':>9} | {'vs strptime':>11}")
+    referencia = None
+    for nombre, funcion in (("strptime", _strptime), ("rápido", _rapido),
+                            ("rápido+LRU", _cache), ("vectorizado", _vectorizado)):
+        inicio = time.perf_counter()
+        funcion()
+        por_fecha = (time.perf_counter() - inicio) / n
+        referencia = referencia or por_fecha
+        print(f"{nombre:<14} | {por_fecha * 1e9:>9.0f} | {referencia / por_fecha:>10.1f}x")
+
+
+@dataclass
+class _RegistroConDict:
+    """Registro como era antes (dataclass con __dict__), solo para comparar memoria."""
+    nickname: str
+    fecha_tuple: Tuple[int, int, int]
+    archivo: str
+    offset: int
+    texto: str
+
+
+def bench_memoria(n: int = 200_000, usuarios: int = 2000) -> None:
+    """
+    Bytes por entrada en memoria (medidos con tracemalloc) para `n` entradas de `usuarios` alumnos:
+      - 'dataclass': el Registro anterior, con __dict__ y una cadena nueva por nickname.
+      - 'slots': Registro con __slots__.
+      - 'slots+intern': además, nicknames internados (como los deja parsear_cabecera).
+      - 'columnas': ColumnasRegistros (ids y día ordinal en arreglos, sin el texto).
+    El texto de cada entrada es el mismo objeto en todos los casos, así que no se cuenta.
+    """
+    random.seed(0)
+    texto = "Presente en clase\n"
+    cabeceras = [f"[Usuario: @alumno_{random.randrange(usuarios)}] "
+                 f"[Fecha: {random.randint(1, 28):02d}/{random.randint(1, 12):02d}/2023]"
+                 for _ in range(n)]
+
+    def _dataclass():
+        salida = []
+        for offset, linea in enumerate(cabeceras):
+            nick, fecha = parsear_cabecera(linea)
+            # "".join copia la cadena: así quedaba una copia del nickname por entrada
+            salida.append(_RegistroConDict("".join(nick), fecha, "clase.txt", offset, texto))
+        return salida
+
+    def _slots():
+        salida = []
+        for offset, linea in enumerate(cabeceras):
+            nick, fecha = parsear_cabecera(linea)
+            salida.append(Registro("".join(nick), fecha, "clase.txt", offset, texto))
+        return salida
+
+    def _intern():
+        salida = []
+        for offset, linea in enumerate(cabeceras):
+            nick, fecha = parsear_cabecera(linea)
+            salida.append(Registro(nick, fecha, "clase.txt", offset, texto))
+        return salida
+
+    def _columnas():
+        columnas = ColumnasRegistros()
+        for offset, linea in enumerate(cabeceras):
+            nick, fecha = parsear_cabecera(linea)
+            columnas.agregar(nick, fecha, "clase.txt", offset)
+        return columnas
+
+    for linea in cabeceras:  # Calienta la caché de fechas y los nicknames internados
+        parsear_cabecera(linea)
+    print(f"Memoria para {n:,} entradas de {usuarios} usuarios")
+    print(f"{'Representación':<14} | {'bytes/entrada':>13} | {'vs dataclass':>12}")
+    referencia = None
+    for nombre, construir in (("dataclass", _dataclass), ("slots", _slots),
+                              ("slots+intern", _intern), ("columnas", _columnas)):
+        tracemalloc.start()
+        resultado = construir()
+        usados, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del resultado
+        por_entrada = usados / n
+        referencia = referencia or por_entrada
+        print(f"{nombre:<14} | {por_entrada:>13.1f} | {referencia / por_entrada:>11.1f}x")
+
+
+def bench_importar(archivos: int = 4, mb_por_archivo: int = 8, procesos=(1, 2, 4)) -> None:
+    """
+    Importación de archivos heredados con importar_paralelo según la cantidad de procesos
+    (fragmentos de 2 MB cortados en cabeceras). La aceleración esperada es cercana a lineal
+    mientras haya núcleos libres; con un solo núcleo, más procesos solo agregan costo.
+    """
+    import os
+
+    print(f"Importar {archivos} archivos de {mb_por_archivo} MB ({os.cpu_count()} CPU)")
+    print(f"{'Procesos':>8} | {'segundos':>9} | {'MB/s':>7} | {'aceleración':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        bloque = "".join(_linea_asistencia(i) for i in range(20_000))
+        rutas = []
+        for k in range(archivos):
+            ruta = Path(tmp) / f"historico_{k}.txt"
+            with open(ruta, "w", encoding="utf-8") as f:
+                while f.tell() < mb_por_archivo * 1024 * 1024:
+                    f.write(bloque)
+            rutas.append(ruta)
+        referencia = None
+        for n in procesos:
+            resumen = importar_paralelo(rutas, procesos=n, tam_fragmento=2 * 1024 * 1024)
+            referencia = referencia or resumen.segundos
+            print(f"{n:>8} | {resumen.segundos:>9.2f} | {resumen.mb_por_segundo:>7.1f} | "
+                  f"{referencia / resumen.segundos:>10.2f}x")
+
+
+def bench_diario(escrituras: int = 2000, hilos: int = 8,
+                 ventanas=(0.0, 0.0005, 0.002, 0.01)) -> None:
+    """
+    Escrituras duraderas por segundo (`hilos` escritores concurrentes, `escrituras` en total):
+      - 'fsync c/u': EscritorAnexos con política fsync, un fsync por anexo (un solo hilo).
+      - 'diario Xms': DiarioEscrituras con confirmación en grupo y ventana de X ms; también se
+        muestra cuántas escrituras comparten cada fsync.
+    """
+    print(f"{escrituras} escrituras duraderas con {hilos} hilos")
+    print(f"{'Método':<14} | {'escrituras/s':>12} | {'por fsync':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = Path(tmp)
+        ruta = base_dir / "asistencias.txt"
+        ruta.touch()
+
+        escritor = EscritorAnexos(politica="fsync")
+        inicio = time.perf_counter()
+        for i in range(escrituras):
+            escritor.anexar(ruta, _linea_asistencia(i))
+        segundos = time.perf_counter() - inicio
+        escritor.cerrar()
+        print(f"{'fsync c/u':<14} | {escrituras / segundos:>12,.0f} | {1:>9.1f}")
+
+        por_hilo = escrituras // hilos
+        for ventana in ventanas:
+            escritor = EscritorAnexos(politica="flush")
+            diario = DiarioEscrituras(base_dir, escritor, ventana=ventana)
+
+            def escribir(k: int) -> None:
+                for i in range(por_hilo):
+                    diario.anexar(ruta, _linea_asistencia(k * por_hilo + i))
+
+            trabajadores = [threading.Thread(target=escribir, args=(k,)) for k in range(hilos)]
+            inicio = time.perf_counter()
+            for t in trabajadores:
+                t.start()
+            for t in trabajadores:
+                t.join()
+            segundos = time.perf_counter() - inicio
+            diario.cerrar()
+            escritor.cerrar()
+            nombre = f"diario {ventana * 1e3:g}ms"
+            print(f"{nombre:<14} | {diario.escrituras / segundos:>12,.0f} | "
+                  f"{diario.escrituras / diario.confirmaciones:>9.1f}")
+
+
+def bench_seguimiento(tamanos_mb=(1, 8, 32), muestras: int = 200) -> None:
+    """
+    Costo de mostrar una entrada recién anexada según el tamaño del archivo:
+      - 'releer todo': lo que hacía volver a "Leer archivo" (leer y partir el archivo completo).
+      - 'seguimiento': SeguidorArchivos.nuevas_lineas (lee solo desde el último offset).
+    El costo del seguimiento debe mantenerse plano sin importar el tamaño.
+    """
+    print("Costo por actualización (microsegundos) según tamaño del archivo")
+    print(f"{'Tamaño':>8} | {'releer todo':>12} | {'seguimiento':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = Path(tmp) / "asistencias.txt"
+        bloque = "".join(_linea_asistencia(i) for i in range(20_000))
+        for mb in tamanos_mb:
+            with open(ruta, "w", encoding="utf-8") as f:
+                while f.tell() < mb * 1024 * 1024:
+                    f.write(bloque)
+
+            lentas = max(1, min(muestras, 64 // mb))
+            inicio = time.perf_counter()
+            for _ in range(lentas):
+                ruta.read_text(encoding="utf-8").splitlines()
+            viejo = (time.perf_counter() - inicio) / lentas
+
+            seguidor = SeguidorArchivos()
+            seguidor.ir_al_final(ruta)
+            total = 0.0
+            with open(ruta, "a", encoding="utf-8") as f:
+                for i in range(muestras):
+                    f.write(_linea_asistencia(i))
+                    f.flush()
+                    inicio = time.perf_counter()
+                    for _ in seguidor.nuevas_lineas(ruta):
+                        pass
+                    total += time.perf_counter() - inicio
+            nuevo = total / muestras
+
+            print(f"{mb:>6}MB | {viejo * 1e6:>12.1f} | {nuevo * 1e6:>12.1f}")
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    "anexos": bench_anexos,
+    "directorio": bench_directorio,
+    "arranque": bench_arranque,
+    "fechas": bench_fechas,
+    "memoria": bench_memoria,
+    "importar": bench_importar,
+    "diario": bench_diario,
+    "seguimiento": bench_seguimiento,
+}
+
+
+def main(argv=None) -> None:
+    nombres = (argv if argv is not None else sys.argv[1:]) or list(BENCHMARKS)
+    for nombre in nombres:
+        if nombre not in BENCHMARKS:
+            print(f"Benchmark desconocido: {nombre}. Opciones: {', '.join(BENCHMARKS)}")
+            continue
+        print(f"\n=== {nombre} ===")
+        BENCHMARKS[nombre]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo: Búsqueda de texto completo
+Autor: Alexis Ayala
+Descripción:
+  - Mantiene un índice invertido (palabra -> archivo/offset de la entrada) sobre todos los
+    archivos de la carpeta de trabajo, guardado en SQLite (.datos/indice_busqueda.sqlite3):
+    una consulta solo lee las listas de las palabras buscadas, nunca el índice completo.
+  - La unidad de búsqueda es la entrada: una cabecera [Usuario: ...] [Fecha: ...] junto con
+    sus líneas de texto. Las líneas fuera de una entrada (encabezados del archivo) cuentan
+    cada una por separado.
+  - En cada actualización solo se reindexan los archivos cuyo inodo, tamaño o mtime cambiaron.
+    Si un archivo solo creció (el caso normal: escribir_archivo anexa), se indexa únicamente la
+    parte nueva; si se reemplazó (otro inodo, p. ej. al sellarlo en un segmento) o se achicó,
+    se reindexa completo.
+  - Una consulta con varias palabras regresa las entradas que las contienen todas (AND).
+  - Las entradas ya selladas en segmentos comprimidos (rotacion.py) no están en este índice;
+    con --archivados se buscan también ahí, abriendo solo los segmentos del rango/usuario pedido.
+Uso por consola:
+  python busqueda.py "presente junio"
+  python busqueda.py --base-dir files @Juan_Pérez junio
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from fechas import parsear_fecha
+from registros import CARPETA_DATOS
+from rotacion import buscar_en_segmentos
+
+NOMBRE_INDICE = "indice_busqueda.sqlite3"
+
+# Palabras: letras, dígitos (incluye acentos) y '_'; así '@Juan_Pérez' se indexa como 'juan_pérez'
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+INICIO_CABECERA = b"[Usuario: "
+# Máximo de líneas que se muestran por entrada encontrada
+MAX_LINEAS_RESULTADO = 20
+
+
+def tokenizar(texto: str) -> List[str]:
+    """Divide un texto en tokens normalizados (casefold) para el índice y las consultas."""
+    return [t.casefold() for t in TOKEN_RE.findall(texto)]
+
+
+@dataclass(frozen=True)
+class Coincidencia:
+    archivo: str
+    offset: int       # offset en bytes del inicio de la entrada dentro del archivo
+    texto: str        # la entrada completa (cabecera + líneas), sin salto final
+
+
+def _bloques(ruta: Path, offset: int) -> Iterator[Tuple[int, Set[str]]]:
+    """
+    Recorre `ruta` desde `offset` y produce (offset del bloque, tokens distintos del bloque).
+    Un bloque es una entrada (cabecera + líneas siguientes) o una línea suelta fuera de entradas.
+    """
+    inicio: Optional[int] = None      # offset de la entrada abierta (None: fuera de una entrada)
+    tokens: Set[str] = set()
+    with open(ruta, "rb") as f:
+        f.seek(offset)
+        for cruda in f:
+            nuevos = tokenizar(cruda.decode("utf-8", errors="replace"))
+            if cruda.startswith(INICIO_CABECERA):
+                if inicio is not None:
+                    yield inicio, tokens
+                inicio, tokens = offset, set(nuevos)
+            elif inicio is not None:
+                tokens.update(nuevos)
+            elif nuevos:
+                yield offset, set(nuevos)
+            offset += len(cruda)
+    if inicio is not None:
+        yield inicio, tokens
+
+
+class IndiceBusqueda:
+    """
+    Índice invertido persistente en SQLite.
+    - archivos(id, nombre, inodo, tamano, mtime_ns): estado de la última indexación de cada archivo.
+    - postings(token, archivo_id, offset): clave primaria (token, archivo_id, offset) en una
+      tabla WITHOUT ROWID, así que la lista de un token es un rango contiguo del B-tree.
+    """
+
+    def __init__(self, base_dir: Path) -> None:
+        self.base_dir = base_dir
+        ruta_db = base_dir / CARPETA_DATOS / NOMBRE_INDICE
+        ruta_db.parent.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(str(ruta_db), check_same_thread=False)
+        self._con.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS archivos (
+                id       INTEGER PRIMARY KEY,
+                nombre   TEXT    NOT NULL UNIQUE,
+                inodo    INTEGER NOT NULL DEFAULT 0,
+                tamano   INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                token      TEXT    NOT NULL,
+                archivo_id INTEGER NOT NULL,
+                offset     INTEGER NOT NULL,
+                PRIMARY KEY (token, archivo_id, offset)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_postings_archivo ON postings (archivo_id);
+            """
+        )
+        columnas = {fila[1] for fila in self._con.execute("PRAGMA table_info(archivos)")}
+        if "inodo" not in columnas:
+            # Índices creados antes de guardar el inodo: inodo 0 fuerza una reindexación completa
+            with self._con:
+                self._con.execute("ALTER TABLE archivos ADD COLUMN inodo INTEGER NOT NULL DEFAULT 0")
+
+    # ---------- indexación ----------
+    def _indexar_desde(self, archivo_id: int, ruta: Path, offset: int) -> None:
+        """Indexa `ruta` a partir del byte `offset` (que debe ser inicio de línea)."""
+        filas = ((token, archivo_id, inicio)
+                 for inicio, tokens in _bloques(ruta, offset) for token in tokens)
+        self._con.executemany(
+            "INSERT OR IGNORE INTO postings (token, archivo_id, offset) VALUES (?, ?, ?)", filas)
+
+    def actualizar(self) -> Tuple[int, int]:
+        """
+        Sincroniza el índice con la carpeta. Regresa (archivos reindexados, archivos quitados).
+        - Archivo nuevo, reemplazado (otro inodo), más corto o modificado de otra forma -> se
+          reindexa completo.
+        - Archivo que solo creció desde un final de línea -> se indexa solo la parte nueva.
+        """
+        actuales: Dict[str, os.stat_result] = {}
+        with os.scandir(self.base_dir) as it:
+            for e in it:
+                if not e.name.startswith(".") and e.is_file():
+                    actuales[e.name] = e.stat()
+        previos = {nombre: (id_, inodo, tam, mtime) for id_, nombre, inodo, tam, mtime
+                   in self._con.execute("SELECT id, nombre, inodo, tamano, mtime_ns FROM archivos")}
+
+        reindexados = quitados = 0
+        with self._con:
+            for nombre, (id_, *_) in previos.items():
+                if nombre not in actuales:
+                    self._con.execute("DELETE FROM postings WHERE archivo_id = ?", (id_,))
+                    self._con.execute("DELETE FROM archivos WHERE id = ?", (id_,))
+                    quitados += 1
+            for nombre, st in actuales.items():
+                previo = previos.get(nombre)
+                if previo is not None and previo[1:] == (st.st_ino, st.st_size, st.st_mtime_ns):
+                    continue
+                ruta = self.base_dir / nombre
+                if previo is None:
+                    cursor = self._con.execute(
+                        "INSERT INTO archivos (nombre, inodo, tamano, mtime_ns) VALUES (?, ?, ?, ?)",
+                        (nombre, st.st_ino, st.st_size, st.st_mtime_ns))
+                    self._indexar_desde(cursor.lastrowid, ruta, 0)
+                else:
+                    id_, inodo_previo, tamano_previo, _ = previo
+                    if (st.st_ino == inodo_previo and st.st_size > tamano_previo
+                            and self._termina_en_linea(ruta, tamano_previo)):
+                        self._indexar_desde(id_, ruta, tamano_previo)
+                    else:
+                        self._con.execute("DELETE FROM postings WHERE archivo_id = ?", (id_,))
+                        self._indexar_desde(id_, ruta, 0)
+                    self._con.execute(
+                        "UPDATE archivos SET inodo = ?, tamano = ?, mtime_ns = ? WHERE id = ?",
+                        (st.st_ino, st.st_size, st.st_mtime_ns, id_))
+                reindexados += 1
+        return reindexados, quitados
+
+    @staticmethod
+    def _termina_en_linea(ruta: Path, tamano: int) -> bool:
+        """True si el byte anterior a `tamano` es un salto de línea (el crecimiento fue un anexo limpio)."""
+        if tamano == 0:
+            return True
+        with open(ruta, "rb") as f:
+            f.seek(tamano - 1)
+            return f.read(1) == b"\n"
+
+    # ---------- consultas ----------
+    def buscar(self, consulta: str, limite: int = 50) -> List[Coincidencia]:
+        """Entradas que contienen todos los tokens de la consulta, por archivo y offset."""
+        tokens = list(dict.fromkeys(tokenizar(consulta)))
+        if not tokens:
+            return []
+        # El token menos frecuente guía el recorrido (conteo acotado para no leer listas enormes);
+        # los demás se comprueban con búsquedas puntuales sobre la clave primaria.
+        tokens.sort(key=lambda t: self._con.execute(
+            "SELECT count(*) FROM (SELECT 1 FROM postings WHERE token = ? LIMIT 10000)", (t,)
+        ).fetchone()[0])
+        condiciones = "".join(
+            " AND EXISTS (SELECT 1 FROM postings AS q WHERE q.token = ?"
+            " AND q.archivo_id = p.archivo_id AND q.offset = p.offset)"
+            for _ in tokens[1:]
+        )
+        filas = self._con.execute(
+            "SELECT a.nombre, p.offset FROM postings AS p JOIN archivos AS a ON a.id = p.archivo_id "
+            f"WHERE p.token = ?{condiciones} ORDER BY p.archivo_id, p.offset LIMIT ?",
+            (*tokens, limite),
+        ).fetchall()
+        filas.sort()
+        return [Coincidencia(nombre, offset, self._leer_bloque(nombre, offset)) for nombre, offset in filas]
+
+    def _leer_bloque(self, archivo: str, offset: int) -> str:
+        """Lee la entrada que comienza en `offset` (hasta la siguiente cabecera)."""
+        lineas: List[str] = []
+        with open(self.base_dir / archivo, "rb") as f:
+            f.seek(offset)
+            for i, cruda in enumerate(f):
+                if i == MAX_LINEAS_RESULTADO or (i > 0 and cruda.startswith(INICIO_CABECERA)):
+                    break
+                lineas.append(cruda.rstrip(b"\r\n").decode("utf-8", errors="replace"))
+                if i == 0 and not cruda.startswith(INICIO_CABECERA):
+                    break  # Línea suelta: el bloque es solo esa línea
+        return "\n".join(lineas)
+
+    def cerrar(self) -> None:
+        self._con.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Búsqueda de texto en los archivos de asistencia.")
+    parser.add_argument("consulta", help="Palabras a buscar (todas deben aparecer en la entrada)")
+    parser.add_argument("--base-dir", type=Path, default=Path.cwd() / "files",
+                        help="Carpeta de trabajo (por defecto ./files)")
+    parser.add_argument("--limite", type=int, default=50, help="Máximo de resultados")
+    parser.add_argument("--archivados", action="store_true",
+                        help="Busca también en los segmentos comprimidos")
+    parser.add_argument("--usuario", help="Con --archivados: solo segmentos donde aparece el usuario")
+    parser.add_argument("--desde", help="Con --archivados: fecha inicial dd/mm/aaaa")
+    parser.add_argument("--hasta", help="Con --archivados: fecha final dd/mm/aaaa")
+    args = parser.parse_args(argv)
+
+    if not args.base_dir.is_dir():
+        print(f"[Aviso] No existe la carpeta '{args.base_dir}'.")
+        return
+    inicio = time.perf_counter()
+    indice = IndiceBusqueda(args.base_dir)
+    reindexados, quitados = indice.actualizar()
+    t_indice = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    resultados = indice.buscar(args.consulta, args.limite)
+    t_consulta = time.perf_counter() - inicio
+    indice.cerrar()
+    for r in resultados:
+        print(f"--- {r.archivo} @ {r.offset}")
+        print(r.texto)
+    print(f"{len(resultados)} resultado(s) | consulta {t_consulta * 1e3:.2f} ms | "
+          f"índice {t_indice * 1e3:.1f} ms ({reindexados} reindexados, {quitados} quitados)")
+    if args.archivados:
+        try:
+            filtros = {"desde": parsear_fecha(args.desde) if args.desde else None,
+                       "hasta": parsear_fecha(args.hasta) if args.hasta else None,
+                       "usuario": args.usuario}
+        except ValueError:
+            print("Formato inválido. Usa dd/mm/aaaa y una fecha que exista.")
+            return
+        archivados = 0
+        for r in buscar_en_segmentos(args.base_dir, args.consulta, **filtros):
+            d, m, a = r.fecha_tuple
+            print(f"--- {r.archivo} (archivado) @ {r.offset}")
+            print(f"[Usuario: {r.nickname}] [Fecha: {d:02d}/{m:02d}/{a:04d}]\n{r.texto}")
+            archivados += 1
+            if archivados >= args.limite:
+                break
+        print(f"{archivados} resultado(s) archivados")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,440 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo: Diario de escrituras (write-ahead journal) con confirmación en grupo
+Autor: Alexis Ayala
+Descripción:
+  - Antes de tocar un archivo de asistencia, cada escritura (anexo de una entrada o creación de
+    un archivo) se registra en un diario dentro de base_dir y se fuerza al disco. Si el programa
+    o la máquina se caen a la mitad, al arrancar se reproduce el diario y ningún archivo queda
+    truncado ni pierde una entrada ya confirmada.
+  - Cada DiarioEscrituras tiene su propio diario (.datos/diario.<pid>.<n>.wal) con un flock
+    exclusivo mientras vive. Reproducir solo toca diarios huérfanos (su dueño ya no tiene el
+    candado: terminó o se cayó), así que dos sesiones o procesos nunca reaplican ni vacían el
+    diario del otro. Sin fcntl (Windows) solo se distinguen los diarios vivos del mismo proceso.
+  - Confirmación en grupo: un fsync por escritura es lento, así que las escrituras que llegan
+    dentro de una ventana de tiempo (`ventana`, en segundos) comparten un solo fsync. El primer
+    hilo que espera hace de "líder": espera la ventana, fuerza el diario al disco y aplica toda
+    la tanda a los archivos en orden; los demás solo esperan a que su escritura quede aplicada.
+  - Cada registro lleva su CRC32: un registro cortado al final del diario (caída a mitad de la
+    escritura) nunca se confirmó y se descarta al reproducir.
+  - Cada anexo guarda su offset real en el archivo destino; si otro proceso hizo crecer el
+    archivo entre medio, se agrega un registro de corrección. La reproducción es idempotente
+    (también si se interrumpe y se repite): un anexo que ya está en su offset no se reescribe.
+  - Los anexos se aplican con el EscritorAnexos de la sesión (archivos abiertos acotados).
+  - Cuando el diario pasa de `max_bytes`, los archivos aplicados se fuerzan al disco y el
+    diario se vacía (checkpoint).
+Uso por consola:
+  python diario.py reproducir --base-dir files
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from metricas import METRICAS
+from registros import CARPETA_DATOS
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin flock entre procesos (ver la descripción del módulo)
+    fcntl = None
+
+# Nombre del diario único de versiones anteriores; se sigue reproduciendo si quedó con registros
+NOMBRE_DIARIO = "diario.wal"
+PATRON_DIARIOS = "diario*.wal"
+# Segundos que el líder espera para juntar escrituras. Con 0 igual se agrupan de forma natural:
+# lo que llega mientras corre un fsync se confirma junto en el siguiente.
+VENTANA_POR_DEFECTO = 0.0
+MAX_BYTES_DIARIO = 4 * 1024 * 1024
+
+ANEXO, CREACION, CORRECCION = 1, 2, 3
+# Registro: largo de datos, CRC32, tipo, largo del nombre, offset; luego nombre y datos.
+# Una CORRECCION lleva en sus datos la posición (en el diario) del anexo que corrige.
+# El CRC cubre todo lo que va después de él.
+_CABECERA = struct.Struct("<IIBHq")
+
+
+# Diarios abiertos por este proceso (para distinguirlos sin flock) y contador para nombrarlos
+_ACTIVOS: Set[Path] = set()
+_SECUENCIA = itertools.count(1)
+
+
+def ruta_diario(base_dir: Path) -> Path:
+    """Diario único de versiones anteriores (ver rutas_diario para los de cada escritor)."""
+    return base_dir / CARPETA_DATOS / NOMBRE_DIARIO
+
+
+def rutas_diario(base_dir: Path) -> List[Path]:
+    """Todos los diarios de `base_dir` (vivos o huérfanos)."""
+    return sorted((base_dir / CARPETA_DATOS).glob(PATRON_DIARIOS))
+
+
+def _tomar_diario(f: BinaryIO, esperar: bool) -> bool:
+    """flock exclusivo sobre el diario abierto en `f`. Sin `esperar`, False si otro lo tiene."""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if esperar else fcntl.LOCK_NB))
+    except BlockingIOError:
+        return False
+    return True
+
+
+def _codificar(tipo: int, nombre: str, offset: int, datos: bytes) -> bytes:
+    nombre_b = nombre.encode("utf-8")
+    resto = struct.pack("<BHq", tipo, len(nombre_b), offset) + nombre_b + datos
+    return struct.pack("<II", len(datos), zlib.crc32(resto)) + resto
+
+
+def leer_registros(ruta: Path) -> Iterator[Tuple[int, int, str, int, bytes]]:
+    """
+    Produce (posición, tipo, nombre, offset, datos) de cada registro válido del diario, en orden;
+    la posición (en bytes, dentro del diario) identifica al registro.
+    Se detiene en el primer registro incompleto o con CRC inválido (la cola no confirmada).
+    """
+    try:
+        f = open(ruta, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        posicion = 0
+        while True:
+            cabecera = f.read(_CABECERA.size)
+            if len(cabecera) < _CABECERA.size:
+                return
+            largo, crc, tipo, largo_nombre, offset = _CABECERA.unpack(cabecera)
+            cuerpo = f.read(largo_nombre + largo)
+            if len(cuerpo) < largo_nombre + largo or zlib.crc32(cabecera[8:] + cuerpo) != crc:
+                return
+            yield posicion, tipo, cuerpo[:largo_nombre].decode("utf-8"), offset, cuerpo[largo_nombre:]
+            posicion += _CABECERA.size + largo_nombre + largo
+
+
+def _correccion(nombre: str, posicion: int, offset: int) -> bytes:
+    """Registro que corrige el offset real del anexo escrito en `posicion` del diario."""
+    return _codificar(CORRECCION, nombre, offset, struct.pack("<q", posicion))
+
+
+def _fsync_ruta(ruta: Path) -> None:
+    """Fuerza al disco un archivo o carpeta ya escritos (sin reabrirlos para escribir)."""
+    fd = os.open(ruta, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _reaplicar_anexo(ruta: Path, offset: int, datos: bytes,
+                     corregir: Callable[[int], None]) -> bool:
+    """
+    Aplica un anexo del diario solo si falta (o quedó a medias). Regresa True si escribió.
+    - Si los bytes ya están en `offset`, no hace nada.
+    - Si el archivo termina a la mitad del anexo (escritura cortada), completa lo que falta.
+    - En otro caso lo anexa al final; si ese final no es `offset` (el archivo cambió por fuera
+      del diario), antes registra el offset real con `corregir`: así una segunda reproducción
+      (p. ej. tras otra caída) lo encuentra ahí y no lo duplica.
+    """
+    existe = ruta.exists()
+    with open(ruta, "r+b" if existe else "wb") as f:
+        tamano = f.seek(0, os.SEEK_END)
+        if offset <= tamano:
+            f.seek(offset)
+            actual = f.read(len(datos))
+            if actual == datos:
+                return False
+            if offset + len(actual) == tamano and datos.startswith(actual):
+                f.write(datos[len(actual):])
+                return True
+        if tamano != offset:
+            corregir(tamano)
+        f.seek(0, os.SEEK_END)
+        f.write(datos)
+    return True
+
+
+def _reaplicar_creacion(ruta: Path, datos: bytes) -> bool:
+    """Recrea un archivo del diario si no existe o quedó truncado. Regresa True si escribió."""
+    if ruta.exists():
+        with open(ruta, "rb") as f:
+            if f.read(len(datos)) == datos:
+                return False
+    temporal = ruta.with_name(f".{ruta.name}.tmp")
+    temporal.write_bytes(datos)
+    os.replace(temporal, ruta)
+    return True
+
+
+def reproducir_diario(base_dir: Path) -> int:
+    """
+    Reproduce los diarios huérfanos de `base_dir`, fuerza los archivos al disco y los borra.
+    Los diarios con dueño vivo (candado tomado) no se tocan.
+    Regresa cuántos registros hubo que volver a aplicar. Es idempotente aunque se interrumpa:
+    volver a reproducir el mismo diario no duplica ninguna entrada.
+    """
+    aplicados = 0
+    for ruta in rutas_diario(base_dir):
+        if ruta in _ACTIVOS:
+            continue
+        try:
+            diario = open(ruta, "r+b")
+        except FileNotFoundError:  # Otro proceso lo reprodujo y lo borró entre medio
+            continue
+        with diario:
+            if _tomar_diario(diario, esperar=False):
+                aplicados += _reproducir(base_dir, ruta, diario)
+    return aplicados
+
+
+def _reproducir(base_dir: Path, ruta: Path, diario: BinaryIO) -> int:
+    """Reproduce un diario ya tomado (abierto en `diario`), lo vacía y lo borra."""
+    registros = list(leer_registros(ruta))
+    # Offsets reales de anexos que no quedaron donde se esperaba (última corrección manda)
+    correcciones: Dict[int, int] = {}
+    for _, tipo, _, offset, datos in registros:
+        if tipo == CORRECCION:
+            correcciones[struct.unpack("<q", datos)[0]] = offset
+    aplicados = 0
+    tocados: Set[Path] = set()
+    fin_valido = 0
+    if registros:
+        posicion, _, nombre, _, datos = registros[-1]
+        fin_valido = posicion + _CABECERA.size + len(nombre.encode("utf-8")) + len(datos)
+    # Lo que siga a los registros válidos es una cola cortada: se descarta antes de anexar
+    diario.truncate(fin_valido)
+    diario.seek(0, os.SEEK_END)
+
+    for posicion, tipo, nombre, offset, datos in registros:
+        destino = base_dir / nombre
+        if tipo == CREACION:
+            escribio = _reaplicar_creacion(destino, datos)
+        elif tipo == ANEXO:
+            def corregir(real: int, nombre=nombre, posicion=posicion) -> None:
+                diario.write(_correccion(nombre, posicion, real))
+                diario.flush()
+                os.fsync(diario.fileno())
+            escribio = _reaplicar_anexo(destino, correcciones.get(posicion, offset), datos, corregir)
+        else:
+            continue
+        if escribio:
+            aplicados += 1
+            tocados.add(destino)
+    for destino in tocados:
+        _fsync_ruta(destino)
+    if tocados:
+        _fsync_ruta(base_dir)
+    # Vaciado antes de borrar: quien lo abrió antes del borrado y toma el candado después no
+    # encuentra nada que reaplicar
+    diario.truncate(0)
+    os.fsync(diario.fileno())
+    ruta.unlink()
+    _fsync_ruta(ruta.parent)
+    return aplicados
+
+
+class _Pendiente:
+    """Una escritura que espera su confirmación."""
+
+    __slots__ = ("tipo", "ruta", "texto", "datos", "offset", "posicion", "hecho", "error")
+
+    def __init__(self, tipo: int, ruta: Path, texto: str) -> None:
+        self.tipo = tipo
+        self.ruta = ruta
+        self.texto = texto
+        self.datos = texto.encode("utf-8")
+        self.offset = 0
+        self.posicion = 0          # posición de su registro dentro del diario
+        self.hecho = False
+        self.error: Optional[BaseException] = None
+
+
+class DiarioEscrituras:
+    """
+    Escrituras duraderas para los archivos de `base_dir` con confirmación en grupo.
+    - Los anexos se aplican con el EscritorAnexos de la sesión (`escritor`): se respetan su
+      límite de archivos abiertos y su política de vaciado; el diario aporta la durabilidad.
+    - `anexar` y `crear` regresan cuando la escritura ya está en el diario en disco y aplicada
+      al archivo destino (los lectores la ven de inmediato).
+    - Es seguro usarlo desde varios hilos; las escrituras de una misma ventana comparten fsync.
+      Solo el líder de turno usa `escritor`, así que nunca se usa desde dos hilos a la vez.
+    - Escribe en su propio diario, con flock exclusivo hasta `cerrar` (que lo borra).
+    """
+
+    def __init__(self, base_dir: Path, escritor, ventana: float = VENTANA_POR_DEFECTO,
+                 max_bytes: int = MAX_BYTES_DIARIO) -> None:
+        self.base_dir = base_dir
+        self.escritor = escritor
+        self.ventana = ventana
+        self.max_bytes = max_bytes
+        (base_dir / CARPETA_DATOS).mkdir(parents=True, exist_ok=True)
+        reproducir_diario(base_dir)   # Lo que haya quedado de una caída anterior
+        self.ruta = base_dir / CARPETA_DATOS / f"diario.{os.getpid()}.{next(_SECUENCIA)}.wal"
+        self._f: BinaryIO = open(self.ruta, "ab")
+        _tomar_diario(self._f, esperar=True)
+        _ACTIVOS.add(self.ruta)
+        self._cond = threading.Condition()
+        self._cola: List[_Pendiente] = []
+        self._lider = False
+        self._sucios: Set[Path] = set()           # aplicados desde el último checkpoint
+        self.confirmaciones = 0                   # fsyncs del diario
+        self.escrituras = 0
+
+    # ---------- API ----------
+    def anexar(self, ruta: Path, texto: str) -> int:
+        """Anexa `texto` a `ruta` de forma duradera. Regresa el offset real donde quedó."""
+        return self._confirmar(_Pendiente(ANEXO, ruta, texto)).offset
+
+    def crear(self, ruta: Path, contenido: str) -> None:
+        """Crea (o reemplaza) `ruta` con `contenido` de forma duradera y atómica."""
+        self._confirmar(_Pendiente(CREACION, ruta, contenido))
+
+    def checkpoint(self) -> None:
+        """Fuerza al disco los archivos aplicados y vacía el diario."""
+        with self._cond:
+            while self._lider:
+                self._cond.wait()
+            self._lider = True
+        try:
+            self._checkpoint()
+        finally:
+            with self._cond:
+                self._lider = False
+                self._cond.notify_all()
+
+    def cerrar(self) -> None:
+        """Checkpoint final y borrado del diario (el escritor lo cierra su dueño)."""
+        self.checkpoint()
+        self.ruta.unlink()
+        _ACTIVOS.discard(self.ruta)
+        self._f.close()
+
+    # ---------- confirmación en grupo ----------
+    def _confirmar(self, pendiente: _Pendiente) -> _Pendiente:
+        """Encola `pendiente` y espera su confirmación; si no hay líder, este hilo lo es."""
+        pendiente.ruta.relative_to(self.base_dir)   # ValueError si está fuera de base_dir
+        with self._cond:
+            self._cola.append(pendiente)
+            while not pendiente.hecho:
+                if self._lider:
+                    self._cond.wait()
+                    continue
+                self._lider = True
+                self._cond.release()
+                try:
+                    self._liderar()
+                finally:
+                    self._cond.acquire()
+        if pendiente.error is not None:
+            raise pendiente.error
+        return pendiente
+
+    def _liderar(self) -> None:
+        """Un ciclo de confirmación: ventana, registros + fsync del diario y aplicación."""
+        inicio = time.perf_counter()
+        if self.ventana > 0:
+            time.sleep(self.ventana)
+        with self._cond:
+            tanda, self._cola = self._cola, []
+        error: Optional[BaseException] = None
+        try:
+            self._registrar(tanda)
+            self._aplicar(tanda)
+            if self._f.tell() > self.max_bytes:
+                self._checkpoint()
+        except Exception as e:  # El error se entrega a cada escritura de la tanda
+            error = e
+        with self._cond:
+            for p in tanda:
+                p.hecho, p.error = True, error
+            self._lider = False
+            self.confirmaciones += 1
+            self.escrituras += len(tanda)
+            self._cond.notify_all()
+        METRICAS.observar("diario_confirmacion", time.perf_counter() - inicio)
+
+    def _registrar(self, tanda: List[_Pendiente]) -> None:
+        """
+        Escribe los registros de la tanda y fuerza el diario al disco (un solo fsync).
+        El offset de cada anexo sale del tamaño real del destino en este momento.
+        """
+        esperados: Dict[Path, int] = {}
+        partes = []
+        posicion = self._f.tell()
+        for p in tanda:
+            if p.tipo == ANEXO:
+                offset = esperados.get(p.ruta)
+                p.offset = self.escritor.tamano(p.ruta) if offset is None else offset
+                esperados[p.ruta] = p.offset + len(p.datos)
+            else:
+                esperados[p.ruta] = len(p.datos)
+            registro = _codificar(p.tipo, p.ruta.relative_to(self.base_dir).as_posix(), p.offset, p.datos)
+            p.posicion = posicion
+            posicion += len(registro)
+            partes.append(registro)
+        datos = b"".join(partes)
+        self._f.write(datos)
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        METRICAS.sumar_bytes("diario", escritos=len(datos))
+
+    def _aplicar(self, tanda: List[_Pendiente]) -> None:
+        """
+        Aplica la tanda a los destinos en orden. Si un anexo no quedó en el offset registrado
+        (otro proceso hizo crecer el archivo), se registra una corrección con el offset real.
+        """
+        correcciones = []
+        for p in tanda:
+            if p.tipo == CREACION:
+                self.escritor.soltar(p.ruta)
+                temporal = p.ruta.with_name(f".{p.ruta.name}.tmp")
+                temporal.write_bytes(p.datos)
+                os.replace(temporal, p.ruta)
+            else:
+                self.escritor.anexar(p.ruta, p.texto)
+                real = self.escritor.tamano(p.ruta) - len(p.datos)
+                if real != p.offset:
+                    correcciones.append(_correccion(p.ruta.relative_to(self.base_dir).as_posix(),
+                                                    p.posicion, real))
+                    p.offset = real
+            self._sucios.add(p.ruta)
+        if correcciones:
+            self._f.write(b"".join(correcciones))
+            self._f.flush()
+            os.fsync(self._f.fileno())
+
+    def _checkpoint(self) -> None:
+        """Solo el líder: fsync de los destinos aplicados y diario vacío."""
+        self.escritor.vaciar()
+        for ruta in self._sucios:
+            if ruta.exists():
+                _fsync_ruta(ruta)
+        if self._sucios:
+            _fsync_ruta(self.base_dir)
+        self._sucios.clear()
+        self._f.flush()
+        self._f.truncate(0)
+        self._f.seek(0)
+        os.fsync(self._f.fileno())
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Diario de escrituras de la carpeta de trabajo.")
+    parser.add_argument("comando", choices=("reproducir",))
+    parser.add_argument("--base-dir", type=Path, default=Path.cwd() / "files",
+                        help="Carpeta de trabajo (por defecto ./files)")
+    args = parser.parse_args(argv)
+    if not args.base_dir.is_dir():
+        print(f"[Aviso] No existe la carpeta '{args.base_dir}'.")
+        return
+    n = reproducir_diario(args.base_dir)
+    print(f"Registros reaplicados: {n}")
+
+
+if __name__ == "__main__":
+    main()
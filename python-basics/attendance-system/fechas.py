@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo: Interpretación de fechas dd/mm/aaaa
+Autor: Alexis Ayala
+Descripción:
+  - Punto único para convertir 'dd/mm/aaaa' en la tupla (día, mes, año) que usa el sistema
+    (captura en pantalla, cabeceras de los archivos, cargas por lotes y reportes).
+  - Camino rápido: el formato es fijo, así que basta con rebanar la cadena y validar el día
+    contra el calendario, sin pasar por datetime.strptime.
+  - Las entradas que no tienen exactamente el formato fijo (p. ej. '1/6/2023') se delegan a
+    strptime, para aceptar lo mismo que antes.
+  - `parsear_fecha` guarda en caché (LRU) las fechas repetidas: en un archivo de asistencias
+    la misma fecha aparece miles de veces.
+  - `parsear_fechas` interpreta un arreglo completo de cadenas de una vez (NumPy si está
+    disponible) y acepta exactamente lo mismo que `parsear_fecha`: lo que no tiene el formato
+    fijo se resuelve cadena por cadena con el parser escalar.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+FORMATO = "%d/%m/%Y"
+_DIAS_POR_MES = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def es_bisiesto(anio: int) -> bool:
+    return anio % 4 == 0 and (anio % 100 != 0 or anio % 400 == 0)
+
+
+def dias_del_mes(mes: int, anio: int) -> int:
+    """Cantidad de días del mes (1..12) en el año indicado."""
+    return 29 if mes == 2 and es_bisiesto(anio) else _DIAS_POR_MES[mes - 1]
+
+
+def _parsear_lento(raw: str) -> Tuple[int, int, int]:
+    dt = datetime.strptime(raw, FORMATO)
+    return (dt.day, dt.month, dt.year)
+
+
+def parsear_fecha_sin_cache(raw: str) -> Tuple[int, int, int]:
+    """
+    Convierte 'dd/mm/aaaa' en (día, mes, año).
+    Lanza ValueError si el texto no tiene el formato o la fecha no existe (p. ej. 31/02/2023).
+    """
+    raw = raw.strip()
+    if len(raw) != 10 or raw[2] != "/" or raw[5] != "/":
+        return _parsear_lento(raw)
+    dd, mm, aaaa = raw[:2], raw[3:5], raw[6:]
+    if not (dd.isdigit() and mm.isdigit() and aaaa.isdigit() and dd.isascii()
+            and mm.isascii() and aaaa.isascii()):
+        return _parsear_lento(raw)
+    d, m, a = int(dd), int(mm), int(aaaa)
+    if a < 1 or not 1 <= m <= 12 or not 1 <= d <= dias_del_mes(m, a):
+        raise ValueError(f"La fecha '{raw}' no existe en el calendario.")
+    return (d, m, a)
+
+
+@lru_cache(maxsize=4096)
+def parsear_fecha(raw: str) -> Tuple[int, int, int]:
+    """parsear_fecha_sin_cache con caché LRU para fechas repetidas."""
+    return parsear_fecha_sin_cache(raw)
+
+
+def parsear_fechas(cadenas: Sequence[str]):
+    """
+    Versión vectorizada de `parsear_fecha` para arreglos de fechas.
+    Regresa (dias, meses, anios, validas): con NumPy son arreglos; sin NumPy, listas.
+    Una posición es válida si y solo si `parsear_fecha` la acepta; las inválidas quedan con
+    validas=False (y ceros).
+    """
+    if np is None:
+        dias: List[int] = []
+        meses: List[int] = []
+        anios: List[int] = []
+        validas: List[bool] = []
+        for raw in cadenas:
+            d, m, a = _parsear_o_ceros(raw)
+            dias.append(d)
+            meses.append(m)
+            anios.append(a)
+            validas.append(a > 0)
+        return dias, meses, anios, validas
+
+    # Sin dtype fijo: con "U10" NumPy truncaría en silencio '12/06/20234' a '12/06/2023'
+    texto = np.asarray(cadenas, dtype=str)
+    n = len(texto)
+    ancho = texto.dtype.itemsize // 4
+    if n == 0 or ancho < 10:
+        codigos = np.zeros((n, 10), dtype=np.uint32)
+    else:
+        # Cada cadena se ve como `ancho` puntos de código UCS-4; las cortas quedan rellenas con 0
+        codigos = texto.view(np.uint32).reshape(n, ancho)
+    digitos = codigos[:, :10].astype(np.int64) - ord("0")
+    posiciones = [0, 1, 3, 4, 6, 7, 8, 9]
+    forma_ok = (
+        (codigos[:, 2] == ord("/")) & (codigos[:, 5] == ord("/"))
+        & np.all((digitos[:, posiciones] >= 0) & (digitos[:, posiciones] <= 9), axis=1)
+    )
+    if codigos.shape[1] > 10:
+        forma_ok &= codigos[:, 10] == 0     # exactamente 10 caracteres
+    dias = digitos[:, 0] * 10 + digitos[:, 1]
+    meses = digitos[:, 3] * 10 + digitos[:, 4]
+    anios = digitos[:, 6] * 1000 + digitos[:, 7] * 100 + digitos[:, 8] * 10 + digitos[:, 9]
+    bisiesto = (anios % 4 == 0) & ((anios % 100 != 0) | (anios % 400 == 0))
+    tabla = np.array((0,) + _DIAS_POR_MES, dtype=np.int64)
+    maximo = tabla[np.clip(meses, 0, 12)] + ((meses == 2) & bisiesto)
+    validas = forma_ok & (anios >= 1) & (meses >= 1) & (meses <= 12) & (dias >= 1) & (dias <= maximo)
+    dias, meses, anios = np.where(validas, dias, 0), np.where(validas, meses, 0), np.where(validas, anios, 0)
+    # Lo que no tiene el formato fijo (espacios, '1/6/2023', ...) pasa por el parser escalar
+    for i in np.flatnonzero(~forma_ok):
+        dias[i], meses[i], anios[i] = _parsear_o_ceros(cadenas[i])
+        validas[i] = anios[i] > 0
+    return dias, meses, anios, validas
+
+
+def _parsear_o_ceros(raw: str) -> Tuple[int, int, int]:
+    try:
+        return parsear_fecha(raw)
+    except ValueError:
+        return (0, 0, 0)
@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo: Importación masiva en paralelo
+Autor: Alexis Ayala
+Descripción:
+  - Importa años de archivos de texto heredados (formato de escribir_archivo: cabeceras
+    [Usuario: ...] [Fecha: ...] seguidas de sus líneas) repartiendo el trabajo entre procesos.
+  - La unidad de trabajo es un fragmento: un archivo chico completo o un rango de bytes de uno
+    grande. Los cortes siempre caen al inicio de una cabecera, así que ninguna entrada se parte.
+  - Cada archivo se identifica por su ruta relativa a la raíz de la importación (por defecto,
+    la carpeta común de todos): '2022/asistencias.txt' y '2023/asistencias.txt' no chocan en el
+    almacén. Un mismo archivo indicado dos veces se importa una sola vez.
+  - Cada proceso interpreta su fragmento y regresa las filas ya ordenadas por
+    (día, usuario, texto, archivo, offset); el proceso principal solo mezcla listas ordenadas
+    (heapq.merge) y descarta las filas repetidas, que son las de igual (archivo, offset). Dos
+    entradas iguales en archivos distintos (el mismo alumno, el mismo día, en dos clases) son
+    asistencias distintas y se conservan.
+  - El resultado va al almacén SQLite (registros.py) o, con --salida, a un CSV con el formato
+    que lee lote.py (usuario,fecha,archivo,texto).
+  - Muestra el avance por fragmento y, al final, el tiempo y el volumen de cada proceso.
+Uso por consola:
+  python importador.py viejos/*.txt
+  python importador.py viejos/*.txt --procesos 8 --tam-fragmento 16 --salida historico.csv
+  python importador.py viejos/2022/*.txt viejos/2023/*.txt --raiz viejos
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import heapq
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from registros import (
+    AlmacenRegistros,
+    Registro,
+    fecha_a_ordinal,
+    iterar_bloques,
+    ordinal_a_fecha,
+    parsear_cabecera,
+)
+
+# Tamaño objetivo de un fragmento (bytes): archivos más grandes se parten en varios
+TAM_FRAGMENTO = 8 * 1024 * 1024
+INICIO_CABECERA = b"[Usuario: "
+
+# Fila intermedia: (día ordinal, nickname, texto, archivo, offset).
+# El orden de los campos es el orden de la salida; (archivo, offset) identifica la entrada.
+Fila = Tuple[int, str, str, str, int]
+
+
+@dataclass(frozen=True)
+class Fragmento:
+    ruta: str
+    archivo: str      # nombre con que se registra: ruta relativa a la raíz de la importación
+    inicio: int
+    fin: int
+
+    @property
+    def tamano(self) -> int:
+        return self.fin - self.inicio
+
+
+@dataclass
+class TiempoProceso:
+    """Trabajo acumulado por un proceso del pool."""
+    fragmentos: int = 0
+    bytes: int = 0
+    entradas: int = 0
+    segundos: float = 0.0
+
+
+@dataclass
+class ResumenImportacion:
+    archivos: int = 0
+    fragmentos: int = 0
+    bytes: int = 0
+    entradas: int = 0           # entradas leídas (con duplicados)
+    unicas: int = 0             # entradas después de quitar duplicados
+    nuevas: int = 0             # entradas que no estaban ya en el almacén
+    segundos: float = 0.0
+    por_proceso: Dict[int, TiempoProceso] = field(default_factory=dict)
+
+    @property
+    def mb_por_segundo(self) -> float:
+        return self.bytes / 1e6 / self.segundos if self.segundos > 0 else 0.0
+
+
+def _siguiente_cabecera(f, posicion: int, tamano: int) -> int:
+    """Offset de la primera línea de cabecera que empieza en `posicion` o después (o `tamano`)."""
+    if posicion > 0:
+        # Termina la línea en curso; si posicion-1 es '\n', la línea siguiente empieza en posicion
+        f.seek(posicion - 1)
+        f.readline()
+    else:
+        f.seek(0)
+    posicion = f.tell()
+    for linea in iter(f.readline, b""):
+        if linea.startswith(INICIO_CABECERA) and parsear_cabecera(linea.decode("utf-8", errors="replace")):
+            return posicion
+        posicion += len(linea)
+    return tamano
+
+
+def nombres_relativos(rutas: Iterable[Path], raiz: Optional[Path] = None) -> Dict[Path, str]:
+    """
+    {ruta resuelta: nombre relativo a `raiz`} sin rutas repetidas. Sin `raiz` se usa la carpeta
+    común de todos los archivos (si todos están en la misma, el nombre es el del archivo).
+    Lanza ValueError si un archivo queda fuera de `raiz`.
+    """
+    resueltas = list(dict.fromkeys(Path(r).resolve() for r in rutas))
+    if not resueltas:
+        return {}
+    base = Path(raiz).resolve() if raiz is not None else Path(os.path.commonpath([r.parent for r in resueltas]))
+    return {r: r.relative_to(base).as_posix() for r in resueltas}
+
+
+def fragmentar(rutas: Iterable[Path], tam_fragmento: int = TAM_FRAGMENTO,
+               raiz: Optional[Path] = None) -> List[Fragmento]:
+    """
+    Reparte los archivos en fragmentos de ~`tam_fragmento` bytes. Cada corte se recorre hasta
+    la siguiente cabecera válida, así que un fragmento siempre contiene entradas completas.
+    """
+    fragmentos: List[Fragmento] = []
+    for ruta, archivo in nombres_relativos(rutas, raiz).items():
+        tamano = os.path.getsize(ruta)
+        cortes = [0]
+        if tamano > tam_fragmento:
+            with open(ruta, "rb") as f:
+                objetivo = tam_fragmento
+                while objetivo < tamano:
+                    corte = _siguiente_cabecera(f, objetivo, tamano)
+                    if corte >= tamano:
+                        break
+                    cortes.append(corte)
+                    objetivo = corte + tam_fragmento
+        cortes.append(tamano)
+        fragmentos.extend(Fragmento(str(ruta), archivo, a, b) for a, b in zip(cortes, cortes[1:]))
+    return fragmentos
+
+
+def _lineas_rango(f, inicio: int, fin: int) -> Iterator[bytes]:
+    """Líneas del archivo entre [inicio, fin) (fin siempre cae al inicio de una línea)."""
+    f.seek(inicio)
+    restante = fin - inicio
+    for linea in f:
+        if restante <= 0:
+            break
+        restante -= len(linea)
+        yield linea
+
+
+def importar_fragmento(fragmento: Fragmento) -> Tuple[Fragmento, List[Fila], float, int]:
+    """
+    Trabajo de un proceso: interpreta las entradas del fragmento y las regresa ordenadas.
+    Regresa (fragmento, filas, segundos, pid). Las filas son tuplas (baratas de enviar entre
+    procesos); las líneas previas a la primera cabecera del archivo se ignoran.
+    """
+    inicio = time.perf_counter()
+    archivo = fragmento.archivo
+    filas: List[Fila] = []
+    with open(fragmento.ruta, "rb") as f:
+        for cabecera, offset, crudo in iterar_bloques(_lineas_rango(f, fragmento.inicio, fragmento.fin)):
+            if cabecera is None:
+                continue
+            cuerpo = crudo[crudo.index(b"\n") + 1:] if b"\n" in crudo else b""
+            texto = cuerpo.decode("utf-8", errors="replace").rstrip("\n")
+            filas.append((fecha_a_ordinal(cabecera[1]), cabecera[0], texto, archivo, fragmento.inicio + offset))
+    filas.sort()
+    return fragmento, filas, time.perf_counter() - inicio, os.getpid()
+
+
+def mezclar_sin_duplicados(partes: List[List[Fila]]) -> Iterator[Fila]:
+    """
+    Mezcla listas ya ordenadas y omite las filas con el mismo (archivo, offset): la misma
+    entrada leída dos veces. Filas así son idénticas, así que quedan juntas en la mezcla.
+    """
+    anterior = None
+    for fila in heapq.merge(*partes):
+        clave = fila[3:]
+        if clave != anterior:
+            anterior = clave
+            yield fila
+
+
+def _progreso_consola(hechos: int, total: int, bytes_hechos: int, bytes_total: int, segundos: float) -> None:
+    print(f"\r[{hechos:>{len(str(total))}}/{total}] {bytes_hechos / bytes_total if bytes_total else 1:6.1%} "
+          f"{bytes_hechos / 1e6:,.1f} MB en {segundos:.1f} s", end="", file=sys.stderr, flush=True)
+
+
+def importar_paralelo(rutas: Iterable[Path], procesos: Optional[int] = None,
+                      tam_fragmento: int = TAM_FRAGMENTO, raiz: Optional[Path] = None,
+                      destino: Optional[Callable[[Iterator[Fila]], int]] = None,
+                      progreso: Optional[Callable[[int, int, int, int, float], None]] = None
+                      ) -> ResumenImportacion:
+    """
+    Importa los archivos con un pool de `procesos` (por defecto, uno por CPU).
+    Los archivos se registran con su ruta relativa a `raiz` (ver nombres_relativos).
+    `destino` recibe las filas ya ordenadas y sin duplicados y regresa cuántas fueron nuevas;
+    `progreso(hechos, total, bytes_hechos, bytes_total, segundos)` se llama por fragmento.
+    Con procesos=1 todo corre en el proceso actual (sin pool).
+    """
+    rutas = list(nombres_relativos(rutas, raiz))
+    procesos = procesos or os.cpu_count() or 1
+    inicio = time.perf_counter()
+    fragmentos = fragmentar(rutas, tam_fragmento, raiz)
+    # Los fragmentos grandes primero: el último en terminar no deja a los demás procesos ociosos
+    fragmentos.sort(key=lambda fr: fr.tamano, reverse=True)
+    resumen = ResumenImportacion(archivos=len(rutas), fragmentos=len(fragmentos),
+                                 bytes=sum(fr.tamano for fr in fragmentos))
+
+    partes: List[List[Fila]] = []
+    bytes_hechos = 0
+
+    def _registrar(fragmento: Fragmento, filas: List[Fila], segundos: float, pid: int) -> None:
+        nonlocal bytes_hechos
+        tiempo = resumen.por_proceso.setdefault(pid, TiempoProceso())
+        tiempo.fragmentos += 1
+        tiempo.bytes += fragmento.tamano
+        tiempo.entradas += len(filas)
+        tiempo.segundos += segundos
+        partes.append(filas)
+        bytes_hechos += fragmento.tamano
+        resumen.entradas += len(filas)
+        if progreso is not None:
+            progreso(len(partes), len(fragmentos), bytes_hechos, resumen.bytes, time.perf_counter() - inicio)
+
+    if procesos <= 1 or len(fragmentos) <= 1:
+        for fragmento in fragmentos:
+            _registrar(*importar_fragmento(fragmento))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = [ejecutor.submit(importar_fragmento, fr) for fr in fragmentos]
+            for futuro in as_completed(futuros):
+                _registrar(*futuro.result())
+
+    unicas = 0
+
+    def _contar(filas: Iterator[Fila]) -> Iterator[Fila]:
+        nonlocal unicas
+        for fila in filas:
+            unicas += 1
+            yield fila
+
+    filas = _contar(mezclar_sin_duplicados(partes))
+    if destino is None:
+        for _ in filas:
+            pass
+    else:
+        resumen.nuevas = destino(filas)
+    resumen.unicas = unicas
+    resumen.segundos = time.perf_counter() - inicio
+    return resumen
+
+
+def a_almacen(almacen: AlmacenRegistros) -> Callable[[Iterator[Fila]], int]:
+    """Destino: inserta las filas en el almacén SQLite (una transacción)."""
+    def _destino(filas: Iterator[Fila]) -> int:
+        return almacen.agregar_muchos(
+            Registro(nick, ordinal_a_fecha(dia), archivo, offset, texto)
+            for dia, nick, texto, archivo, offset in filas
+        )
+    return _destino
+
+
+def a_csv(ruta: Path) -> Callable[[Iterator[Fila]], int]:
+    """Destino: escribe un CSV con el formato de lote.py (usuario,fecha,archivo,texto)."""
+    def _destino(filas: Iterator[Fila]) -> int:
+        n = 0
+        with open(ruta, "w", encoding="utf-8", newline="") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(("usuario", "fecha", "archivo", "texto"))
+            for dia, nick, texto, archivo, _ in filas:
+                d, m, a = ordinal_a_fecha(dia)
+                escritor.writerow((nick, f"{d:02d}/{m:02d}/{a:04d}", archivo, texto))
+                n += 1
+        return n
+    return _destino
+
+
+def formatear_resumen(resumen: ResumenImportacion) -> str:
+    lineas = [
+        f"Archivos: {resumen.archivos}  Fragmentos: {resumen.fragmentos}  "
+        f"Datos: {resumen.bytes / 1e6:,.1f} MB",
+        f"Entradas leídas: {resumen.entradas}  Únicas: {resumen.unicas}  Nuevas: {resumen.nuevas}",
+        f"Tiempo total: {resumen.segundos:.2f} s ({resumen.mb_por_segundo:,.1f} MB/s)",
+        "",
+        f"{'Proceso':>8} {'Fragmentos':>10} {'MB':>9} {'Entradas':>10} {'Segundos':>9} {'MB/s':>7}",
+    ]
+    for pid, t in sorted(resumen.por_proceso.items()):
+        mbs = t.bytes / 1e6 / t.segundos if t.segundos > 0 else 0.0
+        lineas.append(f"{pid:>8} {t.fragmentos:>10} {t.bytes / 1e6:>9.1f} {t.entradas:>10} "
+                      f"{t.segundos:>9.2f} {mbs:>7.1f}")
+    return "\n".join(lineas)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Importa en paralelo archivos de asistencia heredados.")
+    parser.add_argument("archivos", nargs="+", type=Path)
+    parser.add_argument("--base-dir", type=Path, default=Path.cwd() / "files",
+                        help="Carpeta de trabajo cuyo almacén recibe los registros (por defecto ./files)")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="Procesos del pool (por defecto, uno por CPU)")
+    parser.add_argument("--tam-fragmento", type=int, default=TAM_FRAGMENTO // (1024 * 1024),
+                        help="Tamaño objetivo de cada fragmento en MB (por defecto 8)")
+    parser.add_argument("--raiz", type=Path,
+                        help="Carpeta base de los nombres registrados (por defecto, la común de los archivos)")
+    parser.add_argument("--salida", type=Path,
+                        help="Escribe un CSV (formato de lote.py) en lugar de usar el almacén")
+    parser.add_argument("--silencioso", action="store_true", help="No muestra el avance")
+    args = parser.parse_args(argv)
+
+    faltantes = [r for r in args.archivos if not r.is_file()]
+    for ruta in faltantes:
+        print(f"[Aviso] No existe el archivo '{ruta}'.")
+    rutas = [r for r in args.archivos if r.is_file()]
+    if not rutas:
+        return
+
+    almacen = None
+    if args.salida is not None:
+        destino = a_csv(args.salida)
+    else:
+        almacen = AlmacenRegistros.para_directorio(args.base_dir)
+        destino = a_almacen(almacen)
+    try:
+        resumen = importar_paralelo(rutas, procesos=args.procesos,
+                                    tam_fragmento=max(1, args.tam_fragmento) * 1024 * 1024,
+                                    raiz=args.raiz,
+                                    destino=destino,
+                                    progreso=None if args.silencioso else _progreso_consola)
+    except ValueError as e:
+        print(f"[Error] Un archivo está fuera de la raíz indicada: {e}")
+        return
+    except OSError as e:
+        print(f"\n[Error del sistema de archivos] {e}")
+        return
+    finally:
+        if almacen is not None:
+            almacen.cerrar()
+    if not args.silencioso:
+        print(file=sys.stderr)
+    print(formatear_resumen(resumen))
+
+
+if __name__ == "__main__":
+    main()
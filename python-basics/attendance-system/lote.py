@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo: Carga por lotes (modo no interactivo)
+Autor: Alexis Ayala
+Descripción:
+  - Aplica en bloque operaciones de escritura leídas de un archivo CSV/JSONL o de stdin,
+    sin pasar por los input() del menú.
+  - Cada operación trae: usuario, fecha (dd/mm/aaaa), archivo y texto.
+        CSV   -> encabezado: usuario,fecha,archivo,texto
+        JSONL -> {"usuario": "...", "fecha": "...", "archivo": "...", "texto": "..."}
+  - La entrada se interpreta y valida como flujo (memoria acotada); las filas inválidas se
+    reportan y se omiten sin detener el lote. Un texto con una línea en forma de cabecera
+    ([Usuario: ...]) se rechaza: al releer el archivo crearía una entrada falsa.
+  - Un archivo que no se puede crear o escribir rechaza solo sus operaciones.
+  - Las escrituras a un mismo archivo se agrupan en un solo anexo por grupo de operaciones.
+Uso por consola:
+  python lote.py asistencias_dia.csv
+  cat operaciones.jsonl | python lote.py - --formato jsonl --crear
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from attendance_system import (
+    CACHE_DIRECTORIO,
+    EscritorAnexos,
+    asegurar_archivos_iniciales,
+    escribir_atomico,
+    normalizar_nickname,
+)
+from fechas import parsear_fecha
+from registros import AlmacenRegistros, Registro, encabezado_archivo, formatear_cabecera
+
+CAMPOS = ("usuario", "fecha", "archivo", "texto")
+# Inicio de una línea de cabecera (ver registros.formatear_cabecera)
+INICIO_CABECERA = "[Usuario: "
+
+
+class OperacionInvalida(ValueError):
+    """Fila del lote que no pasa la validación."""
+
+
+@dataclass(frozen=True)
+class Operacion:
+    """Una escritura validada, lista para aplicarse."""
+    linea: int
+    nickname: str
+    fecha_tuple: Tuple[int, int, int]
+    archivo: str
+    texto: str
+
+
+@dataclass
+class ResumenLote:
+    aplicadas: int = 0
+    rechazadas: int = 0
+    archivos_creados: int = 0
+    segundos: float = 0.0
+
+    @property
+    def por_segundo(self) -> float:
+        return self.aplicadas / self.segundos if self.segundos > 0 else 0.0
+
+
+def validar_fila(linea: int, fila: Dict[str, object]) -> Operacion:
+    """Valida una fila cruda (dict de CSV o JSON) y la convierte en Operacion."""
+    faltantes = [c for c in CAMPOS if not str(fila.get(c) or "").strip()]
+    if faltantes:
+        raise OperacionInvalida(f"línea {linea}: faltan campos {', '.join(faltantes)}")
+    archivo = str(fila["archivo"]).strip()
+    # Solo nombres simples dentro de base_dir (sin rutas ni archivos ocultos)
+    if "/" in archivo or "\\" in archivo or archivo.startswith("."):
+        raise OperacionInvalida(f"línea {linea}: nombre de archivo no permitido '{archivo}'")
+    usuario = str(fila["usuario"]).strip()
+    # El usuario va dentro de la cabecera: un salto de línea o ']' la romperían
+    if "\n" in usuario or "\r" in usuario or "]" in usuario:
+        raise OperacionInvalida(f"línea {linea}: usuario no permitido {usuario!r}")
+    try:
+        fecha_tuple = parsear_fecha(str(fila["fecha"]))
+    except ValueError:
+        raise OperacionInvalida(f"línea {linea}: fecha inválida '{fila['fecha']}'") from None
+    texto = str(fila["texto"]).rstrip()
+    if any(parte.startswith(INICIO_CABECERA) for parte in texto.split("\n")):
+        raise OperacionInvalida(
+            f"línea {linea}: el texto contiene una línea de cabecera '{INICIO_CABECERA}...'")
+    return Operacion(linea, normalizar_nickname(usuario), fecha_tuple, archivo, texto)
+
+
+def _filas_csv(flujo: TextIO) -> Iterator[Tuple[int, Dict[str, object]]]:
+    lector = csv.DictReader(flujo)
+    for fila in lector:
+        yield lector.line_num, fila
+
+
+def _filas_jsonl(flujo: TextIO) -> Iterator[Tuple[int, Dict[str, object]]]:
+    for linea, texto in enumerate(flujo, start=1):
+        if not texto.strip():
+            continue
+        try:
+            fila = json.loads(texto)
+        except json.JSONDecodeError as e:
+            yield linea, {"__error__": f"JSON inválido ({e.msg})"}
+            continue
+        yield linea, fila if isinstance(fila, dict) else {"__error__": "se esperaba un objeto JSON"}
+
+
+def iterar_operaciones(flujo: TextIO, formato: str, errores: List[str]) -> Iterator[Operacion]:
+    """
+    Interpreta el flujo fila por fila y produce solo las operaciones válidas.
+    Los mensajes de las filas rechazadas se agregan a `errores`.
+    """
+    filas = _filas_csv(flujo) if formato == "csv" else _filas_jsonl(flujo)
+    for linea, fila in filas:
+        if "__error__" in fila:
+            errores.append(f"línea {linea}: {fila['__error__']}")
+            continue
+        try:
+            yield validar_fila(linea, fila)
+        except OperacionInvalida as e:
+            errores.append(str(e))
+
+
+def aplicar_lote(operaciones: Iterable[Operacion], base_dir: Path,
+                 almacen: Optional[AlmacenRegistros] = None,
+                 escritor: Optional[EscritorAnexos] = None,
+                 tam_grupo: int = 5000, crear_faltantes: bool = False,
+                 errores: Optional[List[str]] = None) -> ResumenLote:
+    """
+    Aplica las operaciones en grupos de `tam_grupo`: dentro de cada grupo, todas las
+    entradas de un mismo archivo se concatenan y se anexan con una sola escritura.
+    Con `crear_faltantes`, un archivo inexistente se crea (como en 'Crear archivo');
+    si no, sus operaciones se rechazan.
+    """
+    errores = errores if errores is not None else []
+    propio = escritor is None
+    escritor = escritor or EscritorAnexos(politica="flush")
+    existentes = set(p.name for p in CACHE_DIRECTORIO.listar(base_dir).values())
+    resumen = ResumenLote()
+    inicio = time.perf_counter()
+    it = iter(operaciones)
+    try:
+        while True:
+            grupo = list(islice(it, tam_grupo))
+            if not grupo:
+                break
+            por_archivo: "OrderedDict[str, List[Operacion]]" = OrderedDict()
+            for op in grupo:
+                por_archivo.setdefault(op.archivo, []).append(op)
+
+            registros: List[Registro] = []
+            for archivo, ops in por_archivo.items():
+                ruta = base_dir / archivo
+                if archivo not in existentes and not crear_faltantes:
+                    errores.extend(f"línea {op.linea}: el archivo '{archivo}' no existe" for op in ops)
+                    continue
+                partes = [formatear_cabecera(op.nickname, op.fecha_tuple) + op.texto + "\n" for op in ops]
+                try:
+                    if archivo not in existentes:
+                        escribir_atomico(ruta, encabezado_archivo(ops[0].nickname, ops[0].fecha_tuple))
+                        CACHE_DIRECTORIO.agregar(ruta)
+                        existentes.add(archivo)
+                        resumen.archivos_creados += 1
+                    offset = escritor.anexar(ruta, "".join(partes))
+                except OSError as e:
+                    # P. ej. una carpeta con ese nombre: se rechaza el archivo, no el lote
+                    errores.extend(f"línea {op.linea}: no se pudo escribir en '{archivo}' ({e})" for op in ops)
+                    continue
+                # Offset de cada entrada dentro del bloque anexado (para el almacén)
+                for op, parte in zip(ops, partes):
+                    registros.append(Registro(op.nickname, op.fecha_tuple, archivo, offset, op.texto))
+                    offset += len(parte.encode("utf-8"))
+                resumen.aplicadas += len(ops)
+            if almacen is not None and registros:
+                almacen.agregar_muchos(registros)
+    finally:
+        if propio:
+            escritor.cerrar()
+    resumen.segundos = time.perf_counter() - inicio
+    # Incluye las filas rechazadas por validación mientras se consumía el flujo
+    resumen.rechazadas = len(errores)
+    return resumen
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Carga por lotes de asistencias (CSV/JSONL).")
+    parser.add_argument("entrada", help="Archivo de operaciones o '-' para leer de stdin")
+    parser.add_argument("--formato", choices=("csv", "jsonl"),
+                        help="Formato de la entrada (por defecto se deduce de la extensión)")
+    parser.add_argument("--base-dir", type=Path, default=Path.cwd() / "files",
+                        help="Carpeta de trabajo (por defecto ./files)")
+    parser.add_argument("--crear", action="store_true", help="Crea los archivos que no existan")
+    parser.add_argument("--tam-grupo", type=int, default=5000,
+                        help="Operaciones por grupo de escritura (por defecto 5000)")
+    parser.add_argument("--sin-almacen", action="store_true",
+                        help="No registra las entradas en el almacén SQLite")
+    args = parser.parse_args(argv)
+
+    formato = args.formato or ("jsonl" if args.entrada.endswith((".jsonl", ".json")) else "csv")
+    asegurar_archivos_iniciales(args.base_dir)
+    almacen = None if args.sin_almacen else AlmacenRegistros.para_directorio(args.base_dir)
+    errores: List[str] = []
+    try:
+        if args.entrada == "-":
+            flujo = sys.stdin
+        else:
+            flujo = open(args.entrada, encoding="utf-8", newline="")
+        with flujo:
+            resumen = aplicar_lote(iterar_operaciones(flujo, formato, errores), args.base_dir,
+                                   almacen=almacen, tam_grupo=args.tam_grupo,
+                                   crear_faltantes=args.crear, errores=errores)
+    except OSError as e:
+        print(f"[Error del sistema de archivos] {e}")
+        return
+    finally:
+        if almacen is not None:
+            almacen.cerrar()
+
+    print(f"Operaciones aplicadas: {resumen.aplicadas} ({resumen.por_segundo:,.0f}/s)")
+    print(f"Archivos creados: {resumen.archivos_creados}")
+    print(f"Operaciones rechazadas: {resumen.rechazadas}")
+    for mensaje in errores[:20]:
+        print(f"  [Aviso] {mensaje}")
+    if len(errores) > 20:
+        print(f"  ... y {len(errores) - 20} más")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo: Métricas e instrumentación
+Autor: Alexis Ayala
+Descripción:
+  - Capa ligera para saber dónde se va el tiempo en las operaciones del menú.
+  - `medir("nombre")` funciona como decorador o como context manager: cuenta llamadas y guarda
+    la latencia en un histograma de buckets fijos (como los de Prometheus).
+  - `sumar_bytes` acumula bytes leídos y escritos por operación.
+  - La foto de las métricas se exporta como JSON o en el formato de texto de Prometheus.
+  - `perfilar(ruta)` activa cProfile (opcional) y guarda las estadísticas al salir.
+"""
+from __future__ import annotations
+
+import cProfile
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+# Límites superiores de los buckets de latencia, en segundos (el último es +Inf implícito).
+# Cubren desde operaciones de archivo (~100 µs) hasta la selección del menú (hasta 10 min).
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0, 600.0)
+PREFIJO = "asistencia"
+
+
+class Histograma:
+    """Histograma acumulativo de latencias con buckets fijos."""
+
+    __slots__ = ("conteos", "total", "suma")
+
+    def __init__(self) -> None:
+        self.conteos: List[int] = [0] * (len(BUCKETS) + 1)  # el último es +Inf
+        self.total = 0
+        self.suma = 0.0
+
+    def observar(self, segundos: float) -> None:
+        for i, limite in enumerate(BUCKETS):
+            if segundos <= limite:
+                break
+        else:
+            i = len(BUCKETS)
+        self.conteos[i] += 1
+        self.total += 1
+        self.suma += segundos
+
+    def acumulados(self) -> List[int]:
+        """Conteos acumulados por bucket (formato 'le' de Prometheus)."""
+        salida, acumulado = [], 0
+        for c in self.conteos:
+            acumulado += c
+            salida.append(acumulado)
+        return salida
+
+
+class Metricas:
+    """Contenedor de métricas del proceso (seguro para varios hilos)."""
+
+    def __init__(self) -> None:
+        self._candado = threading.Lock()
+        self.histogramas: Dict[str, Histograma] = {}
+        self.bytes_leidos: Dict[str, int] = {}
+        self.bytes_escritos: Dict[str, int] = {}
+
+    def observar(self, nombre: str, segundos: float) -> None:
+        with self._candado:
+            h = self.histogramas.get(nombre)
+            if h is None:
+                h = self.histogramas[nombre] = Histograma()
+            h.observar(segundos)
+
+    def sumar_bytes(self, nombre: str, leidos: int = 0, escritos: int = 0) -> None:
+        with self._candado:
+            if leidos:
+                self.bytes_leidos[nombre] = self.bytes_leidos.get(nombre, 0) + leidos
+            if escritos:
+                self.bytes_escritos[nombre] = self.bytes_escritos.get(nombre, 0) + escritos
+
+    def medir(self, nombre: str) -> "Medidor":
+        """Decorador o context manager que mide la latencia y cuenta las llamadas de `nombre`."""
+        return Medidor(self, nombre)
+
+    def reiniciar(self) -> None:
+        with self._candado:
+            self.histogramas.clear()
+            self.bytes_leidos.clear()
+            self.bytes_escritos.clear()
+
+    # ---------- exportación ----------
+    def a_dict(self) -> Dict[str, object]:
+        with self._candado:
+            operaciones = {}
+            for nombre, h in sorted(self.histogramas.items()):
+                operaciones[nombre] = {
+                    "llamadas": h.total,
+                    "segundos_total": h.suma,
+                    "segundos_promedio": h.suma / h.total if h.total else 0.0,
+                    "buckets": {str(l): c for l, c in zip(BUCKETS + ("+Inf",), h.acumulados())},
+                }
+            return {
+                "operaciones": operaciones,
+                "bytes_leidos": dict(sorted(self.bytes_leidos.items())),
+                "bytes_escritos": dict(sorted(self.bytes_escritos.items())),
+            }
+
+    def a_json(self) -> str:
+        return json.dumps(self.a_dict(), ensure_ascii=False, indent=2)
+
+    def a_prometheus(self) -> str:
+        """Foto de las métricas en el formato de texto de exposición de Prometheus."""
+        lineas = [
+            f"# HELP {PREFIJO}_operacion_segundos Latencia de las operaciones del menú.",
+            f"# TYPE {PREFIJO}_operacion_segundos histogram",
+        ]
+        with self._candado:
+            for nombre, h in sorted(self.histogramas.items()):
+                etiqueta = f'operacion="{nombre}"'
+                for limite, acumulado in zip(BUCKETS + ("+Inf",), h.acumulados()):
+                    lineas.append(f'{PREFIJO}_operacion_segundos_bucket{{{etiqueta},le="{limite}"}} {acumulado}')
+                lineas.append(f"{PREFIJO}_operacion_segundos_sum{{{etiqueta}}} {h.suma:.9f}")
+                lineas.append(f"{PREFIJO}_operacion_segundos_count{{{etiqueta}}} {h.total}")
+            for metrica, valores in (("bytes_leidos_total", self.bytes_leidos),
+                                     ("bytes_escritos_total", self.bytes_escritos)):
+                lineas.append(f"# TYPE {PREFIJO}_{metrica} counter")
+                for nombre, n in sorted(valores.items()):
+                    lineas.append(f'{PREFIJO}_{metrica}{{operacion="{nombre}"}} {n}')
+        return "\n".join(lineas) + "\n"
+
+    def exportar(self, ruta: Path) -> None:
+        """Guarda la foto: formato Prometheus si la extensión es .prom, JSON en otro caso."""
+        texto = self.a_prometheus() if ruta.suffix == ".prom" else self.a_json()
+        ruta.write_text(texto, encoding="utf-8")
+
+
+class Medidor:
+    """Resultado de Metricas.medir: sirve como `@decorador` o como `with` (no es reentrante)."""
+
+    __slots__ = ("metricas", "nombre", "_inicio")
+
+    def __init__(self, metricas: Metricas, nombre: str) -> None:
+        self.metricas = metricas
+        self.nombre = nombre
+        self._inicio = 0.0
+
+    def __enter__(self) -> "Medidor":
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.metricas.observar(self.nombre, time.perf_counter() - self._inicio)
+        return False
+
+    def __call__(self, funcion: F) -> F:
+        metricas, nombre = self.metricas, self.nombre
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                metricas.observar(nombre, time.perf_counter() - inicio)
+        return envoltura  # type: ignore[return-value]
+
+
+# Métricas compartidas por todo el proceso
+METRICAS = Metricas()
+
+
+def medir(nombre: str) -> Medidor:
+    """Atajo para METRICAS.medir(nombre)."""
+    return METRICAS.medir(nombre)
+
+
+@contextmanager
+def perfilar(ruta: Path) -> Iterator[cProfile.Profile]:
+    """Ejecuta el bloque bajo cProfile y guarda las estadísticas en `ruta` (ver con pstats)."""
+    perfil = cProfile.Profile()
+    perfil.enable()
+    try:
+        yield perfil
+    finally:
+        perfil.disable()
+        perfil.dump_stats(str(ruta))
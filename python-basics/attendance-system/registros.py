@@ -0,0 +1,406 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo: Registros estructurados de asistencia
+Autor: Alexis Ayala
+Descripción:
+  - Define el formato de las entradas que escribe el sistema:
+        [Usuario: @nick] [Fecha: dd/mm/aaaa]
+        texto de la entrada...
+  - Implementa un almacén SQLite con índices por usuario y por fecha, para que consultas como
+    "todas las entradas de @nick en junio" o "quién asistió el 12/06/2023" sean búsquedas
+    indexadas y no lecturas completas de los archivos de texto.
+  - Incluye un importador que convierte los archivos de texto existentes en registros.
+  - Para tener millones de entradas en memoria: Registro usa __slots__, los nicknames se
+    internan (una sola copia por usuario) y ColumnasRegistros guarda (usuario, día ordinal,
+    archivo, offset) en arreglos compactos con tablas de cadenas.
+Uso por consola:
+  python registros.py importar files/*.txt
+  python registros.py usuario @Juan --mes 6 --anio 2023
+  python registros.py fecha 12/06/2023
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sqlite3
+import sys
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from fechas import parsear_fecha
+
+# Carpeta oculta (dentro de base_dir) para datos internos; listar_archivos no la muestra
+CARPETA_DATOS = ".datos"
+NOMBRE_DB = "asistencias.sqlite3"
+
+# Cabecera que escribe escribir_archivo antes de cada entrada
+CABECERA_RE = re.compile(r"^\[Usuario: (?P<nick>[^\]]+)\] \[Fecha: (?P<fecha>\d{2}/\d{2}/\d{4})\]$")
+
+
+def formatear_cabecera(nickname: str, fecha_tuple: Tuple[int, int, int]) -> str:
+    """Construye la línea de cabecera (con salto de línea) para una entrada de asistencia."""
+    d, m, a = fecha_tuple
+    return f"[Usuario: {nickname}] [Fecha: {d:02d}/{m:02d}/{a:04d}]\n"
+
+
+def encabezado_archivo(nickname: str, fecha_tuple: Tuple[int, int, int]) -> str:
+    """Contenido inicial de un archivo creado desde el sistema (opción 'Crear archivo')."""
+    d, m, a = fecha_tuple
+    return (
+        f"Archivo creado por {nickname}\n"
+        f"Fecha de creación: {d:02d}/{m:02d}/{a:04d}\n"
+        "---------------------------------------------\n"
+    )
+
+
+def parsear_cabecera(linea: str) -> Optional[Tuple[str, Tuple[int, int, int]]]:
+    """
+    Interpreta una línea de cabecera. Regresa (nickname, (día, mes, año)) o None
+    si la línea no es una cabecera o la fecha no existe en el calendario.
+    """
+    coincidencia = CABECERA_RE.match(linea.rstrip("\r\n"))
+    if coincidencia is None:
+        return None
+    try:
+        # Nickname internado: todas las entradas del mismo usuario comparten la cadena
+        # (la tupla de fecha ya se comparte gracias a la caché de parsear_fecha)
+        return sys.intern(coincidencia["nick"]), parsear_fecha(coincidencia["fecha"])
+    except ValueError:
+        return None
+
+
+def fecha_a_ordinal(fecha_tuple: Tuple[int, int, int]) -> int:
+    """Convierte (día, mes, año) al número de día ordinal (proleptic Gregorian)."""
+    d, m, a = fecha_tuple
+    return date(a, m, d).toordinal()
+
+
+def ordinal_a_fecha(ordinal: int) -> Tuple[int, int, int]:
+    """Operación inversa de fecha_a_ordinal."""
+    dt = date.fromordinal(ordinal)
+    return (dt.day, dt.month, dt.year)
+
+
+@dataclass(frozen=True, slots=True)
+class Registro:
+    """Una entrada de asistencia ya interpretada."""
+    nickname: str
+    fecha_tuple: Tuple[int, int, int]
+    archivo: str      # nombre del archivo dentro de base_dir
+    offset: int       # posición en bytes de la cabecera dentro del archivo
+    texto: str
+
+
+class TablaCadenas:
+    """Cada cadena distinta se guarda una sola vez y se referencia por un id entero."""
+
+    __slots__ = ("_ids", "cadenas")
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self.cadenas: List[str] = []
+
+    def id(self, cadena: str) -> int:
+        """Id de `cadena` (la agrega a la tabla si es nueva)."""
+        i = self._ids.get(cadena)
+        if i is None:
+            i = self._ids[cadena] = len(self.cadenas)
+            self.cadenas.append(cadena)
+        return i
+
+    def buscar(self, cadena: str) -> Optional[int]:
+        """Id de `cadena` o None si no está en la tabla."""
+        return self._ids.get(cadena)
+
+    def __getitem__(self, i: int) -> str:
+        return self.cadenas[i]
+
+    def __len__(self) -> int:
+        return len(self.cadenas)
+
+
+class ColumnasRegistros:
+    """
+    Contenedor columnar de entradas (nickname, fecha, archivo, offset), sin el texto
+    (que sigue en el archivo, en `offset`).
+    - nickname y archivo: id en una TablaCadenas (arreglos 'I', 4 bytes).
+    - fecha: día ordinal (arreglo 'i', 4 bytes).
+    - offset: arreglo 'q' (8 bytes).
+    En total ~20 bytes por entrada, contra cientos de un Registro por objeto.
+    """
+
+    def __init__(self) -> None:
+        self.nicknames = TablaCadenas()
+        self.archivos = TablaCadenas()
+        self.usuario = array("I")
+        self.dia = array("i")
+        self.archivo = array("I")
+        self.offset = array("q")
+
+    def agregar(self, nickname: str, fecha_tuple: Tuple[int, int, int], archivo: str, offset: int) -> None:
+        self.usuario.append(self.nicknames.id(nickname))
+        self.dia.append(fecha_a_ordinal(fecha_tuple))
+        self.archivo.append(self.archivos.id(archivo))
+        self.offset.append(offset)
+
+    def extender(self, registros: Iterable[Registro]) -> int:
+        """Agrega los registros (el texto se descarta). Regresa cuántos se agregaron."""
+        antes = len(self)
+        for r in registros:
+            self.agregar(r.nickname, r.fecha_tuple, r.archivo, r.offset)
+        return len(self) - antes
+
+    def __len__(self) -> int:
+        return len(self.usuario)
+
+    def entrada(self, i: int) -> Tuple[str, Tuple[int, int, int], str, int]:
+        """La entrada i como (nickname, (día, mes, año), archivo, offset)."""
+        return (self.nicknames[self.usuario[i]], ordinal_a_fecha(self.dia[i]),
+                self.archivos[self.archivo[i]], self.offset[i])
+
+    def __iter__(self) -> Iterator[Tuple[str, Tuple[int, int, int], str, int]]:
+        for i in range(len(self)):
+            yield self.entrada(i)
+
+    def indices_de(self, nickname: str) -> List[int]:
+        """Posiciones de las entradas de `nickname` (comparación de enteros, no de cadenas)."""
+        uid = self.nicknames.buscar(nickname)
+        if uid is None:
+            return []
+        return [i for i, u in enumerate(self.usuario) if u == uid]
+
+
+def iterar_bloques(f: BinaryIO) -> Iterator[Tuple[Optional[Tuple[str, Tuple[int, int, int]]], int, bytes]]:
+    """
+    Recorre un flujo binario línea por línea (memoria acotada) y produce
+    (cabecera interpretada, offset, bytes crudos) por cada entrada: la línea de cabecera más
+    todas las líneas siguientes hasta la próxima cabecera.
+    Las líneas previas a la primera cabecera (encabezados del archivo) salen como un primer
+    bloque con cabecera None.
+    """
+    cabecera: Optional[Tuple[str, Tuple[int, int, int]]] = None
+    inicio = offset = 0
+    partes: List[bytes] = []
+    for cruda in f:
+        nueva = None
+        if cruda.startswith(b"[Usuario: "):
+            nueva = parsear_cabecera(cruda.decode("utf-8", errors="replace"))
+        if nueva is not None:
+            if partes:
+                yield cabecera, inicio, b"".join(partes)
+            cabecera, inicio, partes = nueva, offset, []
+        partes.append(cruda)
+        offset += len(cruda)
+    if partes:
+        yield cabecera, inicio, b"".join(partes)
+
+
+def iterar_registros_flujo(f: BinaryIO, archivo: str) -> Iterator[Registro]:
+    """Produce un Registro por cada entrada del flujo (el texto va sin la línea de cabecera)."""
+    for cabecera, offset, crudo in iterar_bloques(f):
+        if cabecera is None:
+            continue
+        cuerpo = crudo[crudo.index(b"\n") + 1:] if b"\n" in crudo else b""
+        texto = cuerpo.decode("utf-8", errors="replace").rstrip("\n")
+        yield Registro(cabecera[0], cabecera[1], archivo, offset, texto)
+
+
+def nombre_en_carpeta(ruta: Path, base_dir: Path) -> str:
+    """
+    Nombre con que se registra un archivo: su ruta relativa a base_dir, para que dos archivos
+    homónimos en subcarpetas distintas no choquen en (archivo, offset). Fuera de base_dir se
+    usa la ruta absoluta.
+    """
+    resuelta = Path(ruta).resolve()
+    try:
+        return resuelta.relative_to(Path(base_dir).resolve()).as_posix()
+    except ValueError:
+        return resuelta.as_posix()
+
+
+def iterar_registros(ruta: Path, archivo: Optional[str] = None) -> Iterator[Registro]:
+    """
+    Recorre un archivo de texto línea por línea (memoria acotada) y produce un Registro
+    por cada cabecera, con todas las líneas siguientes hasta la próxima cabecera como texto.
+    Las líneas previas a la primera cabecera (encabezados del archivo) se ignoran.
+    `archivo` es el nombre registrado (ver nombre_en_carpeta); por defecto, el del archivo,
+    que es su ruta relativa cuando está en la raíz de base_dir.
+    """
+    with open(ruta, "rb") as f:
+        yield from iterar_registros_flujo(f, ruta.name if archivo is None else archivo)
+
+
+class AlmacenRegistros:
+    """
+    Almacén SQLite de registros de asistencia.
+    - Índices: (nickname, día) para consultas por usuario y rango de fechas; (día) para
+      consultas por fecha.
+    - (archivo, offset) es único, así que reimportar un archivo no duplica registros.
+    """
+
+    def __init__(self, ruta_db: Path) -> None:
+        ruta_db.parent.mkdir(parents=True, exist_ok=True)
+        self.ruta_db = ruta_db
+        # check_same_thread=False: el almacén puede abrirse en el hilo de carga inicial
+        self._con = sqlite3.connect(str(ruta_db), check_same_thread=False)
+        self._con.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS registros (
+                id       INTEGER PRIMARY KEY,
+                nickname TEXT    NOT NULL,
+                dia      INTEGER NOT NULL,
+                archivo  TEXT    NOT NULL,
+                offset   INTEGER NOT NULL,
+                texto    TEXT    NOT NULL,
+                UNIQUE (archivo, offset)
+            );
+            CREATE INDEX IF NOT EXISTS idx_registros_usuario ON registros (nickname, dia);
+            CREATE INDEX IF NOT EXISTS idx_registros_dia ON registros (dia);
+            """
+        )
+
+    @classmethod
+    def para_directorio(cls, base_dir: Path) -> "AlmacenRegistros":
+        """Abre (o crea) el almacén asociado a una carpeta de trabajo."""
+        return cls(base_dir / CARPETA_DATOS / NOMBRE_DB)
+
+    def agregar(self, registro: Registro) -> None:
+        """Inserta un registro (se ignora si ya existe el mismo archivo/offset)."""
+        self.agregar_muchos([registro])
+
+    def agregar_muchos(self, registros: Iterable[Registro]) -> int:
+        """Inserta registros en una sola transacción. Regresa cuántos fueron nuevos."""
+        filas = (
+            (r.nickname, fecha_a_ordinal(r.fecha_tuple), r.archivo, r.offset, r.texto)
+            for r in registros
+        )
+        with self._con:
+            antes = self._con.total_changes
+            self._con.executemany(
+                "INSERT OR IGNORE INTO registros (nickname, dia, archivo, offset, texto) "
+                "VALUES (?, ?, ?, ?, ?)",
+                filas,
+            )
+            return self._con.total_changes - antes
+
+    def reubicar(self, archivo: str, movimientos: Iterable[Tuple[int, str, int]]) -> None:
+        """
+        Actualiza la ubicación de registros de `archivo` tras una rotación.
+        `movimientos`: (offset anterior, archivo nuevo, offset nuevo).
+        Se hace en dos fases (offsets negativos temporales) para no chocar con la restricción
+        UNIQUE(archivo, offset) mientras unas entradas ocupan el lugar que dejan otras.
+        """
+        movimientos = list(movimientos)
+        destinos = sorted({nuevo for _, nuevo, _ in movimientos})
+        with self._con:
+            self._con.executemany(
+                "UPDATE registros SET archivo = ?, offset = ? WHERE archivo = ? AND offset = ?",
+                ((nuevo, -1 - nuevo_offset, archivo, viejo) for viejo, nuevo, nuevo_offset in movimientos),
+            )
+            # OR REPLACE: un registro viejo que ya no correspondía al archivo cede su lugar
+            self._con.executemany(
+                "UPDATE OR REPLACE registros SET offset = -1 - offset WHERE archivo = ? AND offset < 0",
+                ((d,) for d in destinos),
+            )
+
+    def importar_archivo(self, ruta: Path, archivo: Optional[str] = None) -> int:
+        """
+        Importa un archivo de texto con el formato de escribir_archivo, registrado como `archivo`
+        (ver iterar_registros). Regresa registros nuevos.
+        """
+        return self.agregar_muchos(iterar_registros(ruta, archivo))
+
+    def _a_registros(self, filas) -> List[Registro]:
+        return [Registro(n, ordinal_a_fecha(d), a, o, t) for n, d, a, o, t in filas]
+
+    def por_usuario(self, nickname: str,
+                    desde: Optional[Tuple[int, int, int]] = None,
+                    hasta: Optional[Tuple[int, int, int]] = None) -> List[Registro]:
+        """Entradas de un usuario, opcionalmente en el rango de fechas [desde, hasta]."""
+        inicio = fecha_a_ordinal(desde) if desde else date.min.toordinal()
+        fin = fecha_a_ordinal(hasta) if hasta else date.max.toordinal()
+        filas = self._con.execute(
+            "SELECT nickname, dia, archivo, offset, texto FROM registros "
+            "WHERE nickname = ? AND dia BETWEEN ? AND ? ORDER BY dia, archivo, offset",
+            (nickname, inicio, fin),
+        )
+        return self._a_registros(filas)
+
+    def por_usuario_mes(self, nickname: str, mes: int, anio: int) -> List[Registro]:
+        """Entradas de un usuario durante un mes completo."""
+        siguiente = date(anio + (mes == 12), mes % 12 + 1, 1).toordinal()
+        return self.por_usuario(nickname, (1, mes, anio), ordinal_a_fecha(siguiente - 1))
+
+    def por_fecha(self, fecha_tuple: Tuple[int, int, int]) -> List[Registro]:
+        """Todas las entradas de una fecha."""
+        filas = self._con.execute(
+            "SELECT nickname, dia, archivo, offset, texto FROM registros "
+            "WHERE dia = ? ORDER BY nickname, archivo, offset",
+            (fecha_a_ordinal(fecha_tuple),),
+        )
+        return self._a_registros(filas)
+
+    def presentes(self, fecha_tuple: Tuple[int, int, int]) -> List[str]:
+        """Usuarios (sin repetir) con al menos una entrada en la fecha indicada."""
+        filas = self._con.execute(
+            "SELECT DISTINCT nickname FROM registros WHERE dia = ? ORDER BY nickname",
+            (fecha_a_ordinal(fecha_tuple),),
+        )
+        return [n for (n,) in filas]
+
+    def cerrar(self) -> None:
+        self._con.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Almacén estructurado de asistencias.")
+    parser.add_argument("--base-dir", type=Path, default=Path.cwd() / "files",
+                        help="Carpeta de trabajo (por defecto ./files)")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p_imp = sub.add_parser("importar", help="Importa archivos de texto al almacén")
+    p_imp.add_argument("archivos", nargs="+", type=Path)
+    p_usr = sub.add_parser("usuario", help="Entradas de un usuario")
+    p_usr.add_argument("nickname")
+    p_usr.add_argument("--mes", type=int)
+    p_usr.add_argument("--anio", type=int)
+    p_fec = sub.add_parser("fecha", help="Presentes en una fecha dd/mm/aaaa")
+    p_fec.add_argument("fecha")
+    args = parser.parse_args(argv)
+
+    almacen = AlmacenRegistros.para_directorio(args.base_dir)
+    try:
+        if args.comando == "importar":
+            for ruta in args.archivos:
+                try:
+                    archivo = nombre_en_carpeta(ruta, args.base_dir)
+                    nuevos = almacen.importar_archivo(ruta, archivo)
+                    print(f"{archivo}: {nuevos} registros nuevos")
+                except OSError as e:
+                    print(f"[Aviso] No se pudo importar '{ruta}': {e}")
+        elif args.comando == "usuario":
+            if args.mes and args.anio:
+                registros = almacen.por_usuario_mes(args.nickname, args.mes, args.anio)
+            else:
+                registros = almacen.por_usuario(args.nickname)
+            for r in registros:
+                d, m, a = r.fecha_tuple
+                print(f"{d:02d}/{m:02d}/{a:04d}  {r.archivo}: {r.texto}")
+        elif args.comando == "fecha":
+            try:
+                fecha = parsear_fecha(args.fecha)
+            except ValueError:
+                print("Formato inválido. Usa dd/mm/aaaa.")
+                return
+            for nick in almacen.presentes(fecha):
+                print(nick)
+    finally:
+        almacen.cerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo: Reportes de asistencia
+Autor: Alexis Ayala
+Descripción:
+  - Recorre una sola vez los archivos de asistencia (como flujo, línea por línea) e interpreta las
+    cabeceras [Usuario: ...] [Fecha: ...] que escribe escribir_archivo.
+  - Guarda cada entrada como dos columnas compactas de enteros (id de usuario, día ordinal) y
+    calcula con NumPy (vectorizado) por usuario: entradas, días asistidos, racha máxima y tasa de
+    ausencia; y por fecha: presentes y porcentaje de asistencia.
+  - Un "día de clase" es cualquier fecha con al menos una entrada; las rachas cuentan días de
+    clase consecutivos.
+  - NumPy es opcional: sin él se usa una versión en Python puro con el mismo resultado.
+  - Incluye las entradas ya selladas en segmentos comprimidos (ver rotacion.py); con --desde y
+    --hasta solo se descomprimen los segmentos cuyo rango de fechas se cruza con el pedido.
+  - El resultado se escribe en .datos/reporte.txt: fuera de los archivos que lista el menú, así
+    generar un reporte nunca pisa entradas del usuario (su reporte.txt se lee como cualquier otro).
+  - Lee y escribe con el candado compartido de la carpeta: una rotación no mueve entradas a
+    mitad del recorrido.
+Uso por consola:
+  python reportes.py
+  python reportes.py --base-dir files --salida reporte_junio.txt --desde 01/06/2023 --hasta 30/06/2023
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from attendance_system import escribir_atomico, listar_archivos
+from fechas import parsear_fecha
+from registros import CARPETA_DATOS, Registro, fecha_a_ordinal, iterar_registros
+from rotacion import BloqueoCarpeta, iterar_registros_archivados
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+NOMBRE_REPORTE = "reporte.txt"
+
+
+@dataclass
+class ResumenUsuario:
+    nickname: str
+    entradas: int
+    dias_asistidos: int
+    racha_maxima: int
+    tasa_ausencia: float
+
+
+@dataclass
+class ResumenFecha:
+    fecha_tuple: Tuple[int, int, int]
+    presentes: int
+    porcentaje: float
+
+
+@dataclass
+class Reporte:
+    usuarios: List[ResumenUsuario]
+    fechas: List[ResumenFecha]
+    total_entradas: int
+    dias_clase: int
+
+
+class Columnas:
+    """Entradas como columnas de enteros: 8 bytes por entrada en lugar de objetos de Python."""
+
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.nombres: List[str] = []
+        self.usuario = array("i")
+        self.dia = array("i")
+
+    def agregar(self, nickname: str, fecha_tuple: Tuple[int, int, int]) -> None:
+        uid = self.ids.get(nickname)
+        if uid is None:
+            uid = self.ids[nickname] = len(self.nombres)
+            self.nombres.append(nickname)
+        self.usuario.append(uid)
+        self.dia.append(fecha_a_ordinal(fecha_tuple))
+
+    def __len__(self) -> int:
+        return len(self.usuario)
+
+
+def leer_columnas(registros: Iterable[Registro],
+                  desde: Optional[Tuple[int, int, int]] = None,
+                  hasta: Optional[Tuple[int, int, int]] = None) -> Columnas:
+    """Una sola pasada por los registros; la memoria crece con las entradas, no con el texto."""
+    inicio = fecha_a_ordinal(desde) if desde else None
+    fin = fecha_a_ordinal(hasta) if hasta else None
+    columnas = Columnas()
+    for registro in registros:
+        if inicio is not None or fin is not None:
+            dia = fecha_a_ordinal(registro.fecha_tuple)
+            if (inicio is not None and dia < inicio) or (fin is not None and dia > fin):
+                continue
+        columnas.agregar(registro.nickname, registro.fecha_tuple)
+    return columnas
+
+
+def registros_de_carpeta(base_dir: Path,
+                         desde: Optional[Tuple[int, int, int]] = None,
+                         hasta: Optional[Tuple[int, int, int]] = None) -> Iterable[Registro]:
+    """Entradas archivadas (solo segmentos del rango pedido) y luego las de los archivos vivos."""
+    yield from iterar_registros_archivados(base_dir, desde=desde, hasta=hasta)
+    for ruta in listar_archivos(base_dir).values():
+        yield from iterar_registros(ruta)
+
+
+def _agregar_numpy(columnas: Columnas):
+    """Regresa (entradas, asistidos, racha, dias_ordinales, presentes_por_dia) con NumPy."""
+    n_usuarios = len(columnas.nombres)
+    u = np.frombuffer(columnas.usuario, dtype=np.int32).astype(np.int64)
+    d = np.frombuffer(columnas.dia, dtype=np.int32)
+    dias, d_idx = np.unique(d, return_inverse=True)  # días de clase e índice de cada entrada
+    n_dias = len(dias)
+
+    entradas = np.bincount(u, minlength=n_usuarios)
+    # Pares (usuario, día de clase) sin repetir, ordenados por usuario y luego por día
+    pares = np.unique(u * n_dias + d_idx.astype(np.int64))
+    pu, pd = pares // n_dias, pares % n_dias
+    asistidos = np.bincount(pu, minlength=n_usuarios)
+    presentes = np.bincount(pd, minlength=n_dias)
+
+    # Rachas: una racha nueva empieza al cambiar de usuario o si hay un hueco de días de clase
+    nueva = np.ones(len(pares), dtype=bool)
+    nueva[1:] = (pu[1:] != pu[:-1]) | (pd[1:] - pd[:-1] != 1)
+    largos = np.bincount(np.cumsum(nueva) - 1)
+    racha = np.zeros(n_usuarios, dtype=np.int64)
+    np.maximum.at(racha, pu[nueva], largos)
+    return entradas.tolist(), asistidos.tolist(), racha.tolist(), dias.tolist(), presentes.tolist()
+
+
+def _agregar_python(columnas: Columnas):
+    """Misma agregación que _agregar_numpy, en Python puro (sin NumPy)."""
+    n_usuarios = len(columnas.nombres)
+    entradas = [0] * n_usuarios
+    vistos: List[set] = [set() for _ in range(n_usuarios)]
+    for uid, dia in zip(columnas.usuario, columnas.dia):
+        entradas[uid] += 1
+        vistos[uid].add(dia)
+    dias = sorted(set(columnas.dia))
+    posicion = {dia: i for i, dia in enumerate(dias)}
+    presentes = [0] * len(dias)
+    asistidos, racha = [0] * n_usuarios, [0] * n_usuarios
+    for uid, conjunto in enumerate(vistos):
+        indices = sorted(posicion[d] for d in conjunto)
+        asistidos[uid] = len(indices)
+        actual = 0
+        for j, idx in enumerate(indices):
+            presentes[idx] += 1
+            actual = actual + 1 if j and idx == indices[j - 1] + 1 else 1
+            racha[uid] = max(racha[uid], actual)
+    return entradas, asistidos, racha, dias, presentes
+
+
+def generar_reporte(columnas: Columnas, usar_numpy: Optional[bool] = None) -> Reporte:
+    """Calcula el reporte a partir de las columnas (vectorizado si NumPy está disponible)."""
+    if not len(columnas):
+        return Reporte([], [], 0, 0)
+    usar_numpy = np is not None if usar_numpy is None else usar_numpy
+    entradas, asistidos, racha, dias, presentes = (
+        _agregar_numpy(columnas) if usar_numpy else _agregar_python(columnas)
+    )
+    n_dias, n_usuarios = len(dias), len(columnas.nombres)
+    usuarios = [
+        ResumenUsuario(nick, entradas[i], asistidos[i], racha[i], 1 - asistidos[i] / n_dias)
+        for i, nick in enumerate(columnas.nombres)
+    ]
+    usuarios.sort(key=lambda r: r.nickname.casefold())
+    fechas = []
+    for dia, n in zip(dias, presentes):
+        dt = date.fromordinal(dia)
+        fechas.append(ResumenFecha((dt.day, dt.month, dt.year), n, n / n_usuarios))
+    return Reporte(usuarios, fechas, len(columnas), n_dias)
+
+
+def formatear_reporte(reporte: Reporte) -> str:
+    """Texto del reporte con tablas alineadas (mismo estilo de separadores que el programa)."""
+    lineas = [
+        "Reporte de Asistencia",
+        "---------------------------------------------",
+        f"Entradas procesadas: {reporte.total_entradas}",
+        f"Días de clase: {reporte.dias_clase}",
+        f"Usuarios: {len(reporte.usuarios)}",
+        "",
+        "Por usuario",
+        f"{'Usuario':<30} {'Entradas':>9} {'Días':>6} {'Racha':>6} {'Ausencia':>9}",
+    ]
+    for r in reporte.usuarios:
+        lineas.append(f"{r.nickname:<30} {r.entradas:>9} {r.dias_asistidos:>6} "
+                      f"{r.racha_maxima:>6} {r.tasa_ausencia:>8.1%}")
+    lineas += ["", "Por fecha", f"{'Fecha':<12} {'Presentes':>10} {'Asistencia':>11}"]
+    for f in reporte.fechas:
+        d, m, a = f.fecha_tuple
+        lineas.append(f"{d:02d}/{m:02d}/{a:04d}   {f.presentes:>10} {f.porcentaje:>10.1%}")
+    return "\n".join(lineas) + "\n"
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Genera el reporte de asistencia.")
+    parser.add_argument("--base-dir", type=Path, default=Path.cwd() / "files",
+                        help="Carpeta de trabajo (por defecto ./files)")
+    parser.add_argument("--salida", default=NOMBRE_REPORTE,
+                        help="Archivo de salida dentro de base_dir/.datos (por defecto reporte.txt)")
+    parser.add_argument("--desde", help="Fecha inicial dd/mm/aaaa (incluida)")
+    parser.add_argument("--hasta", help="Fecha final dd/mm/aaaa (incluida)")
+    parser.add_argument("--sin-numpy", action="store_true", help="Fuerza la versión en Python puro")
+    args = parser.parse_args(argv)
+    try:
+        desde = parsear_fecha(args.desde) if args.desde else None
+        hasta = parsear_fecha(args.hasta) if args.hasta else None
+    except ValueError:
+        print("Formato inválido. Usa dd/mm/aaaa y una fecha que exista.")
+        return
+
+    if not args.base_dir.is_dir():
+        print(f"[Aviso] No existe la carpeta '{args.base_dir}'.")
+        return
+    destino = args.base_dir / CARPETA_DATOS / args.salida
+    bloqueo = BloqueoCarpeta(args.base_dir)
+    bloqueo.compartido()
+    try:
+        inicio = time.perf_counter()
+        columnas = leer_columnas(registros_de_carpeta(args.base_dir, desde, hasta), desde, hasta)
+        t_lectura = time.perf_counter() - inicio
+        reporte = generar_reporte(columnas, usar_numpy=False if args.sin_numpy else None)
+        t_total = time.perf_counter() - inicio
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        escribir_atomico(destino, formatear_reporte(reporte))
+    finally:
+        bloqueo.liberar()
+    print(f"Reporte escrito en '{destino}': {reporte.total_entradas} entradas, "
+          f"{len(reporte.usuarios)} usuarios, {reporte.dias_clase} días de clase "
+          f"(lectura {t_lectura:.2f} s, total {t_total:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo: Rotación y archivo comprimido de los archivos de asistencia
+Autor: Alexis Ayala
+Descripción:
+  - Cuando un archivo de la carpeta de trabajo supera un tamaño (o tiene entradas anteriores a
+    una fecha), sus entradas se sellan en un segmento comprimido con gzip:
+        .datos/segmentos/<archivo>/000001.gz
+    y el archivo vivo conserva solo su encabezado (y, en la rotación por fecha, las entradas
+    recientes).
+  - Cada archivo tiene un índice de segmentos (.datos/segmentos/<archivo>/indice.json) con el
+    rango de fechas, los usuarios presentes y el tamaño de cada segmento, así que lectores,
+    reportes y búsquedas abren solo los segmentos que les interesan y los descomprimen
+    como flujo.
+  - Si se indica el almacén de registros, las entradas movidas se reubican en él
+    (archivo '<archivo>#<segmento>' y offset dentro del segmento descomprimido).
+  - La rotación reemplaza el archivo vivo, así que es una operación explícita (`rotar`) que toma
+    el candado exclusivo de la carpeta (.datos/rotacion.lock). Los escritores de anexos (sesiones,
+    servidor, cargas por lote) tienen el candado compartido mientras tengan archivos abiertos:
+    con alguno activo la rotación se rechaza, y un escritor que empieza durante una rotación
+    espera a que termine (ningún anexo cae en el archivo viejo ya reemplazado).
+Uso por consola:
+  python rotacion.py rotar --max-mb 64
+  python rotacion.py rotar --antes-de 01/01/2024
+  python rotacion.py ver asistencias.txt --usuario @Juan --desde 01/06/2023 --hasta 30/06/2023
+  python rotacion.py buscar "ausente" --desde 01/06/2023
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from diario import reproducir_diario
+from fechas import parsear_fecha
+from registros import (
+    CARPETA_DATOS,
+    AlmacenRegistros,
+    Registro,
+    fecha_a_ordinal,
+    iterar_bloques,
+    iterar_registros_flujo,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: ahí os.replace ya falla si otro proceso tiene abierto el archivo
+    fcntl = None
+
+CARPETA_SEGMENTOS = "segmentos"
+NOMBRE_INDICE = "indice.json"
+NOMBRE_BLOQUEO = "rotacion.lock"
+# Umbral por defecto para la rotación por tamaño
+MAX_BYTES_POR_DEFECTO = 64 * 1024 * 1024
+
+
+@dataclass
+class Segmento:
+    """Metadatos de un segmento sellado (una entrada de indice.json)."""
+    archivo: str                 # archivo vivo del que salió
+    nombre: str                  # p. ej. '000003.gz'
+    desde: int                   # día ordinal de la entrada más antigua
+    hasta: int                   # día ordinal de la entrada más reciente
+    entradas: int
+    bytes_crudos: int
+    bytes_comprimidos: int
+    usuarios: List[str] = field(default_factory=list)
+
+    @property
+    def clave(self) -> str:
+        """Nombre con el que el almacén identifica las entradas de este segmento."""
+        return f"{self.archivo}#{self.nombre}"
+
+
+def carpeta_segmentos(base_dir: Path, archivo: str) -> Path:
+    return base_dir / CARPETA_DATOS / CARPETA_SEGMENTOS / archivo
+
+
+def _escribir_json_atomico(ruta: Path, datos: object) -> None:
+    temporal = ruta.with_name(ruta.name + ".tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+
+
+def leer_indice(base_dir: Path, archivo: str) -> List[Segmento]:
+    """Segmentos sellados de `archivo`, del más antiguo al más reciente."""
+    try:
+        with open(carpeta_segmentos(base_dir, archivo) / NOMBRE_INDICE, encoding="utf-8") as f:
+            return [Segmento(archivo=archivo, **s) for s in json.load(f)]
+    except FileNotFoundError:
+        return []
+
+
+def _guardar_indice(base_dir: Path, archivo: str, segmentos: List[Segmento]) -> None:
+    datos = [{k: v for k, v in vars(s).items() if k != "archivo"} for s in segmentos]
+    _escribir_json_atomico(carpeta_segmentos(base_dir, archivo) / NOMBRE_INDICE, datos)
+
+
+def archivos_con_segmentos(base_dir: Path) -> List[str]:
+    raiz = base_dir / CARPETA_DATOS / CARPETA_SEGMENTOS
+    if not raiz.is_dir():
+        return []
+    return sorted(p.name for p in raiz.iterdir() if (p / NOMBRE_INDICE).is_file())
+
+
+# ================================
+# Candado entre escritores y rotación
+# ================================
+
+class CarpetaOcupada(RuntimeError):
+    """La rotación no puede correr: hay escritores con archivos de la carpeta abiertos."""
+
+
+class BloqueoCarpeta:
+    """
+    Candado de la carpeta de trabajo sobre .datos/rotacion.lock (flock).
+    - `compartido()`: lo toman los escritores de anexos; espera si hay una rotación en curso.
+    - `exclusivo()`: lo toma la rotación; lanza CarpetaOcupada si hay escritores.
+    Sin fcntl no bloquea nada (ver la importación).
+    """
+
+    def __init__(self, base_dir: Path) -> None:
+        self.ruta = base_dir / CARPETA_DATOS / NOMBRE_BLOQUEO
+        self._fd: Optional[int] = None
+
+    def _tomar(self, exclusivo: bool) -> None:
+        if fcntl is None or self._fd is not None:
+            return
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.ruta, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB if exclusivo else fcntl.LOCK_SH)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def compartido(self) -> None:
+        self._tomar(exclusivo=False)
+
+    def exclusivo(self) -> None:
+        try:
+            self._tomar(exclusivo=True)
+        except BlockingIOError:
+            raise CarpetaOcupada(
+                f"Hay escritores activos en '{self.ruta.parent.parent}' (sesiones, servidor o "
+                "cargas por lote); ciérralos antes de rotar.") from None
+
+    def liberar(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)  # Cerrar el descriptor suelta el flock
+            self._fd = None
+
+
+# ================================
+# Rotación
+# ================================
+
+def rotar_archivo(ruta: Path, max_bytes: Optional[int] = MAX_BYTES_POR_DEFECTO,
+                  antes_de: Optional[Tuple[int, int, int]] = None,
+                  almacen: Optional[AlmacenRegistros] = None) -> Optional[Segmento]:
+    """
+    Sella en un segmento gzip las entradas de `ruta`:
+    - por tamaño: si el archivo mide más de `max_bytes`, se sellan todas sus entradas;
+    - por fecha: con `antes_de`, se sellan las entradas anteriores a esa fecha.
+    El encabezado del archivo y las entradas no selladas quedan en el archivo vivo.
+    Regresa el segmento creado o None si no hubo nada que sellar.
+    No toma el candado de la carpeta: quien llama debe tener el exclusivo (ver rotar_carpeta).
+    """
+    por_tamano = max_bytes is not None and ruta.stat().st_size > max_bytes
+    if not por_tamano and antes_de is None:
+        return None
+    limite = fecha_a_ordinal(antes_de) if antes_de is not None else None
+    base_dir, archivo = ruta.parent, ruta.name
+    carpeta = carpeta_segmentos(base_dir, archivo)
+    carpeta.mkdir(parents=True, exist_ok=True)
+    segmentos = leer_indice(base_dir, archivo)
+    numero = int(segmentos[-1].nombre.split(".")[0]) + 1 if segmentos else 1
+    segmento = Segmento(archivo, f"{numero:06d}.gz", 0, 0, 0, 0, 0)
+
+    ruta_seg = carpeta / segmento.nombre
+    temporal_seg = ruta_seg.with_name(ruta_seg.name + ".tmp")
+    temporal_vivo = ruta.with_name(f".{archivo}.rotando")
+    usuarios: Dict[str, None] = {}
+    # (offset anterior, archivo nuevo, offset nuevo) para reubicar en el almacén
+    movimientos: List[Tuple[int, str, int]] = []
+    desde = hasta = None
+    with open(ruta, "rb") as origen, open(temporal_vivo, "wb") as vivo, \
+            gzip.open(temporal_seg, "wb", compresslevel=6) as comprimido:
+        for cabecera, offset, crudo in iterar_bloques(origen):
+            if cabecera is None:
+                vivo.write(crudo)  # Encabezado del archivo: siempre se queda
+                continue
+            dia = fecha_a_ordinal(cabecera[1])
+            if por_tamano or (limite is not None and dia < limite):
+                movimientos.append((offset, segmento.clave, segmento.bytes_crudos))
+                comprimido.write(crudo)
+                segmento.bytes_crudos += len(crudo)
+                segmento.entradas += 1
+                usuarios[cabecera[0]] = None
+                desde = dia if desde is None else min(desde, dia)
+                hasta = dia if hasta is None else max(hasta, dia)
+            else:
+                movimientos.append((offset, archivo, vivo.tell()))
+                vivo.write(crudo)
+        vivo.flush()
+        os.fsync(vivo.fileno())
+
+    if segmento.entradas == 0:
+        temporal_seg.unlink()
+        temporal_vivo.unlink()
+        return None
+    segmento.desde, segmento.hasta = desde, hasta  # type: ignore[assignment]
+    segmento.usuarios = sorted(usuarios)
+    segmento.bytes_comprimidos = temporal_seg.stat().st_size
+    # Orden pensado para fallos: primero el segmento y su índice, al final el archivo vivo.
+    # Si algo falla en medio, lo peor es una entrada repetida (en el segmento y en el vivo),
+    # nunca una entrada perdida.
+    os.replace(temporal_seg, ruta_seg)
+    _guardar_indice(base_dir, archivo, segmentos + [segmento])
+    os.replace(temporal_vivo, ruta)
+    if almacen is not None:
+        almacen.reubicar(archivo, movimientos)
+    return segmento
+
+
+def rotar_carpeta(base_dir: Path, max_bytes: Optional[int] = MAX_BYTES_POR_DEFECTO,
+                  antes_de: Optional[Tuple[int, int, int]] = None,
+                  almacen: Optional[AlmacenRegistros] = None) -> List[Segmento]:
+    """
+    Aplica rotar_archivo a cada archivo visible de la carpeta con el candado exclusivo tomado.
+    Regresa los segmentos creados; lanza CarpetaOcupada si hay escritores activos.
+    """
+    creados = []
+    bloqueo = BloqueoCarpeta(base_dir)
+    bloqueo.exclusivo()
+    try:
+        # Lo que quedó en el diario tras una caída apunta a offsets del archivo vivo actual
+        reproducir_diario(base_dir)
+        with os.scandir(base_dir) as it:
+            rutas = sorted(Path(e.path) for e in it if not e.name.startswith(".") and e.is_file())
+        for ruta in rutas:
+            segmento = rotar_archivo(ruta, max_bytes, antes_de, almacen)
+            if segmento is not None:
+                creados.append(segmento)
+    finally:
+        bloqueo.liberar()
+    return creados
+
+
+# ================================
+# Lectura de segmentos
+# ================================
+
+def seleccionar_segmentos(base_dir: Path, archivo: Optional[str] = None,
+                          desde: Optional[Tuple[int, int, int]] = None,
+                          hasta: Optional[Tuple[int, int, int]] = None,
+                          usuario: Optional[str] = None) -> List[Segmento]:
+    """Solo los segmentos cuyo rango de fechas y usuarios pueden contener lo buscado."""
+    inicio = fecha_a_ordinal(desde) if desde else None
+    fin = fecha_a_ordinal(hasta) if hasta else None
+    archivos = [archivo] if archivo else archivos_con_segmentos(base_dir)
+    elegidos = []
+    for nombre in archivos:
+        for s in leer_indice(base_dir, nombre):
+            if inicio is not None and s.hasta < inicio:
+                continue
+            if fin is not None and s.desde > fin:
+                continue
+            if usuario is not None and usuario not in s.usuarios:
+                continue
+            elegidos.append(s)
+    return elegidos
+
+
+def abrir_segmento(base_dir: Path, segmento: Segmento) -> BinaryIO:
+    """Abre el segmento para leerlo descomprimido como flujo."""
+    return gzip.open(carpeta_segmentos(base_dir, segmento.archivo) / segmento.nombre, "rb")  # type: ignore[return-value]
+
+
+def iterar_registros_archivados(base_dir: Path, archivo: Optional[str] = None,
+                                desde: Optional[Tuple[int, int, int]] = None,
+                                hasta: Optional[Tuple[int, int, int]] = None,
+                                usuario: Optional[str] = None) -> Iterator[Registro]:
+    """Registros de los segmentos que coinciden con los filtros (descompresión en flujo)."""
+    inicio = fecha_a_ordinal(desde) if desde else None
+    fin = fecha_a_ordinal(hasta) if hasta else None
+    for segmento in seleccionar_segmentos(base_dir, archivo, desde, hasta, usuario):
+        with abrir_segmento(base_dir, segmento) as f:
+            for r in iterar_registros_flujo(f, segmento.clave):
+                dia = fecha_a_ordinal(r.fecha_tuple)
+                if ((inicio is None or dia >= inicio) and (fin is None or dia <= fin)
+                        and (usuario is None or r.nickname == usuario)):
+                    yield r
+
+
+def buscar_en_segmentos(base_dir: Path, consulta: str, **filtros) -> Iterator[Registro]:
+    """Entradas archivadas cuyo texto (cabecera incluida) contiene todas las palabras de la consulta."""
+    palabras = [p.casefold() for p in consulta.split()]
+    for r in iterar_registros_archivados(base_dir, **filtros):
+        texto = f"{r.nickname} {r.texto}".casefold()
+        if all(p in texto for p in palabras):
+            yield r
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Rotación y consulta de segmentos archivados.")
+    parser.add_argument("--base-dir", type=Path, default=Path.cwd() / "files",
+                        help="Carpeta de trabajo (por defecto ./files)")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p_rot = sub.add_parser("rotar", help="Sella entradas en segmentos comprimidos")
+    p_rot.add_argument("--max-mb", type=float, default=MAX_BYTES_POR_DEFECTO / 1024 / 1024,
+                       help="Rota los archivos que superen este tamaño")
+    p_rot.add_argument("--antes-de", help="Sella las entradas anteriores a dd/mm/aaaa")
+    for nombre, ayuda in (("ver", "Muestra entradas archivadas"), ("buscar", "Busca en segmentos")):
+        p = sub.add_parser(nombre, help=ayuda)
+        if nombre == "ver":
+            p.add_argument("archivo", nargs="?")
+        else:
+            p.add_argument("consulta")
+        p.add_argument("--usuario")
+        p.add_argument("--desde")
+        p.add_argument("--hasta")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.comando == "rotar":
+            antes_de = parsear_fecha(args.antes_de) if args.antes_de else None
+            max_bytes = None if antes_de else int(args.max_mb * 1024 * 1024)
+            almacen = AlmacenRegistros.para_directorio(args.base_dir)
+            try:
+                creados = rotar_carpeta(args.base_dir, max_bytes, antes_de, almacen)
+            except CarpetaOcupada as e:
+                print(f"[Aviso] {e}", file=sys.stderr)
+                return
+            finally:
+                almacen.cerrar()
+            for s in creados:
+                print(f"{s.archivo} -> {s.nombre}: {s.entradas} entradas, "
+                      f"{s.bytes_crudos:,} -> {s.bytes_comprimidos:,} bytes")
+            if not creados:
+                print("No hubo nada que rotar.")
+            return
+        filtros = {
+            "desde": parsear_fecha(args.desde) if args.desde else None,
+            "hasta": parsear_fecha(args.hasta) if args.hasta else None,
+            "usuario": args.usuario,
+        }
+    except ValueError:
+        print("Formato inválido. Usa dd/mm/aaaa y una fecha que exista.")
+        return
+    if args.comando == "ver":
+        registros = iterar_registros_archivados(args.base_dir, archivo=args.archivo, **filtros)
+    else:
+        registros = buscar_en_segmentos(args.base_dir, args.consulta, **filtros)
+    for r in registros:
+        d, m, a = r.fecha_tuple
+        print(f"[{r.archivo}] {r.nickname} {d:02d}/{m:02d}/{a:04d}: {r.texto}")
+
+
+if __name__ == "__main__":
+    main()
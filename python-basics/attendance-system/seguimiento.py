@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo: Seguimiento de archivos (modo "tail -f")
+Autor: Alexis Ayala
+Descripción:
+  - Muestra solo lo que se anexa a un archivo mientras se observa, sin releerlo completo:
+    `SeguidorArchivos` recuerda el último offset en bytes de cada archivo y en cada
+    actualización lee únicamente desde ahí hasta el final (costo proporcional a lo nuevo),
+    por bloques de tamaño fijo: aunque se haya anexado mucho, la memoria queda acotada.
+  - Solo se entregan líneas completas: una entrada a medio escribir (o un carácter UTF-8 partido)
+    se deja para la siguiente actualización. Una línea más larga que MAX_LINEA se entrega en
+    trozos para no acumularla completa en memoria.
+  - Si el archivo se reemplaza o se trunca (p. ej. al sellarlo en un segmento, ver rotacion.py),
+    se vuelve a leer desde el inicio.
+  - La espera entre actualizaciones no hace lecturas repetidas: en Linux usa inotify sobre la
+    carpeta (despierta solo cuando cambia el archivo); en otros sistemas, o si inotify no está
+    disponible, compara el stat del archivo cada `intervalo` segundos.
+Uso por consola:
+  python seguimiento.py files/asistencias.txt
+  python seguimiento.py files/asistencias.txt --desde-inicio --sondeo
+"""
+from __future__ import annotations
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from metricas import METRICAS
+
+INTERVALO_SONDEO = 0.5
+TAM_BLOQUE = 64 * 1024
+MAX_LINEA = 1024 * 1024
+
+# Constantes de <sys/inotify.h>
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+_EVENTO = struct.Struct("iIII")   # wd, mask, cookie, len (seguido del nombre)
+
+
+class SeguidorArchivos:
+    """Último offset leído de cada archivo (con su inodo, para detectar reemplazos)."""
+
+    def __init__(self) -> None:
+        self._posiciones: Dict[Path, Tuple[int, int]] = {}   # ruta -> (inodo, offset)
+
+    def posicion(self, ruta: Path) -> Optional[int]:
+        """Offset recordado para `ruta` o None si nunca se ha seguido."""
+        estado = self._posiciones.get(ruta)
+        return estado[1] if estado else None
+
+    def ir_al_final(self, ruta: Path) -> int:
+        """Marca todo el contenido actual como leído (solo se mostrará lo que se anexe)."""
+        st = os.stat(ruta)
+        self._posiciones[ruta] = (st.st_ino, st.st_size)
+        return st.st_size
+
+    def olvidar(self, ruta: Path) -> None:
+        self._posiciones.pop(ruta, None)
+
+    def nuevas_lineas(self, ruta: Path, tam_bloque: int = TAM_BLOQUE) -> Iterator[str]:
+        """
+        Produce las líneas completas anexadas a `ruta` desde la última llamada (o desde el inicio
+        si el archivo no se había seguido, cambió de inodo o ahora es más corto).
+        Lee por bloques de `tam_bloque` bytes hasta el tamaño visto al abrir; el offset recordado
+        avanza con cada línea entregada.
+        """
+        try:
+            f = open(ruta, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            st = os.fstat(f.fileno())
+            inodo, offset = self._posiciones.get(ruta, (st.st_ino, 0))
+            if inodo != st.st_ino or st.st_size < offset:
+                offset = 0
+            self._posiciones[ruta] = (st.st_ino, offset)
+            f.seek(offset)
+            pendiente = b""                    # línea sin terminar del bloque anterior
+            restante = st.st_size - offset
+            while restante > 0:
+                bloque = f.read(min(tam_bloque, restante))
+                if not bloque:
+                    break
+                restante -= len(bloque)
+                METRICAS.sumar_bytes("seguimiento", leidos=len(bloque))
+                pendiente += bloque
+                *completas, pendiente = pendiente.split(b"\n")
+                for linea in completas:
+                    offset += len(linea) + 1
+                    self._posiciones[ruta] = (st.st_ino, offset)
+                    yield linea.rstrip(b"\r").decode("utf-8", errors="replace")
+                if len(pendiente) >= MAX_LINEA:
+                    corte = _corte_utf8(pendiente)
+                    offset += corte
+                    self._posiciones[ruta] = (st.st_ino, offset)
+                    pendiente, trozo = pendiente[corte:], pendiente[:corte]
+                    yield trozo.decode("utf-8", errors="replace")
+
+
+def _corte_utf8(datos: bytes) -> int:
+    """
+    Largo del prefijo de `datos` que termina en un carácter UTF-8 completo: si el último
+    carácter está incompleto, el corte cae en su byte inicial (el primero que no es de
+    continuación, `& 0xC0 != 0x80`).
+    """
+    inicio = len(datos) - 1
+    while inicio > 0 and len(datos) - inicio < 4 and datos[inicio] & 0xC0 == 0x80:
+        inicio -= 1
+    lider = datos[inicio]
+    largo = 1 if lider < 0xC0 else 2 if lider < 0xE0 else 3 if lider < 0xF0 else 4
+    return inicio if 0 < inicio and inicio + largo > len(datos) else len(datos)
+
+
+# Offsets compartidos por todo el proceso: volver a seguir un archivo muestra lo anexado desde
+# la última vez
+SEGUIDOR = SeguidorArchivos()
+
+
+class VigilanteSondeo:
+    """Espera cambios comparando (inodo, tamaño, mtime) del archivo cada `intervalo` segundos."""
+
+    def __init__(self, ruta: Path, intervalo: float = INTERVALO_SONDEO) -> None:
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self._firma = self._leer_firma()
+
+    def _leer_firma(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.ruta)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def esperar(self, timeout: Optional[float] = None) -> bool:
+        """Regresa True si el archivo cambió, False si pasó `timeout` sin cambios."""
+        limite = None if timeout is None else time.monotonic() + timeout
+        while True:
+            firma = self._leer_firma()
+            if firma != self._firma:
+                self._firma = firma
+                return True
+            restante = self.intervalo if limite is None else min(self.intervalo, limite - time.monotonic())
+            if restante <= 0:
+                return False
+            time.sleep(restante)
+
+    def cerrar(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+
+class VigilanteInotify:
+    """
+    Espera cambios con inotify (Linux) sobre la carpeta del archivo, filtrando por nombre:
+    así también se detecta cuando el archivo se reemplaza (os.replace) o se vuelve a crear.
+    """
+
+    MASCARA = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, ruta: Path) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.ruta = ruta
+        self._nombre = os.fsencode(ruta.name)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falló")
+        carpeta = os.fsencode(str(ruta.parent) or ".")
+        if libc.inotify_add_watch(self._fd, carpeta, self.MASCARA) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, "inotify_add_watch falló")
+
+    def _hay_evento_propio(self) -> bool:
+        """Consume los eventos pendientes; True si alguno es del archivo seguido."""
+        propio = False
+        while True:
+            try:
+                datos = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return propio
+            pos = 0
+            while pos + _EVENTO.size <= len(datos):
+                _, _, _, largo = _EVENTO.unpack_from(datos, pos)
+                nombre = datos[pos + _EVENTO.size:pos + _EVENTO.size + largo].rstrip(b"\0")
+                propio = propio or nombre == self._nombre
+                pos += _EVENTO.size + largo
+
+    def esperar(self, timeout: Optional[float] = None) -> bool:
+        """Regresa True si el archivo cambió, False si pasó `timeout` sin cambios."""
+        limite = None if timeout is None else time.monotonic() + timeout
+        while True:
+            restante = None if limite is None else max(0.0, limite - time.monotonic())
+            listos, _, _ = select.select([self._fd], [], [], restante)
+            if not listos:
+                return False
+            if self._hay_evento_propio():
+                return True
+
+    def cerrar(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+
+def crear_vigilante(ruta: Path, sondeo: bool = False, intervalo: float = INTERVALO_SONDEO):
+    """Vigilante con inotify si está disponible; si no (o con `sondeo=True`), por stat."""
+    if not sondeo and sys.platform.startswith("linux"):
+        try:
+            return VigilanteInotify(ruta)
+        except (OSError, AttributeError):  # Sin libc o sin inotify (límite de vigilancias, etc.)
+            pass
+    return VigilanteSondeo(ruta, intervalo)
+
+
+def seguir_archivo(ruta: Path, mostrar: Callable[[str], None] = print,
+                   seguidor: SeguidorArchivos = SEGUIDOR, desde_inicio: bool = False,
+                   sondeo: bool = False, detener: Optional[threading.Event] = None) -> None:
+    """
+    Muestra lo que se anexa a `ruta` hasta Ctrl+C (o hasta que se active `detener`).
+    - La primera vez que se sigue un archivo empieza en su final (o en el inicio con
+      `desde_inicio`); las siguientes, en donde se quedó la vez anterior.
+    """
+    if desde_inicio:
+        seguidor.olvidar(ruta)
+    elif seguidor.posicion(ruta) is None:
+        seguidor.ir_al_final(ruta)
+    try:
+        with crear_vigilante(ruta, sondeo=sondeo) as vigilante:
+            while detener is None or not detener.is_set():
+                for linea in seguidor.nuevas_lineas(ruta):
+                    mostrar(linea)
+                # Con `detener` se despierta de vez en cuando para revisarlo
+                vigilante.esperar(timeout=None if detener is None else 0.2)
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Muestra lo que se anexa a un archivo de asistencia.")
+    parser.add_argument("archivo", type=Path)
+    parser.add_argument("--desde-inicio", action="store_true", help="Muestra también el contenido actual")
+    parser.add_argument("--sondeo", action="store_true", help="Usa stat periódico en lugar de inotify")
+    args = parser.parse_args(argv)
+    if not args.archivo.is_file():
+        print(f"[Aviso] No existe el archivo '{args.archivo}'.")
+        return
+    print(f"Siguiendo '{args.archivo.name}' (Ctrl+C para salir)...")
+    seguir_archivo(args.archivo, desde_inicio=args.desde_inicio, sondeo=args.sondeo)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo: Servidor local multiusuario
+Autor: Alexis Ayala
+Descripción:
+  - Expone la carpeta de trabajo por HTTP (solo biblioteca estándar) para que varias sesiones
+    (p. ej. varios salones) lean y escriban al mismo tiempo.
+  - Todas las escrituras pasan por una única cola de escritura atendida por un hilo: nunca hay
+    dos anexos simultáneos sobre el mismo archivo y las peticiones que llegan juntas se agrupan
+    en un solo anexo por archivo.
+  - Las lecturas no toman ningún candado: leen hasta el tamaño actual del archivo, así que nunca
+    bloquean a los escritores.
+Rutas:
+  GET  /archivos                          -> lista de archivos
+  GET  /archivos/<nombre>?desde=N&max=M   -> hasta M bytes a partir del offset N
+                                             (N >= 0, 0 < M <= MAX_LECTURA; si no, 400)
+  POST /archivos/<nombre>                 -> {"usuario", "fecha", "texto"} (anexa una entrada)
+  POST /crear                             -> {"usuario", "fecha", "archivo"} (crea un archivo)
+  Los POST requieren Content-Length entre 0 y MAX_CUERPO (inválido: 400; mayor: 413).
+Uso por consola:
+  python servidor.py servir --puerto 8765
+  python servidor.py carga --clientes 32 --peticiones 200     (prueba de carga local)
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import queue
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from attendance_system import (
+    CACHE_DIRECTORIO,
+    EscritorAnexos,
+    asegurar_archivos_iniciales,
+    escribir_atomico,
+    listar_archivos,
+    normalizar_nickname,
+)
+from fechas import parsear_fecha
+from registros import AlmacenRegistros, Registro, encabezado_archivo, formatear_cabecera
+
+# Tope de bytes por lectura para que una sola petición no cargue un archivo enorme
+MAX_LECTURA = 1024 * 1024
+# Tope del cuerpo de un POST: se lee completo en memoria antes de interpretar el JSON
+MAX_CUERPO = 256 * 1024
+
+
+class CuerpoDemasiadoGrande(ValueError):
+    """El Content-Length de la petición supera MAX_CUERPO (se responde 413)."""
+
+
+class ColaEscritura:
+    """
+    Escritor único para todo el servidor.
+    - `anexar` encola la entrada y regresa un Future con el offset donde quedó escrita.
+    - El hilo escritor vacía la cola por tandas: agrupa por archivo, hace un solo anexo por
+      archivo y registra toda la tanda en el almacén en una transacción.
+    """
+
+    def __init__(self, almacen: Optional[AlmacenRegistros] = None,
+                 politica: str = "flush", max_tanda: int = 1000) -> None:
+        self._cola: "queue.Queue[Optional[Tuple[Path, Registro, str, Future]]]" = queue.Queue()
+        self._escritor = EscritorAnexos(politica=politica)
+        self._almacen = almacen
+        self._max_tanda = max_tanda
+        self._hilo = threading.Thread(target=self._atender, name="cola-escritura", daemon=True)
+        self._hilo.start()
+
+    def anexar(self, ruta: Path, nickname: str, fecha_tuple: Tuple[int, int, int], texto: str) -> "Future[int]":
+        futuro: "Future[int]" = Future()
+        entrada = formatear_cabecera(nickname, fecha_tuple) + texto + "\n"
+        registro = Registro(nickname, fecha_tuple, ruta.name, -1, texto)
+        self._cola.put((ruta, registro, entrada, futuro))
+        return futuro
+
+    def _atender(self) -> None:
+        terminar = False
+        while not terminar:
+            tanda = [self._cola.get()]
+            # Toma lo que ya esté esperando (sin bloquear) para agruparlo
+            while len(tanda) < self._max_tanda:
+                try:
+                    tanda.append(self._cola.get_nowait())
+                except queue.Empty:
+                    break
+            if None in tanda:
+                terminar = True
+            lote = [t for t in tanda if t is not None]
+            try:
+                self._escribir_tanda(lote)
+            except Exception as e:  # El hilo escritor no debe morir: cada petición recibe el error
+                for *_, futuro in lote:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+
+    def _escribir_tanda(self, tanda) -> None:
+        por_archivo: Dict[Path, list] = {}
+        for item in tanda:
+            por_archivo.setdefault(item[0], []).append(item)
+        registros: List[Registro] = []
+        for ruta, items in por_archivo.items():
+            try:
+                offset = self._escritor.anexar(ruta, "".join(entrada for _, _, entrada, _ in items))
+            except OSError as e:
+                for *_, futuro in items:
+                    futuro.set_exception(e)
+                continue
+            for _, registro, entrada, futuro in items:
+                registros.append(Registro(registro.nickname, registro.fecha_tuple,
+                                          registro.archivo, offset, registro.texto))
+                futuro.set_result(offset)
+                offset += len(entrada.encode("utf-8"))
+        if self._almacen is not None and registros:
+            # Las entradas ya están en los archivos (la fuente de verdad) y sus peticiones ya
+            # recibieron el offset; el almacén se puede completar después con `registros.py importar`
+            try:
+                self._almacen.agregar_muchos(registros)
+            except sqlite3.Error as e:
+                print(f"[Aviso] {len(registros)} entradas no se registraron en el almacén: {e}",
+                      file=sys.stderr)
+
+    def cerrar(self) -> None:
+        """Procesa lo pendiente, detiene el hilo escritor y cierra los archivos."""
+        self._cola.put(None)
+        self._hilo.join()
+        self._escritor.cerrar()
+
+
+class ServidorAsistencia(ThreadingHTTPServer):
+    """ThreadingHTTPServer con el estado compartido de la carpeta de trabajo."""
+    daemon_threads = True
+
+    def __init__(self, direccion: Tuple[str, int], base_dir: Path, usar_almacen: bool = True) -> None:
+        super().__init__(direccion, ManejadorAsistencia)
+        asegurar_archivos_iniciales(base_dir)
+        self.base_dir = base_dir
+        self.almacen = AlmacenRegistros.para_directorio(base_dir) if usar_almacen else None
+        self.cola = ColaEscritura(self.almacen)
+        self.bloqueo_creacion = threading.Lock()
+        self.bloqueo_listado = threading.Lock()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.cola.cerrar()
+        if self.almacen is not None:
+            self.almacen.cerrar()
+
+
+class ManejadorAsistencia(BaseHTTPRequestHandler):
+    server: ServidorAsistencia
+    protocol_version = "HTTP/1.1"
+    # Encabezados y cuerpo salen en escrituras separadas; sin esto Nagle agrega ~40 ms por respuesta
+    disable_nagle_algorithm = True
+
+    def log_message(self, formato, *args) -> None:  # Silencia el log por petición
+        pass
+
+    def _responder(self, estado: int, datos: object) -> None:
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _leer_json(self) -> Dict[str, object]:
+        valor = (self.headers.get("Content-Length") or "0").strip()
+        largo = int(valor) if valor.isascii() and valor.isdigit() else -1
+        if not 0 <= largo <= MAX_CUERPO:
+            # El cuerpo no se lee: la conexión ya no sirve para otra petición
+            self.close_connection = True
+            if largo < 0:
+                raise ValueError(f"Content-Length inválido: '{valor}'.")
+            raise CuerpoDemasiadoGrande(f"El cuerpo supera el máximo de {MAX_CUERPO} bytes.")
+        datos = json.loads(self.rfile.read(largo) or b"{}")
+        if not isinstance(datos, dict):
+            raise ValueError("Se esperaba un objeto JSON.")
+        return datos
+
+    def _ruta_archivo(self, nombre: str) -> Path:
+        nombre = unquote(nombre)
+        if not nombre or "/" in nombre or "\\" in nombre or nombre.startswith("."):
+            raise ValueError(f"Nombre de archivo no permitido: '{nombre}'")
+        return self.server.base_dir / nombre
+
+    def _identidad(self, datos: Dict[str, object]) -> Tuple[str, Tuple[int, int, int]]:
+        usuario = str(datos.get("usuario") or "").strip()
+        if not usuario:
+            raise ValueError("Falta el usuario.")
+        try:
+            fecha_tuple = parsear_fecha(str(datos.get("fecha") or ""))
+        except ValueError:
+            raise ValueError("Fecha inválida. Usa dd/mm/aaaa y una fecha que exista.") from None
+        return normalizar_nickname(usuario), fecha_tuple
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        partes = url.path.strip("/").split("/", 1)
+        try:
+            if partes == ["archivos"]:
+                with self.server.bloqueo_listado:
+                    nombres = [p.name for p in listar_archivos(self.server.base_dir).values()]
+                self._responder(200, {"archivos": nombres})
+            elif len(partes) == 2 and partes[0] == "archivos":
+                ruta = self._ruta_archivo(partes[1])
+                params = parse_qs(url.query)
+                desde = int(params.get("desde", ["0"])[0])
+                maximo = int(params.get("max", [str(MAX_LECTURA)])[0])
+                if desde < 0:
+                    raise ValueError("'desde' debe ser un offset >= 0.")
+                if not 0 < maximo <= MAX_LECTURA:
+                    raise ValueError(f"'max' debe estar entre 1 y {MAX_LECTURA}.")
+                if not ruta.is_file():
+                    raise FileNotFoundError
+                # Lectura sin candados: solo hasta el tamaño visible en este momento
+                with open(ruta, "rb") as f:
+                    f.seek(desde)
+                    datos = f.read(maximo)
+                self._responder(200, {"desde": desde, "hasta": desde + len(datos),
+                                      "texto": datos.decode("utf-8", errors="replace")})
+            else:
+                self._responder(404, {"error": "Ruta no encontrada."})
+        except FileNotFoundError:
+            self._responder(404, {"error": "Archivo no encontrado."})
+        except ValueError as e:
+            self._responder(400, {"error": str(e)})
+        except OSError as e:
+            self._responder(500, {"error": f"Error del sistema de archivos: {e}"})
+
+    def do_POST(self) -> None:
+        partes = urlsplit(self.path).path.strip("/").split("/", 1)
+        try:
+            datos = self._leer_json()
+            nickname, fecha_tuple = self._identidad(datos)
+            if len(partes) == 2 and partes[0] == "archivos":
+                ruta = self._ruta_archivo(partes[1])
+                texto = str(datos.get("texto") or "").rstrip()
+                if not texto:
+                    raise ValueError("No se envió contenido.")
+                if not ruta.is_file():
+                    raise FileNotFoundError
+                offset = self.server.cola.anexar(ruta, nickname, fecha_tuple, texto).result()
+                self._responder(201, {"archivo": ruta.name, "offset": offset})
+            elif partes == ["crear"]:
+                ruta = self._ruta_archivo(str(datos.get("archivo") or ""))
+                with self.server.bloqueo_creacion:
+                    if ruta.exists():
+                        self._responder(409, {"error": "El archivo ya existe."})
+                        return
+                    escribir_atomico(ruta, encabezado_archivo(nickname, fecha_tuple))
+                    with self.server.bloqueo_listado:
+                        CACHE_DIRECTORIO.agregar(ruta)
+                self._responder(201, {"archivo": ruta.name})
+            else:
+                self._responder(404, {"error": "Ruta no encontrada."})
+        except FileNotFoundError:
+            self._responder(404, {"error": "Archivo no encontrado."})
+        except CuerpoDemasiadoGrande as e:
+            self._responder(413, {"error": str(e)})
+        except (ValueError, json.JSONDecodeError) as e:
+            self._responder(400, {"error": str(e)})
+        except OSError as e:
+            self._responder(500, {"error": f"Error del sistema de archivos: {e}"})
+        except Exception as e:  # Fallo inesperado del hilo escritor, propagado por el Future
+            self._responder(500, {"error": f"Error interno: {e}"})
+
+
+# ================================
+# Prueba de carga
+# ================================
+
+def _percentil(valores: List[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def prueba_carga(host: str, puerto: int, clientes: int, peticiones: int,
+                 proporcion_lecturas: float = 0.2) -> Dict[str, float]:
+    """
+    Lanza `clientes` hilos; cada uno abre su propia conexión y hace `peticiones` peticiones
+    (mezcla de anexos a asistencias.txt y lecturas del final del archivo).
+    Regresa el throughput y las latencias p50/p99 en milisegundos.
+    """
+    latencias: List[float] = []
+    contadores = {"errores": 0, "anexos": 0}
+    candado = threading.Lock()
+    cada_lectura = int(1 / proporcion_lecturas) if proporcion_lecturas > 0 else 0
+
+    def cliente(n: int) -> None:
+        con = http.client.HTTPConnection(host, puerto, timeout=30)
+        propias: List[float] = []
+        fallidas = anexos = 0
+        for i in range(peticiones):
+            inicio = time.perf_counter()
+            es_lectura = bool(cada_lectura) and i % cada_lectura == cada_lectura - 1
+            if es_lectura:
+                con.request("GET", "/archivos/asistencias.txt?desde=0&max=4096")
+            else:
+                cuerpo = json.dumps({"usuario": f"cliente_{n}", "fecha": "12/06/2023",
+                                     "texto": f"Presente {i}"})
+                con.request("POST", "/archivos/asistencias.txt", body=cuerpo,
+                            headers={"Content-Type": "application/json"})
+            respuesta = con.getresponse()
+            respuesta.read()
+            propias.append(time.perf_counter() - inicio)
+            if respuesta.status >= 400:
+                fallidas += 1
+            elif not es_lectura:
+                anexos += 1
+        con.close()
+        with candado:
+            latencias.extend(propias)
+            contadores["errores"] += fallidas
+            contadores["anexos"] += anexos
+
+    hilos = [threading.Thread(target=cliente, args=(n,)) for n in range(clientes)]
+    inicio = time.perf_counter()
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    total = time.perf_counter() - inicio
+    return {
+        "peticiones": float(len(latencias)),
+        "errores": float(contadores["errores"]),
+        "anexos": float(contadores["anexos"]),
+        "segundos": total,
+        "por_segundo": len(latencias) / total,
+        "p50_ms": statistics.median(latencias) * 1e3,
+        "p99_ms": _percentil(latencias, 99) * 1e3,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Servidor local multiusuario de asistencias.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p_srv = sub.add_parser("servir", help="Inicia el servidor")
+    p_srv.add_argument("--host", default="127.0.0.1")
+    p_srv.add_argument("--puerto", type=int, default=8765)
+    p_srv.add_argument("--base-dir", type=Path, default=Path.cwd() / "files")
+    p_crg = sub.add_parser("carga", help="Prueba de carga contra una instancia local temporal")
+    p_crg.add_argument("--clientes", type=int, default=16)
+    p_crg.add_argument("--peticiones", type=int, default=200, help="Peticiones por cliente")
+    p_crg.add_argument("--lecturas", type=float, default=0.2, help="Proporción de lecturas (0..1)")
+    args = parser.parse_args(argv)
+
+    if args.comando == "servir":
+        servidor = ServidorAsistencia((args.host, args.puerto), args.base_dir)
+        print(f"Sirviendo '{args.base_dir}' en http://{args.host}:{args.puerto} (Ctrl+C para salir)")
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            print("\nDeteniendo servidor...")
+        finally:
+            servidor.server_close()
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = Path(tmp) / "files"
+        servidor = ServidorAsistencia(("127.0.0.1", 0), base_dir)
+        hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+        hilo.start()
+        try:
+            r = prueba_carga("127.0.0.1", servidor.server_address[1], args.clientes,
+                             args.peticiones, args.lecturas)
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+        # Verificación: ningún anexo se perdió
+        escritos = sum(1 for l in open(base_dir / "asistencias.txt", encoding="utf-8")
+                       if l.startswith("[Usuario: "))
+        print(f"Clientes: {args.clientes}  Peticiones: {int(r['peticiones'])}  Errores: {int(r['errores'])}")
+        print(f"Throughput: {r['por_segundo']:,.0f} peticiones/s en {r['segundos']:.2f} s")
+        print(f"Latencia p50: {r['p50_ms']:.2f} ms  p99: {r['p99_ms']:.2f} ms")
+        print(f"Entradas escritas: {escritos} de {int(r['anexos'])} anexos confirmados")
+
+
+if __name__ == "__main__":
+    main()
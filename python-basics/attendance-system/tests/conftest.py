@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""Los módulos del sistema son scripts sueltos: se importan desde la carpeta del proyecto."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
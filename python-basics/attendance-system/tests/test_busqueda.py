@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del índice de búsqueda: anexos incrementales y archivos reemplazados o recortados."""
+import os
+
+from busqueda import IndiceBusqueda
+
+
+def _entrada(nick, texto):
+    return f"[Usuario: {nick}] [Fecha: 01/03/2023]\n{texto}\n"
+
+
+def _archivos(indice, consulta):
+    return [(c.archivo, c.offset) for c in indice.buscar(consulta)]
+
+
+def test_anexo_se_indexa_sin_perder_lo_anterior(tmp_path):
+    ruta = tmp_path / "asistencias.txt"
+    ruta.write_text(_entrada("@ana", "presente"), encoding="utf-8")
+    indice = IndiceBusqueda(tmp_path)
+    indice.actualizar()
+    tamano = ruta.stat().st_size
+    with open(ruta, "a", encoding="utf-8") as f:
+        f.write(_entrada("@luis", "tarde"))
+    indice.actualizar()
+    assert _archivos(indice, "presente") == [("asistencias.txt", 0)]
+    assert _archivos(indice, "tarde") == [("asistencias.txt", tamano)]
+    indice.cerrar()
+
+
+def test_archivo_reemplazado_mas_grande_se_reindexa_completo(tmp_path):
+    ruta = tmp_path / "asistencias.txt"
+    ruta.write_text(_entrada("@ana", "presente"), encoding="utf-8")
+    indice = IndiceBusqueda(tmp_path)
+    indice.actualizar()
+    # Otro inodo con más bytes y un salto de línea justo en el tamaño anterior
+    nuevo = tmp_path / "nuevo.tmp"
+    nuevo.write_text(_entrada("@ana", "ausentes") + _entrada("@luis", "tarde"), encoding="utf-8")
+    os.replace(nuevo, ruta)
+    indice.actualizar()
+    assert _archivos(indice, "presente") == []
+    assert _archivos(indice, "ausentes") == [("asistencias.txt", 0)]
+    assert len(_archivos(indice, "tarde")) == 1
+    indice.cerrar()
+
+
+def test_archivo_recortado_se_reindexa_completo(tmp_path):
+    ruta = tmp_path / "asistencias.txt"
+    ruta.write_text(_entrada("@ana", "presente") + _entrada("@luis", "tarde"), encoding="utf-8")
+    indice = IndiceBusqueda(tmp_path)
+    indice.actualizar()
+    with open(ruta, "r+", encoding="utf-8") as f:
+        f.truncate(len(_entrada("@ana", "presente").encode("utf-8")))
+    indice.actualizar()
+    assert _archivos(indice, "presente") == [("asistencias.txt", 0)]
+    assert _archivos(indice, "tarde") == []
+    indice.cerrar()
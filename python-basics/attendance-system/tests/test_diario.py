@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del diario de escrituras: reproducción idempotente y offsets reales."""
+import pytest
+
+import diario
+from attendance_system import EscritorAnexos
+from diario import (
+    ANEXO,
+    CORRECCION,
+    DiarioEscrituras,
+    _codificar,
+    leer_registros,
+    reproducir_diario,
+    ruta_diario,
+    rutas_diario,
+)
+
+
+def _nuevo_diario(base_dir):
+    escritor = EscritorAnexos(politica="flush")
+    return escritor, DiarioEscrituras(base_dir, escritor, ventana=0)
+
+
+def _caida(d, escritor):
+    """
+    Simula una caída: se pierde el proceso sin checkpoint (el diario queda con sus registros y
+    sin dueño). Regresa la ruta del diario huérfano.
+    """
+    d._f.close()
+    diario._ACTIVOS.discard(d.ruta)
+    escritor.cerrar()
+    return d.ruta
+
+
+def test_reproducir_dos_veces_no_duplica(tmp_path):
+    ruta = tmp_path / "asistencias.txt"
+    ruta.write_bytes(b"inicio\n")
+    escritor, d = _nuevo_diario(tmp_path)
+    for i in range(3):
+        d.anexar(ruta, f"entrada {i}\n")
+    huerfano = _caida(d, escritor)
+    esperado = ruta.read_bytes()
+    copia = huerfano.read_bytes()
+
+    # El último anexo quedó cortado a la mitad en el archivo destino
+    ruta.write_bytes(esperado[:-4])
+    assert reproducir_diario(tmp_path) == 1
+    assert ruta.read_bytes() == esperado
+
+    # Otra caída antes de vaciar el diario: reproducir de nuevo no cambia nada
+    assert not huerfano.exists()
+    huerfano.write_bytes(copia)
+    assert reproducir_diario(tmp_path) == 0
+    assert ruta.read_bytes() == esperado
+
+
+def test_reproduccion_interrumpida_con_offset_ajeno(tmp_path, monkeypatch):
+    ruta = tmp_path / "asistencias.txt"
+    # Otro proceso anexó en el offset que el diario esperaba usar, y la caída fue antes de aplicar
+    ruta.write_bytes(b"inicio\nde otro proceso\n")
+    ruta_diario(tmp_path).parent.mkdir(parents=True)
+    ruta_diario(tmp_path).write_bytes(_codificar(ANEXO, "asistencias.txt", 7, b"mia\n"))
+
+    def _falla(_ruta):
+        raise OSError("caída a mitad de la reproducción")
+
+    monkeypatch.setattr(diario, "_fsync_ruta", _falla)
+    with pytest.raises(OSError):
+        reproducir_diario(tmp_path)
+    monkeypatch.undo()
+    assert ruta.read_bytes() == b"inicio\nde otro proceso\nmia\n"
+    tipos = [tipo for _, tipo, _, _, _ in leer_registros(ruta_diario(tmp_path))]
+    assert tipos == [ANEXO, CORRECCION]
+
+    assert reproducir_diario(tmp_path) == 0
+    assert ruta.read_bytes() == b"inicio\nde otro proceso\nmia\n"
+    assert not ruta_diario(tmp_path).exists()
+
+
+def test_cola_cortada_del_diario_se_descarta(tmp_path):
+    ruta = tmp_path / "a.txt"
+    ruta.write_bytes(b"")
+    ruta_diario(tmp_path).parent.mkdir(parents=True)
+    registro = _codificar(ANEXO, "a.txt", 0, b"uno\n")
+    ruta_diario(tmp_path).write_bytes(registro + _codificar(ANEXO, "a.txt", 4, b"dos\n")[:-2])
+    assert reproducir_diario(tmp_path) == 1
+    assert ruta.read_bytes() == b"uno\n"
+
+
+def test_offset_real_si_otro_proceso_hace_crecer_el_archivo(tmp_path):
+    ruta = tmp_path / "a.txt"
+    ruta.write_bytes(b"")
+    escritor, d = _nuevo_diario(tmp_path)
+    assert d.anexar(ruta, "uno\n") == 0
+    with open(ruta, "ab") as otro:
+        otro.write(b"ajeno\n")
+    offset = d.anexar(ruta, "dos\n")
+    assert ruta.read_bytes()[offset:offset + 4] == b"dos\n"
+    _caida(d, escritor)
+    assert reproducir_diario(tmp_path) == 0
+    assert ruta.read_bytes() == b"uno\najeno\ndos\n"
+
+
+def test_crear_y_anexar_respetan_el_limite_del_escritor(tmp_path):
+    escritor = EscritorAnexos(politica="flush", max_abiertos=2)
+    d = DiarioEscrituras(tmp_path, escritor, ventana=0)
+    rutas = [tmp_path / f"f{i}.txt" for i in range(5)]
+    for ruta in rutas:
+        d.crear(ruta, "cabecera\n")
+        d.anexar(ruta, "entrada\n")
+    assert len(escritor._abiertos) <= 2
+    d.cerrar()
+    escritor.cerrar()
+    assert all(r.read_text() == "cabecera\nentrada\n" for r in rutas)
+    assert rutas_diario(tmp_path) == []
+
+
+def test_otra_sesion_no_reproduce_ni_vacia_un_diario_vivo(tmp_path):
+    ruta = tmp_path / "asistencias.txt"
+    ruta.write_bytes(b"")
+    escritor_a, a = _nuevo_diario(tmp_path)
+    a.anexar(ruta, "de a\n")
+    registros_a = a.ruta.read_bytes()
+    assert registros_a
+
+    # Una segunda sesión arranca (reproduce) y hace checkpoint mientras A sigue viva
+    escritor_b, b = _nuevo_diario(tmp_path)
+    assert b.ruta != a.ruta
+    b.anexar(ruta, "de b\n")
+    b.checkpoint()
+    assert a.ruta.read_bytes() == registros_a
+    assert ruta.read_bytes() == b"de a\nde b\n"
+    b.cerrar()
+    escritor_b.cerrar()
+
+    # Al caerse A su diario queda huérfano y la siguiente reproducción no duplica nada
+    huerfano = _caida(a, escritor_a)
+    assert reproducir_diario(tmp_path) == 0
+    assert not huerfano.exists()
+    assert ruta.read_bytes() == b"de a\nde b\n"
+
+
+@pytest.mark.skipif(diario.fcntl is None, reason="Sin flock no se distinguen diarios de otros procesos")
+def test_el_candado_protege_el_diario_de_otro_proceso(tmp_path, monkeypatch):
+    ruta = tmp_path / "asistencias.txt"
+    ruta.write_bytes(b"")
+    escritor, d = _nuevo_diario(tmp_path)
+    d.anexar(ruta, "entrada\n")
+    registros = d.ruta.read_bytes()
+    # Como lo vería otro proceso: el diario no está entre sus activos, solo lo cuida el flock
+    monkeypatch.setattr(diario, "_ACTIVOS", set())
+    assert reproducir_diario(tmp_path) == 0
+    assert d.ruta.read_bytes() == registros
+    monkeypatch.undo()
+    d.cerrar()
+    escritor.cerrar()
+    assert ruta.read_bytes() == b"entrada\n"
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de fechas: `parsear_fechas` acepta exactamente lo mismo que `parsear_fecha`."""
+import pytest
+
+import fechas
+
+CASOS = [
+    "12/06/2023", "29/02/2024", "29/02/2023", "31/04/2023", "00/01/2023", "01/13/2023",
+    "12/06/20234", "12/06/202", "1/6/2023", " 12/06/2023", "12/06/2023 ", "12-06-2023",
+    "", "abc", "12/06/0000", "١٢/٠٦/٢٠٢٣", "01/01/0001", "31/12/9999",
+]
+
+
+def _esperado(raw):
+    try:
+        return fechas.parsear_fecha(raw), True
+    except ValueError:
+        return (0, 0, 0), False
+
+
+@pytest.mark.parametrize("con_numpy", [True, False])
+def test_paridad_con_el_parser_escalar(con_numpy, monkeypatch):
+    if con_numpy and fechas.np is None:
+        pytest.skip("NumPy no está instalado")
+    if not con_numpy:
+        monkeypatch.setattr(fechas, "np", None)
+    dias, meses, anios, validas = fechas.parsear_fechas(CASOS)
+    for i, raw in enumerate(CASOS):
+        tupla, valida = _esperado(raw)
+        assert (int(dias[i]), int(meses[i]), int(anios[i])) == tupla, raw
+        assert bool(validas[i]) == valida, raw
+
+
+def test_cadena_larga_no_se_trunca():
+    *_, validas = fechas.parsear_fechas(["12/06/20234", "12/06/2023"])
+    assert [bool(v) for v in validas] == [False, True]
+
+
+def test_arreglo_vacio():
+    dias, meses, anios, validas = fechas.parsear_fechas([])
+    assert len(dias) == len(meses) == len(anios) == len(validas) == 0
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del importador paralelo: nombres por ruta relativa, duplicados y cortes en cabeceras."""
+import random
+
+from importador import a_almacen, fragmentar, importar_paralelo
+from registros import AlmacenRegistros, fecha_a_ordinal, iterar_registros
+from registros import main as main_registros
+
+
+def _escribir(ruta, entradas):
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    ruta.write_text("Archivo creado por @profe\n---\n" + "".join(
+        f"[Usuario: {nick}] [Fecha: {fecha}]\n{texto}\n" for nick, fecha, texto in entradas
+    ), encoding="utf-8")
+
+
+def _importar(rutas, **kwargs):
+    filas = []
+
+    def destino(it):
+        filas.extend(it)
+        return len(filas)
+
+    resumen = importar_paralelo(rutas, destino=destino, **kwargs)
+    return resumen, filas
+
+
+def test_mismo_nombre_en_carpetas_distintas_no_choca(tmp_path):
+    rutas = [tmp_path / "2022" / "asistencias.txt", tmp_path / "2023" / "asistencias.txt"]
+    for ruta in rutas:
+        _escribir(ruta, [("@ana", "01/03/2023", "Presente")])
+    almacen = AlmacenRegistros(tmp_path / "almacen.sqlite3")
+    try:
+        resumen = importar_paralelo(rutas, procesos=1, destino=a_almacen(almacen))
+        assert resumen.nuevas == 2
+        assert sorted(r.archivo for r in almacen.por_usuario("@ana")) == [
+            "2022/asistencias.txt", "2023/asistencias.txt"]
+    finally:
+        almacen.cerrar()
+
+
+def test_cli_importar_registra_por_ruta_relativa_a_base_dir(tmp_path, capsys):
+    base = tmp_path / "files"
+    rutas = [base / "2022" / "asistencias.txt", base / "2023" / "asistencias.txt"]
+    for ruta in rutas:
+        _escribir(ruta, [("@ana", "01/03/2023", "Presente")])
+    main_registros(["--base-dir", str(base), "importar", *map(str, rutas)])
+    assert "2023/asistencias.txt: 1 registros nuevos" in capsys.readouterr().out
+    almacen = AlmacenRegistros.para_directorio(base)
+    try:
+        assert sorted(r.archivo for r in almacen.por_usuario("@ana")) == [
+            "2022/asistencias.txt", "2023/asistencias.txt"]
+    finally:
+        almacen.cerrar()
+
+
+def test_misma_entrada_en_dos_clases_se_conserva(tmp_path):
+    _escribir(tmp_path / "matematicas.txt", [("@ana", "12/06/2023", "Presente")])
+    _escribir(tmp_path / "historia.txt", [("@ana", "12/06/2023", "Presente")])
+    resumen, filas = _importar([tmp_path / "matematicas.txt", tmp_path / "historia.txt"], procesos=1)
+    assert resumen.unicas == 2
+    assert sorted(f[3] for f in filas) == ["historia.txt", "matematicas.txt"]
+
+
+def test_archivo_repetido_se_importa_una_vez(tmp_path):
+    ruta = tmp_path / "a.txt"
+    _escribir(ruta, [("@ana", "12/06/2023", "Presente"), ("@beto", "12/06/2023", "Presente")])
+    resumen, filas = _importar([ruta, tmp_path / "." / "a.txt"], procesos=1)
+    assert resumen.archivos == 1
+    assert len(filas) == 2
+
+
+def test_fragmentos_y_procesos_dan_el_mismo_resultado(tmp_path):
+    random.seed(0)
+    ruta = tmp_path / "grande.txt"
+    _escribir(ruta, [(f"@u{random.randrange(20)}", f"{random.randint(1, 28):02d}/06/2023",
+                      f"linea {random.randrange(50)}\nextra ñ") for _ in range(3000)])
+    esperado = sorted((fecha_a_ordinal(r.fecha_tuple), r.nickname, r.texto, r.archivo, r.offset)
+                      for r in iterar_registros(ruta))
+    assert len(fragmentar([ruta], tam_fragmento=4096)) > 10
+    for procesos in (1, 2):
+        _, filas = _importar([ruta], procesos=procesos, tam_fragmento=4096)
+        assert filas == esperado
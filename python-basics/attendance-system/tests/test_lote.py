@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de la carga por lotes: textos con cabeceras falsas y archivos que no se pueden escribir."""
+import pytest
+
+from lote import OperacionInvalida, aplicar_lote, validar_fila
+from registros import iterar_registros
+
+
+def _fila(**cambios):
+    fila = {"usuario": "ana", "fecha": "01/03/2023", "archivo": "asistencias.txt", "texto": "Presente"}
+    fila.update(cambios)
+    return fila
+
+
+@pytest.mark.parametrize("cambios", [
+    {"texto": "Presente\n[Usuario: @otro] [Fecha: 02/03/2023]\nFalsa"},
+    {"texto": "Presente\n[Usuario: @otro] [Fecha: 31/02/2023]"},
+    {"usuario": "ana] [Fecha: 02/03/2023]\n[Usuario: @otro"},
+])
+def test_cabecera_falsa_se_rechaza(cambios):
+    with pytest.raises(OperacionInvalida):
+        validar_fila(2, _fila(**cambios))
+
+
+def test_texto_multilinea_sin_cabeceras_se_acepta():
+    op = validar_fila(2, _fila(texto="Presente\ncon [Usuario: x] a media línea"))
+    assert op.texto == "Presente\ncon [Usuario: x] a media línea"
+
+
+def test_carpeta_con_el_nombre_del_archivo_no_detiene_el_lote(tmp_path):
+    (tmp_path / "carpeta.txt").mkdir()
+    ops = [validar_fila(2, _fila(archivo="carpeta.txt")), validar_fila(3, _fila(archivo="nuevo.txt"))]
+    errores = []
+    resumen = aplicar_lote(ops, tmp_path, crear_faltantes=True, errores=errores)
+    assert (resumen.aplicadas, resumen.rechazadas, resumen.archivos_creados) == (1, 1, 1)
+    assert errores[0].startswith("línea 2: no se pudo escribir en 'carpeta.txt'")
+    assert [r.texto for r in iterar_registros(tmp_path / "nuevo.txt")] == ["Presente"]
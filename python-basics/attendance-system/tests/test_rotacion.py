@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de la rotación: lectura a través de segmentos y candado con los escritores."""
+import threading
+import time
+
+import pytest
+
+import rotacion
+from attendance_system import EscritorAnexos
+from registros import encabezado_archivo, formatear_cabecera, iterar_registros
+from rotacion import CarpetaOcupada, iterar_registros_archivados, rotar_carpeta
+
+FECHA = (1, 3, 2023)
+
+
+def _preparar(tmp_path):
+    ruta = tmp_path / "asistencias.txt"
+    ruta.write_text(encabezado_archivo("@profe", FECHA), encoding="utf-8")
+    return ruta
+
+
+def _anexar(escritor, ruta, texto):
+    return escritor.anexar(ruta, formatear_cabecera("@ana", FECHA) + texto + "\n")
+
+
+def _textos(tmp_path, ruta):
+    archivados = [r.texto for r in iterar_registros_archivados(tmp_path, archivo=ruta.name)]
+    return archivados + [r.texto for r in iterar_registros(ruta)]
+
+
+def test_lectura_a_traves_de_la_rotacion(tmp_path):
+    ruta = _preparar(tmp_path)
+    escritor = EscritorAnexos()
+    for texto in ("uno", "dos"):
+        _anexar(escritor, ruta, texto)
+    escritor.cerrar()
+    creados = rotar_carpeta(tmp_path, max_bytes=0)
+    assert [s.entradas for s in creados] == [2]
+    escritor = EscritorAnexos()
+    _anexar(escritor, ruta, "tres")
+    escritor.cerrar()
+    assert _textos(tmp_path, ruta) == ["uno", "dos", "tres"]
+
+
+@pytest.mark.skipif(rotacion.fcntl is None, reason="Sin flock no hay candado entre procesos")
+def test_rotacion_rechazada_con_escritor_activo(tmp_path):
+    ruta = _preparar(tmp_path)
+    escritor = EscritorAnexos()
+    _anexar(escritor, ruta, "uno")
+    with pytest.raises(CarpetaOcupada):
+        rotar_carpeta(tmp_path, max_bytes=0)
+    escritor.cerrar()
+    assert len(rotar_carpeta(tmp_path, max_bytes=0)) == 1
+
+
+@pytest.mark.skipif(rotacion.fcntl is None, reason="Sin flock no hay candado entre procesos")
+def test_anexo_durante_la_rotacion_no_se_pierde(tmp_path, monkeypatch):
+    ruta = _preparar(tmp_path)
+    escritor = EscritorAnexos()
+    _anexar(escritor, ruta, "uno")
+    escritor.cerrar()
+    original = rotacion.rotar_archivo
+    concurrente = EscritorAnexos()
+    hilo = threading.Thread(target=_anexar, args=(concurrente, ruta, "durante"))
+
+    def rotar_con_anexo(*args, **kwargs):
+        hilo.start()
+        time.sleep(0.2)
+        assert hilo.is_alive()  # El escritor espera el candado compartido
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(rotacion, "rotar_archivo", rotar_con_anexo)
+    rotar_carpeta(tmp_path, max_bytes=0)
+    hilo.join(timeout=5)
+    concurrente.cerrar()
+    assert _textos(tmp_path, ruta) == ["uno", "durante"]
+    assert [r.texto for r in iterar_registros(ruta)] == ["durante"]
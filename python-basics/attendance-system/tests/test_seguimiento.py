@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del seguimiento: solo líneas completas, por bloques acotados y desde el último offset."""
+import os
+
+import seguimiento
+from seguimiento import SeguidorArchivos
+
+
+def test_entrega_solo_lineas_completas(tmp_path):
+    ruta = tmp_path / "asistencias.txt"
+    ruta.write_bytes(b"uno\ndos\ntr")
+    seguidor = SeguidorArchivos()
+    assert list(seguidor.nuevas_lineas(ruta, tam_bloque=3)) == ["uno", "dos"]
+    with open(ruta, "ab") as f:
+        f.write("és\r\ncuatro\n".encode("utf-8"))
+    assert list(seguidor.nuevas_lineas(ruta, tam_bloque=3)) == ["trés", "cuatro"]
+    assert list(seguidor.nuevas_lineas(ruta)) == []
+
+
+def test_lee_por_bloques_acotados(tmp_path, monkeypatch):
+    ruta = tmp_path / "asistencias.txt"
+    ruta.write_bytes(b"".join(b"linea %05d\n" % i for i in range(5000)))
+    leidos = []
+    original = open
+
+    class Archivo:
+        def __init__(self, f):
+            self._f = f
+
+        def __getattr__(self, nombre):
+            return getattr(self._f, nombre)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self._f.close()
+
+        def read(self, n=-1):
+            leidos.append(n)
+            return self._f.read(n)
+
+    monkeypatch.setattr(seguimiento, "open", lambda *a, **k: Archivo(original(*a, **k)), raising=False)
+    lineas = list(SeguidorArchivos().nuevas_lineas(ruta, tam_bloque=4096))
+    assert len(lineas) == 5000 and lineas[-1] == "linea 04999"
+    assert leidos and max(leidos) <= 4096
+
+
+def test_linea_enorme_sin_salto_se_entrega_en_trozos(tmp_path, monkeypatch):
+    monkeypatch.setattr(seguimiento, "MAX_LINEA", 100)
+    ruta = tmp_path / "asistencias.txt"
+    ruta.write_bytes(b"x" * 250)
+    seguidor = SeguidorArchivos()
+    trozos = list(seguidor.nuevas_lineas(ruta, tam_bloque=64))
+    assert "".join(trozos) == "x" * (len("".join(trozos)))
+    assert all(len(t) < 100 + 64 for t in trozos)
+    assert seguidor.posicion(ruta) == sum(len(t) for t in trozos)
+
+
+def test_linea_enorme_no_parte_caracteres_utf8(tmp_path, monkeypatch):
+    monkeypatch.setattr(seguimiento, "MAX_LINEA", 101)
+    ruta = tmp_path / "asistencias.txt"
+    texto = "x" + "é" * 150 + "€" * 50
+    ruta.write_bytes(texto.encode("utf-8"))
+    seguidor = SeguidorArchivos()
+    trozos = list(seguidor.nuevas_lineas(ruta, tam_bloque=33))
+    assert len(trozos) > 1 and "\ufffd" not in "".join(trozos)
+    assert "".join(trozos) == texto[:len("".join(trozos))]
+    assert seguidor.posicion(ruta) == len("".join(trozos).encode("utf-8"))
+
+
+def test_archivo_reemplazado_se_relee_desde_el_inicio(tmp_path):
+    ruta = tmp_path / "asistencias.txt"
+    ruta.write_bytes(b"viejo\n")
+    seguidor = SeguidorArchivos()
+    assert list(seguidor.nuevas_lineas(ruta)) == ["viejo"]
+    nuevo = tmp_path / "nuevo.tmp"
+    nuevo.write_bytes(b"nuevo\n")
+    os.replace(nuevo, ruta)
+    assert list(seguidor.nuevas_lineas(ruta)) == ["nuevo"]
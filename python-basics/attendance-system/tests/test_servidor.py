@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del servidor: validación de parámetros de lectura y un hilo escritor que no muere."""
+import http.client
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from servidor import MAX_CUERPO, MAX_LECTURA, ServidorAsistencia
+
+
+@pytest.fixture
+def servidor(tmp_path):
+    srv = ServidorAsistencia(("127.0.0.1", 0), tmp_path / "files")
+    hilo = threading.Thread(target=srv.serve_forever, daemon=True)
+    hilo.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _pedir(srv, metodo, ruta, datos=None):
+    conexion = http.client.HTTPConnection(*srv.server_address, timeout=10)
+    try:
+        cuerpo = None if datos is None else json.dumps(datos)
+        conexion.request(metodo, ruta, body=cuerpo, headers={"Content-Type": "application/json"})
+        respuesta = conexion.getresponse()
+        return respuesta.status, json.loads(respuesta.read())
+    finally:
+        conexion.close()
+
+
+def _anexar(srv, texto):
+    return _pedir(srv, "POST", "/archivos/asistencias.txt",
+                  {"usuario": "ana", "fecha": "01/03/2023", "texto": texto})
+
+
+@pytest.mark.parametrize("consulta", [
+    "max=-1", "max=0", f"max={MAX_LECTURA + 1}", "desde=-1", "desde=x",
+])
+def test_parametros_fuera_de_rango_son_400(servidor, consulta):
+    estado, datos = _pedir(servidor, "GET", f"/archivos/asistencias.txt?{consulta}")
+    assert estado == 400
+    assert "error" in datos
+
+
+def test_lectura_valida_respeta_max(servidor):
+    estado, datos = _pedir(servidor, "GET", "/archivos/asistencias.txt?desde=2&max=5")
+    assert estado == 200
+    assert (datos["desde"], datos["hasta"]) == (2, 7)
+    assert len(datos["texto"]) == 5
+
+
+@pytest.mark.parametrize("largo, estado", [
+    ("-1", 400), ("abc", 400), ("1_0", 400), (str(MAX_CUERPO + 1), 413),
+])
+def test_content_length_invalido_o_excesivo(servidor, largo, estado):
+    conexion = http.client.HTTPConnection(*servidor.server_address, timeout=10)
+    try:
+        conexion.putrequest("POST", "/archivos/asistencias.txt")
+        conexion.putheader("Content-Length", largo)
+        conexion.endheaders()
+        respuesta = conexion.getresponse()
+        assert respuesta.status == estado
+        assert "error" in json.loads(respuesta.read())
+    finally:
+        conexion.close()
+
+
+def test_carpeta_en_lugar_de_archivo_es_404(servidor):
+    (servidor.base_dir / "subcarpeta").mkdir()
+    estado, _ = _pedir(servidor, "GET", "/archivos/subcarpeta")
+    assert estado == 404
+
+
+def test_error_del_almacen_no_detiene_al_escritor(servidor, monkeypatch):
+    def fallar(registros):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(servidor.almacen, "agregar_muchos", fallar)
+    primero = _anexar(servidor, "Presente")
+    segundo = _anexar(servidor, "Tarde")
+    assert primero[0] == segundo[0] == 201
+    assert segundo[1]["offset"] > primero[1]["offset"]
+    texto = (servidor.base_dir / "asistencias.txt").read_text(encoding="utf-8")
+    assert "Presente" in texto and "Tarde" in texto
+
+
+def test_error_inesperado_llega_a_la_peticion_y_el_escritor_sigue(servidor, monkeypatch):
+    escritor = servidor.cola._escritor
+    original = escritor.anexar
+    fallas = iter([RuntimeError("falla inesperada")])
+
+    def anexar(ruta, texto):
+        error = next(fallas, None)
+        if error is not None:
+            raise error
+        return original(ruta, texto)
+
+    monkeypatch.setattr(escritor, "anexar", anexar)
+    estado, _ = _anexar(servidor, "Perdida")
+    assert estado == 500
+    assert _anexar(servidor, "Presente")[0] == 201
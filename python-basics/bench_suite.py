@@ -0,0 +1,486 @@
+# -*- coding: utf-8 -*-
+"""
+Suite de benchmarks de python-basics
+Autor: Alexis Ayala
+Descripción:
+  - Mide con datos sintéticos (sin entrada interactiva) las funciones de los tres proyectos:
+      pitagoras-table           -> construir_tabla(_arreglo), mostrar_tabla, producto(s)
+      tuples-dicts-exceptions   -> sumar_tupla, buscar_contacto (y DirectorioContactos), contar_palabras
+      attendance-system         -> anexar, leer por páginas, listar archivos, recorrer registros
+  - Cada caso se repite para varios tamaños (n de la tabla, cantidad de contactos, largo del
+    texto, tamaño del archivo) y reporta el mejor tiempo por llamada de varias repeticiones.
+  - Los resultados se guardan en JSON y se comparan contra una línea base guardada: un caso
+    más lento que la base por encima de la tolerancia se marca como regresión (código de salida 1).
+Uso:
+  python bench_suite.py                              -> corre todo y compara con la línea base
+  python bench_suite.py --filtro pitagoras --rapido  -> solo los casos que contienen 'pitagoras'
+  python bench_suite.py --guardar resultados.json    -> guarda los resultados de esta corrida
+  python bench_suite.py --actualizar-base            -> guarda esta corrida como nueva línea base
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import timeit
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+RAIZ = Path(__file__).resolve().parent
+# Las carpetas de los proyectos no son paquetes (tienen guiones): se agregan al path
+for carpeta in ("pitagoras-table", "tuples-dicts-exceptions", "attendance-system"):
+    sys.path.insert(0, str(RAIZ / carpeta))
+
+import pitagoras_table as pt  # noqa: E402
+import tuples_dicts_exceptions_strings as tde  # noqa: E402
+from attendance_system import CACHE_DIRECTORIO, EscritorAnexos, LectorPaginado, listar_archivos  # noqa: E402
+from registros import iterar_registros  # noqa: E402
+
+LINEA_BASE = RAIZ / "bench_baseline.json"
+TOLERANCIA = 0.25  # 25 % más lento que la base se considera regresión
+
+# preparar(tamaño, pila) -> función sin argumentos que se mide.
+# `pila` (ExitStack) cierra temporales y archivos al terminar el caso.
+Preparador = Callable[[int, contextlib.ExitStack], Callable[[], object]]
+
+
+@dataclass
+class Caso:
+    grupo: str
+    nombre: str
+    parametro: str
+    tamanos: Sequence[int]
+    tamanos_rapidos: Sequence[int]
+    preparar: Preparador
+    unidad: str = ""                                   # p. ej. "celdas" para reportar celdas/s
+    unidades: Optional[Callable[[int], int]] = None    # unidades procesadas por llamada
+
+    def clave(self, tamano: int) -> str:
+        return f"{self.grupo}.{self.nombre}[{self.parametro}={tamano}]"
+
+
+CASOS: List[Caso] = []
+
+
+def caso(grupo: str, nombre: str, parametro: str, tamanos: Sequence[int],
+         tamanos_rapidos: Optional[Sequence[int]] = None, unidad: str = "",
+         unidades: Optional[Callable[[int], int]] = None):
+    """Decorador que registra un preparador en CASOS."""
+    def registrar(preparar: Preparador) -> Preparador:
+        CASOS.append(Caso(grupo, nombre, parametro, tuple(tamanos),
+                          tuple(tamanos_rapidos or tamanos[:1]), preparar, unidad, unidades))
+        return preparar
+    return registrar
+
+
+def _linea_asistencia(i: int) -> str:
+    """Entrada con el mismo formato que escribe escribir_archivo."""
+    return f"[Usuario: @alumno_{i % 2000}] [Fecha: {i % 28 + 1:02d}/06/2023]\nPresente en clase {i}\n"
+
+
+def _archivo_asistencias(carpeta: Path, tamano_kb: int) -> Path:
+    ruta = carpeta / f"asistencias_{tamano_kb}kb.txt"
+    bloque = "".join(_linea_asistencia(i) for i in range(2_000))
+    with open(ruta, "w", encoding="utf-8") as f:
+        while f.tell() < tamano_kb * 1024:
+            f.write(bloque)
+    return ruta
+
+
+def _temporal(pila: contextlib.ExitStack) -> Path:
+    return Path(pila.enter_context(tempfile.TemporaryDirectory()))
+
+
+# --------------------------
+# Sección: pitagoras-table
+# --------------------------
+@caso("pitagoras", "construir_tabla", "n", (10, 100, 1_000), (10, 100))
+def _construir_tabla(n, pila):
+    return lambda: pt.construir_tabla(n)
+
+
+@caso("pitagoras", "construir_tabla_arreglo", "n", (10, 100, 1_000, 10_000), (10, 100))
+def _construir_tabla_arreglo(n, pila):
+    return lambda: pt.construir_tabla_arreglo(n)
+
+
+def _celdas(n: int) -> int:
+    return n * n
+
+
+@caso("pitagoras", "mostrar_tabla", "n", (10, 100, 500), (10, 100), "celdas", _celdas)
+def _mostrar_tabla(n, pila):
+    tabla = pt.construir_tabla(n)
+    destino = pila.enter_context(open(os.devnull, "w", encoding="utf-8"))
+
+    def correr():
+        with contextlib.redirect_stdout(destino):
+            pt.mostrar_tabla(tabla)
+    return correr
+
+
+@caso("pitagoras", "mostrar_por_celda", "n", (10, 100, 500), (10, 100), "celdas", _celdas)
+def _mostrar_por_celda(n, pila):
+    """Referencia: el mostrar_tabla original, con un print por celda."""
+    tabla = pt.construir_tabla(n)
+    destino = pila.enter_context(open(os.devnull, "w", encoding="utf-8"))
+    ancho = len(str(n * n))
+
+    def correr():
+        with contextlib.redirect_stdout(destino):
+            print(" " * (ancho + 2), end="")
+            for j in range(1, n + 1):
+                print(f"{j:>{ancho+1}}", end=" ")
+            print()
+            for i, fila in enumerate(tabla, start=1):
+                print(f"{i:>{ancho}} ", end="")
+                for valor in fila:
+                    print(f"{valor:>{ancho+1}}", end=" ")
+                print()
+    return correr
+
+
+@caso("pitagoras", "guardar_tabla_virtual", "n", (500, 2_000), (500,), "celdas", _celdas)
+def _guardar_tabla_virtual(n, pila):
+    tabla = pt.TablaVirtual(n)
+    ruta = _temporal(pila) / "tabla.txt"
+    return lambda: pt.guardar_tabla(tabla, ruta)
+
+
+@caso("pitagoras", "producto_10k_consultas", "n", (10, 1_000), (10,))
+def _producto(n, pila):
+    tabla = pt.construir_tabla(n)
+    rnd = random.Random(0)
+    consultas = [(rnd.randint(1, n), rnd.randint(1, n)) for _ in range(10_000)]
+
+    def correr():
+        for a, b in consultas:
+            pt.producto(tabla, a, b)
+    return correr
+
+
+@caso("pitagoras", "productos_1m_consultas", "n", (10, 1_000), (10,))
+def _productos(n, pila):
+    tabla = pt.construir_tabla_arreglo(n)
+    rnd = random.Random(0)
+    a = [rnd.randint(1, n) for _ in range(1_000_000)]
+    b = [rnd.randint(1, n) for _ in range(1_000_000)]
+    if pt.np is not None:  # las consultas masivas llegan ya como arreglos
+        a, b = pt.np.asarray(a), pt.np.asarray(b)
+    return lambda: pt.productos(tabla, a, b)
+
+
+# --------------------------
+# Sección: tuples-dicts-exceptions
+# --------------------------
+@caso("tuplas", "sumar_tupla", "elementos", (10, 1_000, 100_000), (10, 1_000))
+def _sumar_tupla(n, pila):
+    numeros = tuple(float(i) if i % 2 else i for i in range(n))
+    return lambda: tde.sumar_tupla(numeros)
+
+
+@caso("tuplas", "sumar_arreglo", "elementos", (1_000, 1_000_000), (1_000,))
+def _sumar_arreglo(n, pila):
+    """sumar_tupla sobre un búfer (NumPy si está instalado, si no array.array) sin copiarlo."""
+    rnd = random.Random(0)
+    numeros = array("d", (rnd.random() for _ in range(n)))
+    if tde.np is not None:
+        numeros = tde.np.frombuffer(numeros, dtype=tde.np.float64)
+    return lambda: tde.sumar_tupla(numeros)
+
+
+@caso("tuplas", "sumar_tupla_preciso", "elementos", (1_000, 1_000_000), (1_000,))
+def _sumar_tupla_preciso(n, pila):
+    rnd = random.Random(0)
+    numeros = tuple(rnd.random() for _ in range(n))
+    return lambda: tde.sumar_tupla(numeros, preciso=True)
+
+
+@caso("tuplas", "buscar_contacto", "contactos", (10, 1_000, 100_000), (10, 1_000))
+def _buscar_contacto(n, pila):
+    contactos = {f"Contacto{i:06d}": f"55-{i:04d}-0000" for i in range(n)}
+    # Peor caso para la búsqueda lineal: el último nombre, escrito con otras mayúsculas
+    buscado = f"CONTACTO{n - 1:06d}"
+    return lambda: tde.buscar_contacto(contactos, buscado)
+
+
+@caso("tuplas", "directorio_buscar", "contactos", (10, 1_000, 100_000, 500_000), (10, 1_000))
+def _directorio_buscar(n, pila):
+    directorio = tde.DirectorioContactos({f"Contacto{i:06d}": f"55-{i:04d}-0000" for i in range(n)})
+    buscado = f"CONTACTO{n - 1:06d}"
+    return lambda: tde.buscar_contacto(directorio, buscado)
+
+
+@caso("tuplas", "directorio_prefijo", "contactos", (1_000, 500_000), (1_000,))
+def _directorio_prefijo(n, pila):
+    directorio = tde.DirectorioContactos({f"Contacto{i:06d}": f"55-{i:04d}-0000" for i in range(n)})
+    directorio.buscar_prefijo("")  # ordena las claves antes de medir
+    return lambda: directorio.buscar_prefijo("contacto0001", limite=10)
+
+
+def _nombres_sinteticos(n: int, rnd: random.Random) -> List[str]:
+    """Nombres con distribución parecida a la real: pocos nombres de pila muy repetidos."""
+    pila = ["Ana", "María", "José", "Juan", "Luis", "Carlos", "Sofía", "Lucía", "Diego", "Camila"]
+    apellidos = ["García", "Hernández", "López", "Martínez", "Pérez", "Sánchez", "Ramírez", "Cruz"]
+    apellidos += ["".join(rnd.choice("bcdfglmnprstv") + rnd.choice("aeiou") for _ in range(3)).title()
+                  for _ in range(3_000)]
+    nombres = set()
+    while len(nombres) < n:
+        nombres.add(f"{rnd.choice(pila)} {rnd.choice(apellidos)} {rnd.choice(apellidos)}")
+    return sorted(nombres)
+
+
+@caso("tuplas", "directorio_aproximado", "contactos", (1_000, 100_000, 500_000), (1_000,))
+def _directorio_aproximado(n, pila):
+    rnd = random.Random(0)
+    nombres = _nombres_sinteticos(n, rnd)
+    directorio = tde.DirectorioContactos({nombre: str(i) for i, nombre in enumerate(nombres)})
+    directorio.buscar_aproximado("x")  # construye el índice de trigramas antes de medir
+    consultas = []
+    for _ in range(500):  # un error de dedo por consulta
+        letras = list(rnd.choice(nombres))
+        letras[rnd.randrange(len(letras))] = rnd.choice("abcdefgh")
+        consultas.append("".join(letras))
+    siguiente = itertools.cycle(consultas).__next__
+    return lambda: directorio.buscar_aproximado(siguiente())
+
+
+def _pares_division(n: int):
+    """Dividendos y divisores enteros con ~1 % de divisores en cero."""
+    rnd = random.Random(0)
+    return ([rnd.randint(-1_000, 1_000) for _ in range(n)],
+            [0 if rnd.random() < 0.01 else rnd.randint(1, 1_000) for _ in range(n)])
+
+
+@caso("tuplas", "dividir_bucle", "filas", (1_000, 1_000_000), (1_000,), "filas", lambda n: n)
+def _dividir_bucle(n, pila):
+    """Referencia: dividir fila por fila con try/except (NaN en los ceros)."""
+    a, b = _pares_division(n)
+
+    def correr():
+        resultados = []
+        for x, y in zip(a, b):
+            try:
+                resultados.append(tde.dividir(x, y))
+            except tde.DivisionEntreCeroError:
+                resultados.append(math.nan)
+        return resultados
+    return correr
+
+
+@caso("tuplas", "dividir_lote", "filas", (1_000, 1_000_000), (1_000,), "filas", lambda n: n)
+def _dividir_lote(n, pila):
+    a, b = _pares_division(n)
+    if tde.np is not None:  # los datos por lotes normalmente ya vienen como arreglos
+        a, b = tde.np.asarray(a), tde.np.asarray(b)
+    return lambda: tde.dividir_lote(a, b, politica="nan")
+
+
+@caso("tuplas", "contar_palabras", "caracteres", (1_000, 100_000, 10_000_000), (1_000, 100_000))
+def _contar_palabras(n, pila):
+    base = "La programación en Python es divertida y poderosa.\n"
+    texto = (base * (n // len(base) + 1))[:n]
+    return lambda: tde.contar_palabras(texto)
+
+
+@caso("tuplas", "estadisticas_archivo", "caracteres", (100_000, 10_000_000), (100_000,))
+def _estadisticas_archivo(n, pila):
+    base = "La programación en Python es divertida y poderosa.\n"
+    ruta = _temporal(pila) / "texto.txt"
+    ruta.write_text((base * (n // len(base) + 1))[:n], encoding="utf-8")
+    return lambda: tde.estadisticas_archivo(str(ruta))
+
+
+# --------------------------
+# Sección: attendance-system
+# --------------------------
+@caso("asistencia", "anexar", "kb", (1_024, 32_768), (1_024,))
+def _anexar(kb, pila):
+    ruta = _archivo_asistencias(_temporal(pila), kb)
+    escritor = EscritorAnexos(politica="flush")
+    pila.callback(escritor.cerrar)
+    texto = _linea_asistencia(7)
+    return lambda: escritor.anexar(ruta, texto)
+
+
+@caso("asistencia", "leer_pagina", "kb", (1_024, 32_768), (1_024,))
+def _leer_pagina(kb, pila):
+    ruta = _archivo_asistencias(_temporal(pila), kb)
+
+    def correr():
+        LectorPaginado(ruta).pagina()
+    return correr
+
+
+@caso("asistencia", "saltar_a_mitad", "kb", (1_024, 32_768), (1_024,))
+def _saltar_a_mitad(kb, pila):
+    ruta = _archivo_asistencias(_temporal(pila), kb)
+    with open(ruta, "rb") as f:
+        mitad = sum(bloque.count(b"\n") for bloque in iter(lambda: f.read(1 << 20), b"")) // 2
+
+    def correr():
+        lector = LectorPaginado(ruta)
+        lector.saltar_a_linea(mitad)
+        lector.pagina()
+    return correr
+
+
+@caso("asistencia", "ultimas_lineas", "kb", (1_024, 32_768), (1_024,))
+def _ultimas_lineas(kb, pila):
+    ruta = _archivo_asistencias(_temporal(pila), kb)
+    return lambda: LectorPaginado(ruta).ultimas_lineas(50)
+
+
+@caso("asistencia", "recorrer_registros", "kb", (1_024, 16_384), (1_024,))
+def _recorrer_registros(kb, pila):
+    ruta = _archivo_asistencias(_temporal(pila), kb)
+
+    def correr():
+        for _ in iterar_registros(ruta):
+            pass
+    return correr
+
+
+@caso("asistencia", "listar_archivos", "archivos", (100, 10_000), (100,))
+def _listar_archivos(n, pila):
+    base_dir = _temporal(pila)
+    for i in range(n):
+        (base_dir / f"clase_{i:05d}.txt").touch()
+    pila.callback(CACHE_DIRECTORIO.invalidar, base_dir)
+    return lambda: listar_archivos(base_dir, usar_cache=False)
+
+
+@caso("asistencia", "listar_archivos_cache", "archivos", (100, 10_000), (100,))
+def _listar_archivos_cache(n, pila):
+    base_dir = _temporal(pila)
+    for i in range(n):
+        (base_dir / f"clase_{i:05d}.txt").touch()
+    pila.callback(CACHE_DIRECTORIO.invalidar, base_dir)
+    return lambda: listar_archivos(base_dir)
+
+
+# --------------------------
+# Medición y comparación
+# --------------------------
+def medir(funcion: Callable[[], object], min_segundos: float, repeticiones: int) -> float:
+    """Mejor tiempo por llamada: calibra el número de ciclos y toma el mínimo de varias corridas."""
+    temporizador = timeit.Timer(funcion)
+    ciclos = 1
+    while True:
+        tiempo = temporizador.timeit(ciclos)
+        if tiempo >= min_segundos or ciclos >= 1 << 20:
+            break
+        ciclos = max(ciclos * 2, int(ciclos * min_segundos / max(tiempo, 1e-9) * 1.1))
+    mejor = tiempo / ciclos
+    for _ in range(repeticiones - 1):
+        mejor = min(mejor, temporizador.timeit(ciclos) / ciclos)
+    return mejor
+
+
+def correr_casos(filtro: str = "", rapido: bool = False) -> Dict[str, float]:
+    min_segundos, repeticiones = (0.05, 3) if rapido else (0.2, 5)
+    resultados: Dict[str, float] = {}
+    for c in CASOS:
+        for tamano in (c.tamanos_rapidos if rapido else c.tamanos):
+            clave = c.clave(tamano)
+            if filtro not in clave:
+                continue
+            with contextlib.ExitStack() as pila:
+                funcion = c.preparar(tamano, pila)
+                resultados[clave] = medir(funcion, min_segundos, repeticiones)
+            tasa = ""
+            if c.unidades is not None:
+                tasa = f"  {c.unidades(tamano) / resultados[clave] / 1e6:>8.2f} M{c.unidad}/s"
+            print(f"{clave:<52} {_formatear(resultados[clave]):>12}{tasa}")
+    return resultados
+
+
+def _formatear(segundos: float) -> str:
+    for unidad, factor in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if segundos * factor >= 1:
+            return f"{segundos * factor:.2f} {unidad}"
+    return f"{segundos * 1e9:.0f} ns"
+
+
+def documento(resultados: Dict[str, float]) -> dict:
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "segundos_por_llamada": resultados,
+    }
+
+
+def comparar(resultados: Dict[str, float], base: Dict[str, float], tolerancia: float) -> List[str]:
+    """Imprime la comparación contra la base y regresa las claves con regresión."""
+    regresiones = []
+    print(f"\n{'Caso':<52} {'base':>12} {'actual':>12} {'cambio':>8}")
+    for clave, actual in resultados.items():
+        anterior = base.get(clave)
+        if anterior is None:
+            print(f"{clave:<52} {'-':>12} {_formatear(actual):>12} {'nuevo':>8}")
+            continue
+        razon = actual / anterior
+        marca = ""
+        if razon > 1 + tolerancia:
+            marca = "  REGRESIÓN"
+            regresiones.append(clave)
+        elif razon < 1 - tolerancia:
+            marca = "  mejora"
+        print(f"{clave:<52} {_formatear(anterior):>12} {_formatear(actual):>12} {razon - 1:>+8.0%}{marca}")
+    return regresiones
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de los proyectos de python-basics.")
+    parser.add_argument("--filtro", default="", help="Solo casos cuya clave contenga este texto")
+    parser.add_argument("--rapido", action="store_true", help="Tamaños chicos y menos repeticiones")
+    parser.add_argument("--guardar", type=Path, help="Guarda los resultados en este JSON")
+    parser.add_argument("--base", type=Path, default=LINEA_BASE,
+                        help=f"Línea base para comparar (por defecto {LINEA_BASE.name})")
+    parser.add_argument("--actualizar-base", action="store_true",
+                        help="Guarda esta corrida como la nueva línea base")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA,
+                        help="Fracción de lentitud tolerada antes de marcar regresión (0.25 = 25 %%)")
+    args = parser.parse_args(argv)
+
+    resultados = correr_casos(args.filtro, args.rapido)
+    if not resultados:
+        print(f"[Aviso] Ningún caso coincide con '{args.filtro}'.")
+        return 0
+    if args.guardar:
+        args.guardar.write_text(json.dumps(documento(resultados), indent=2), encoding="utf-8")
+        print(f"Resultados guardados en '{args.guardar}'.")
+
+    regresiones: List[str] = []
+    if args.base.exists():
+        base = json.loads(args.base.read_text(encoding="utf-8"))["segundos_por_llamada"]
+        regresiones = comparar(resultados, base, args.tolerancia)
+    else:
+        print(f"[Aviso] No hay línea base en '{args.base}'. Usa --actualizar-base para crearla.")
+
+    if args.actualizar_base:
+        anterior = (json.loads(args.base.read_text(encoding="utf-8"))["segundos_por_llamada"]
+                    if args.base.exists() else {})
+        # Se conservan los casos que esta corrida no midió (p. ej. con --filtro)
+        anterior.update(resultados)
+        args.base.write_text(json.dumps(documento(anterior), indent=2), encoding="utf-8")
+        print(f"Línea base actualizada en '{args.base}'.")
+    if regresiones:
+        print(f"\n{len(regresiones)} regresión(es) por encima de {args.tolerancia:.0%}.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,22 @@
 # Tabla de Pitágoras 1..10 usando listas de listas
 # - mostrar_tabla: solo imprime (no regresa valor)
 # - producto: regresa el valor desde la matriz (sin usar '*')
+# - construir_tabla_arreglo / productos: versión en arreglo (NumPy o array('q')) para tablas
+#   grandes y consultas masivas; construir_tabla queda como implementación de referencia
+# - TablaVirtual: tabla perezosa que calcula filas bajo demanda (caché LRU), sin reservar n×n
+# - renderizar_tabla: escribe la tabla por bloques de filas (una escritura por bloque), con
+#   ventana opcional de filas/columnas y salida a archivo (guardar_tabla)
+
+import argparse
+import numbers
+import sys
+from array import array
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
 
 def construir_tabla(n=10):
     """Crea la tabla de Pitágoras como lista de listas sin usar '*'."""
@@ -14,26 +30,143 @@ def construir_tabla(n=10):
         matriz.append(fila)
     return matriz
 
-def mostrar_tabla(matriz):
-    """Imprime la tabla alineada, sin corchetes ni comas."""
+def construir_tabla_arreglo(n=10):
+    """
+    Misma tabla en memoria contigua, también por sumas sucesivas (sin '*').
+    Con NumPy regresa un ndarray n×n (int32 si alcanza, si no int64): la suma acumulada por fila
+    se hace en C. Sin NumPy regresa una lista de filas array('q') (8 bytes por celda).
+    """
+    if np is not None:
+        tipo = np.int32 if n * n < 2 ** 31 else np.int64
+        columna = np.arange(1, n + 1, dtype=tipo)[:, None]
+        # Cada fila i es la suma acumulada de i repetido n veces: i, 2i, 3i, ...
+        return np.cumsum(np.broadcast_to(columna, (n, n)), axis=1, dtype=tipo)
+    matriz = []
+    for i in range(1, n + 1):
+        fila = array("q", bytes(8 * n))  # n ceros de 8 bytes
+        acumulado = 0
+        for j in range(n):
+            acumulado += i
+            fila[j] = acumulado
+        matriz.append(fila)
+    return matriz
+
+class TablaVirtual:
+    """
+    Tabla de Pitágoras que nunca materializa la matriz completa.
+    Se comporta como la lista de listas para mostrar_tabla y producto (len, tabla[i], iterar
+    filas), pero cada fila se calcula al pedirla (sumas sucesivas, en un array('q')) y solo se
+    guardan las `max_filas` usadas más recientemente: la memoria es O(n), no O(n²).
+    """
+
+    def __init__(self, n=10, max_filas=64):
+        self.n = n
+        self.max_filas = max_filas
+        self._filas = OrderedDict()  # {índice: fila} en orden de uso (LRU)
+
+    def __len__(self):
+        return self.n
+
+    def _calcular_fila(self, i):
+        fila = array("q", bytes(8 * self.n))  # 8 bytes por celda en lugar de un int de Python
+        acumulado = 0
+        for j in range(self.n):
+            acumulado += i + 1   # la fila i (0-indexada) es la del factor i + 1
+            fila[j] = acumulado
+        return fila
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.n:
+            raise IndexError("Fila fuera de la tabla.")
+        fila = self._filas.get(i)
+        if fila is None:
+            fila = self._filas[i] = self._calcular_fila(i)
+            if len(self._filas) > self.max_filas:
+                self._filas.popitem(last=False)  # descarta la fila usada hace más tiempo
+        else:
+            self._filas.move_to_end(i)
+        return fila
+
+    def __iter__(self):
+        # Recorrido completo: las filas se generan al vuelo sin llenar (ni vaciar) la caché
+        for i in range(self.n):
+            fila = self._filas.get(i)
+            yield fila if fila is not None else self._calcular_fila(i)
+
+def renderizar_tabla(matriz, salida=None, filas=None, columnas=None, filas_por_bloque=64):
+    """
+    Escribe la tabla alineada en `salida` (por defecto sys.stdout).
+    - Cada fila se arma en una sola cadena y se escribe un bloque de `filas_por_bloque`
+      filas con una sola llamada a write (en lugar de un print por celda).
+    - `filas` y `columnas` son rangos (desde, hasta) 1-indexados e incluidos para ver solo
+      una ventana de tablas enormes; el ancho de celda es el de la tabla completa.
+    """
+    salida = sys.stdout if salida is None else salida
     n = len(matriz)
     ancho = len(str(n * n))  # ancho para alinear (p. ej. 100 -> 3)
+    f0, f1 = filas or (1, n)
+    c0, c1 = columnas or (1, n)
+    f0, c0 = max(f0, 1), max(c0, 1)
+    f1, c1 = min(f1, n), min(c1, n)
+    celdas = max(c1 - c0 + 1, 0)
+    formato = f"%{ancho + 1}d " * celdas  # plantilla de una fila completa de la ventana
     # Encabezado
-    print(" " * (ancho + 2), end="")
-    for j in range(1, n + 1):
-        print(f"{j:>{ancho+1}}", end=" ")
-    print()
-    # Filas con etiqueta lateral
-    for i, fila in enumerate(matriz, start=1):
-        print(f"{i:>{ancho}} ", end="")
-        for valor in fila:
-            print(f"{valor:>{ancho+1}}", end=" ")
-        print()
+    salida.write(" " * (ancho + 2) + formato % tuple(range(c0, c1 + 1)) + "\n")
+    # Filas con etiqueta lateral, acumuladas por bloques
+    bloque = []
+    for i in range(f0, f1 + 1):
+        fila = matriz[i - 1][c0 - 1:c1]
+        valores = tuple(fila.tolist()) if hasattr(fila, "tolist") else tuple(fila)
+        bloque.append(f"{i:>{ancho}} " + formato % valores + "\n")
+        if len(bloque) >= filas_por_bloque:
+            salida.write("".join(bloque))
+            bloque.clear()
+    if bloque:
+        salida.write("".join(bloque))
+
+def guardar_tabla(matriz, ruta, filas=None, columnas=None):
+    """Escribe la tabla (o una ventana) en un archivo, fila por fila, sin armarla en memoria."""
+    with open(ruta, "w", encoding="utf-8", buffering=1024 * 1024) as f:
+        renderizar_tabla(matriz, f, filas, columnas)
+
+def mostrar_tabla(matriz):
+    """Imprime la tabla alineada, sin corchetes ni comas."""
+    renderizar_tabla(matriz)
 
 def producto(matriz, a, b):
     """Devuelve el 'producto' consultando la matriz (1-indexado)."""
     return matriz[a - 1][b - 1]
 
+def productos(tabla, a, b):
+    """
+    Consulta masiva: regresa el 'producto' de cada par (a[k], b[k]) en una sola llamada.
+    Con una tabla NumPy y NumPy disponible se resuelve con indexado vectorizado (arreglo);
+    en otro caso regresa una lista. Lanza ValueError si algún factor no es entero o está fuera
+    de 1..n, o si `a` y `b` no tienen la misma cantidad de factores (en ambos caminos).
+    """
+    n = len(tabla)
+    if np is not None and isinstance(tabla, np.ndarray):
+        a, b = np.asarray(a), np.asarray(b)
+        # Se revisa antes de convertir: astype truncaría 2.7 a 2 sin avisar
+        if any(f.size and f.dtype.kind not in "iu" for f in (a, b)):
+            raise ValueError("Los factores deben ser enteros.")
+        a, b = a.astype(np.intp), b.astype(np.intp)
+        if a.shape != b.shape:  # Sin esto NumPy haría broadcasting (p. ej. con un solo factor)
+            raise ValueError("a y b deben tener la misma cantidad de factores.")
+        if a.size and (a.min() < 1 or a.max() > n or b.min() < 1 or b.max() > n):
+            raise ValueError(f"Los factores deben estar entre 1 y {n}.")
+        return tabla[a - 1, b - 1]
+    if hasattr(a, "__len__") and hasattr(b, "__len__") and len(a) != len(b):
+        raise ValueError("a y b deben tener la misma cantidad de factores.")
+    resultado = []
+    for x, y in zip(a, b, strict=True):  # strict: también con iteradores sin len()
+        if not all(isinstance(f, numbers.Integral) and not isinstance(f, bool) for f in (x, y)):
+            raise ValueError("Los factores deben ser enteros.")
+        if not (1 <= x <= n and 1 <= y <= n):
+            raise ValueError(f"Los factores deben estar entre 1 y {n}.")
+        resultado.append(tabla[x - 1][y - 1])
+    return resultado
+
 def pedir_factores(n):
     while True:
         try:
@@ -45,10 +178,33 @@ def pedir_factores(n):
         except ValueError:
             print("Entrada inválida. Usa números enteros.")
 
-def main():
-    n = 10                     # cambia este valor si quieres otra dimensión
-    tabla = construir_tabla(n) # lista de listas
-    mostrar_tabla(tabla)       # función que NO regresa valor
+def rango(texto):
+    """Convierte 'I:J' en la tupla (I, J) para --filas/--columnas."""
+    try:
+        desde, hasta = (int(x) for x in texto.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("Usa el formato I:J con números enteros (p. ej. 1:20).")
+    return desde, hasta
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tabla de Pitágoras sin usar '*'.")
+    parser.add_argument("--n", type=int, default=10, help="Dimensión de la tabla (por defecto 10)")
+    parser.add_argument("--virtual", action="store_true",
+                        help="Usa la tabla perezosa (no reserva n×n; útil para n grandes)")
+    parser.add_argument("--filas", type=rango, metavar="I:J", help="Muestra solo las filas I..J")
+    parser.add_argument("--columnas", type=rango, metavar="I:J", help="Muestra solo las columnas I..J")
+    parser.add_argument("--salida", help="Escribe la tabla en este archivo en lugar de la pantalla")
+    args = parser.parse_args(argv)
+    n = args.n
+    # lista de listas (referencia) o tabla perezosa con la misma interfaz
+    tabla = TablaVirtual(n) if args.virtual else construir_tabla(n)
+    if args.salida:
+        guardar_tabla(tabla, args.salida, args.filas, args.columnas)
+        print(f"Tabla escrita en '{args.salida}'.")
+    elif args.filas or args.columnas:
+        renderizar_tabla(tabla, filas=args.filas, columnas=args.columnas)
+    else:
+        mostrar_tabla(tabla)   # función que NO regresa valor
     a, b = pedir_factores(n)
     resultado = producto(tabla, a, b)  # función que SÍ regresa valor
     print(f"\nResultado: {a} × {b} = {resultado}")
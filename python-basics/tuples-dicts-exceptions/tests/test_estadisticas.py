@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del conteo de reemplazos: por bloques y en paralelo debe coincidir con str.count."""
+import io
+
+import pytest
+
+from tuples_dicts_exceptions_strings import estadisticas_archivo, estadisticas_texto
+
+OBJETIVOS = ["aa", "aba", "a a", "poderosa"]
+
+
+def test_objetivo_que_se_encima_cuenta_como_str_count():
+    texto = "a" * 11
+    stats = estadisticas_texto(io.StringIO(texto), objetivos=["aa"], tam_bloque=4)
+    assert stats.reemplazos["aa"] == texto.count("aa") == 5
+
+
+@pytest.mark.parametrize("tam_bloque", [1, 2, 3, 5, 8])
+def test_por_bloques_coincide_con_str_count(tam_bloque):
+    texto = "aaaa abab aaa ababa a aa la poderosa aaaaa"
+    stats = estadisticas_texto(io.StringIO(texto), objetivos=OBJETIVOS, tam_bloque=tam_bloque)
+    assert stats.reemplazos == {o: texto.count(o) for o in OBJETIVOS}
+
+
+@pytest.mark.parametrize("procesos", [2, 3, 7])
+def test_en_paralelo_coincide_con_str_count(tmp_path, procesos):
+    texto = "aaaa aaa a ababa aaaaa " * 200 + "la poderosa aa"
+    ruta = tmp_path / "texto.txt"
+    ruta.write_text(texto, encoding="utf-8")
+    stats = estadisticas_archivo(ruta, objetivos=OBJETIVOS, procesos=procesos, tam_bloque=7)
+    assert stats.reemplazos == {o: texto.count(o) for o in OBJETIVOS}
+    assert stats.palabras == len(texto.split())
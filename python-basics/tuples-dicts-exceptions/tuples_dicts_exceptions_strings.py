@@ -6,31 +6,99 @@ Autor: Alexis Ayala
 Descripción:
     Programa interactivo con menú que demuestra:
     - Uso de tuplas (creación, acceso, "agregado" vía captura, conversión y ordenamiento).
-    - Función que suma valores de una tupla de números.
+    - Función que suma valores de una tupla de números (también arreglos con protocolo de búfer
+      como array.array, memoryview o NumPy, sin copiarlos; modo preciso con math.fsum).
     - Uso de diccionarios (creación, inserción por entrada, recorrido, búsqueda por función).
+      DirectorioContactos mantiene un índice sin mayúsculas/minúsculas (búsqueda O(1)),
+      búsqueda por prefijo (autocompletar), búsqueda aproximada por trigramas (tolera errores
+      de dedo) y carga masiva desde CSV.
     - Manejo de excepciones (captura de entradas no numéricas y excepción personalizada para división entre cero).
+      dividir_lote divide arreglos completos en una llamada y reporta las filas con divisor cero
+      según una política (error, NaN u omitir).
     - Uso de strings (longitud, mayúsculas, reemplazo, conteo de palabras por función).
+      estadisticas_texto/estadisticas_archivo calculan las mismas métricas por bloques, con
+      memoria constante, para textos de varios GB (opcionalmente en varios procesos).
 """
 
-from typing import Tuple, Dict
+import bisect
+import codecs
+import csv
+import functools
+import heapq
+import math
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, TextIO, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
 
 # --------------------------
 # Sección: Tuplas
 # --------------------------
-def sumar_tupla(numeros: Tuple[float, ...]) -> float:
+# Códigos de struct numéricos que puede tener un búfer (array.array, memoryview, NumPy)
+_FORMATOS_NUMERICOS = frozenset("bBhHiIlLqQnNfd?")
+
+
+def _vista_numerica(numeros) -> Optional[memoryview]:
+    """
+    memoryview 1-D (sin copiar) de un objeto con protocolo de búfer, o None si no lo tiene
+    o su formato no se puede recorrer directamente (p. ej. orden de bytes no nativo).
+    El tipo se valida una sola vez con el formato del búfer, no elemento por elemento.
+    """
+    try:
+        vista = memoryview(numeros)
+    except TypeError:
+        return None
+    if vista.format not in _FORMATOS_NUMERICOS:
+        if vista.format.lstrip("@") in _FORMATOS_NUMERICOS:
+            return vista.cast("B").cast(vista.format.lstrip("@"))
+        if vista.format.lstrip("=<>!") in _FORMATOS_NUMERICOS:
+            return None
+        raise TypeError("El búfer contiene elementos no numéricos.")
+    if vista.ndim != 1:
+        if not vista.c_contiguous:
+            return None
+        vista = vista.cast("B").cast(vista.format)
+    return vista
+
+
+def sumar_tupla(numeros: Union[Tuple[float, ...], Sequence[float]], preciso: bool = False) -> float:
     """
     Recibe una tupla de números y retorna la suma.
 
-    :param numeros: tupla de valores numéricos (int/float)
+    - Tuplas y listas: se validan los tipos distintos (no cada elemento) y se suma con sum()
+      (en C, mismo orden que un ciclo for, así que el resultado es idéntico).
+    - array.array, memoryview, bytes o arreglos NumPy: se suman sin copiarlos; el tipo se
+      valida una vez por contenedor (su formato o dtype). NumPy usa suma por pares.
+
+    :param numeros: tupla de valores numéricos (int/float) o arreglo numérico
+    :param preciso: True para sumar con math.fsum (sin error de redondeo acumulado)
     :return: suma de los elementos
+    :raises TypeError: si algún elemento no es numérico
     """
-    # Validación simple: asegurar que todos sean numéricos
-    total = 0.0
-    for n in numeros:
-        if not isinstance(n, (int, float)):
-            raise TypeError("La tupla contiene elementos no numéricos.")
-        total += n
-    return total
+    if not isinstance(numeros, (tuple, list)):
+        if np is not None and isinstance(numeros, np.ndarray):
+            if numeros.dtype.kind not in "biuf":
+                raise TypeError("El arreglo contiene elementos no numéricos.")
+            if not preciso:
+                return float(np.sum(numeros, dtype=np.float64))
+            # fsum recorre un búfer 1-D nativo (solo se copia si no es contiguo o nativo)
+            tipo = np.float64 if numeros.dtype == np.float16 else numeros.dtype.newbyteorder("=")
+            numeros = np.ascontiguousarray(numeros.ravel(), dtype=tipo)
+        vista = _vista_numerica(numeros)
+        if vista is not None:
+            return math.fsum(vista) if preciso else float(sum(vista, 0.0))
+        numeros = tuple(numeros)
+    # Validación por tipo, no por elemento: se juntan los tipos distintos (en C) y se revisan
+    # solo esos (una tupla de floats tiene un único tipo)
+    if not all(issubclass(tipo, (int, float)) for tipo in set(map(type, numeros))):
+        raise TypeError("La tupla contiene elementos no numéricos.")
+    return math.fsum(numeros) if preciso else sum(numeros, 0.0)
 
 
 def demo_tuplas():
@@ -66,15 +134,276 @@ def demo_tuplas():
 # --------------------------
 # Sección: Diccionarios
 # --------------------------
-def buscar_contacto(contactos: Dict[str, str], nombre: str) -> str | None:
+def trigramas(texto: str) -> Set[str]:
+    """
+    Trigramas de un texto (sin mayúsculas), con relleno al inicio y al final para que las
+    primeras y últimas letras pesen igual que las del medio: 'ana' -> {'  a', ' an', 'ana', 'na '}.
+
+    :param texto: texto a descomponer
+    :return: conjunto de trigramas
+    """
+    relleno = "  " + " ".join(texto.casefold().split()) + " "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+class DirectorioContactos:
+    """
+    Directorio de contactos con búsqueda no sensible a mayúsculas/minúsculas en O(1).
+
+    - `_indice` guarda {nombre casefold: (nombre original, teléfono)} y se mantiene al
+      agregar o eliminar, así que buscar no recorre el directorio.
+    - `_claves` es la lista ordenada de nombres casefold para búsqueda por prefijo (bisect).
+      Tras una carga masiva se reordena una sola vez, en la siguiente búsqueda por prefijo.
+    - Búsqueda aproximada en dos niveles: `_palabras` {palabra: nombres casefold que la
+      contienen} y `_trigramas` {trigrama: palabras}. Las palabras distintas son muchas menos
+      que los contactos, así que la parte difusa trabaja sobre un vocabulario chico. Ambos
+      índices se construyen en la primera consulta y después se mantienen al agregar/eliminar.
+    - Dos nombres que solo difieren en mayúsculas son el mismo contacto: el último gana.
+    """
+
+    def __init__(self, contactos: Optional[Dict[str, str]] = None) -> None:
+        self._indice: Dict[str, Tuple[str, str]] = {}
+        self._claves: List[str] = []
+        self._claves_ordenadas = True
+        self._palabras: Optional[Dict[str, Set[str]]] = None
+        self._trigramas: Dict[str, Set[str]] = {}
+        if contactos:
+            self.agregar_muchos(contactos.items())
+
+    def __len__(self) -> int:
+        return len(self._indice)
+
+    def __contains__(self, nombre: str) -> bool:
+        return nombre.casefold() in self._indice
+
+    def agregar(self, nombre: str, telefono: str) -> None:
+        """
+        Agrega o actualiza un contacto.
+
+        :param nombre: nombre del contacto (se conserva tal como se escribió)
+        :param telefono: número telefónico
+        """
+        clave = nombre.casefold()
+        if clave not in self._indice:
+            if self._claves_ordenadas:
+                bisect.insort(self._claves, clave)
+            else:
+                self._claves.append(clave)
+            self._indexar_palabras(clave)
+        self._indice[clave] = (nombre, telefono)
+
+    def agregar_muchos(self, pares: Iterable[Tuple[str, str]]) -> int:
+        """
+        Carga masiva: agrega sin mantener el orden y reordena una sola vez después.
+
+        :param pares: iterable de (nombre, teléfono)
+        :return: cantidad de pares procesados
+        """
+        cantidad = 0
+        for nombre, telefono in pares:
+            clave = nombre.casefold()
+            if clave not in self._indice:
+                self._claves.append(clave)
+                self._claves_ordenadas = False
+                self._indexar_palabras(clave)
+            self._indice[clave] = (nombre, telefono)
+            cantidad += 1
+        return cantidad
+
+    def eliminar(self, nombre: str) -> bool:
+        """
+        Elimina un contacto.
+
+        :param nombre: nombre a eliminar (no sensible a mayúsculas/minúsculas)
+        :return: True si existía
+        """
+        clave = nombre.casefold()
+        if self._indice.pop(clave, None) is None:
+            return False
+        self._ordenar()
+        pos = bisect.bisect_left(self._claves, clave)
+        del self._claves[pos]
+        if self._palabras is not None:
+            for palabra in set(clave.split()):
+                nombres = self._palabras[palabra]
+                nombres.discard(clave)
+                if not nombres:  # la palabra ya no aparece en ningún contacto
+                    del self._palabras[palabra]
+                    for t in trigramas(palabra):
+                        self._trigramas[t].discard(palabra)
+        return True
+
+    def buscar(self, nombre: str) -> Optional[str]:
+        """
+        Busca un contacto por nombre.
+
+        :param nombre: nombre a buscar (no sensible a mayúsculas/minúsculas)
+        :return: número telefónico o None si no existe
+        """
+        encontrado = self._indice.get(nombre.casefold())
+        return encontrado[1] if encontrado is not None else None
+
+    def buscar_prefijo(self, prefijo: str, limite: int = 10) -> List[Tuple[str, str]]:
+        """
+        Autocompletar: contactos cuyo nombre empieza con `prefijo`, en orden alfabético.
+
+        :param prefijo: inicio del nombre (no sensible a mayúsculas/minúsculas)
+        :param limite: máximo de resultados
+        :return: lista de (nombre, teléfono)
+        """
+        self._ordenar()
+        clave = prefijo.casefold()
+        resultado = []
+        pos = bisect.bisect_left(self._claves, clave)
+        while pos < len(self._claves) and len(resultado) < limite:
+            candidata = self._claves[pos]
+            if not candidata.startswith(clave):
+                break
+            resultado.append(self._indice[candidata])
+            pos += 1
+        return resultado
+
+    def buscar_aproximado(self, nombre: str, limite: int = 5,
+                          umbral: float = 0.3) -> List[Tuple[str, str, float]]:
+        """
+        Búsqueda tolerante a errores de dedo por similitud de trigramas (Jaccard).
+
+        1) Cada palabra de la consulta que no existe tal cual se compara contra el vocabulario
+           de palabras con el índice de trigramas (solo se califican las que comparten
+           trigramas con ella).
+        2) Los contactos que contienen esas palabras reciben un puntaje preliminar (suma de
+           similitudes por palabra), empezando por las palabras más raras, y solo los mejores
+           se califican con la similitud de trigramas del nombre completo.
+
+        Límite conocido: los contactos de cada palabra parecida crecen con el directorio, así
+        que el costo también. Con bench_suite (nombres sintéticos, un error de dedo por
+        consulta) da ~0.05 ms con 1k contactos, ~0.5-0.6 ms con 100k y ~1.1-1.2 ms con 500k:
+        por debajo de 1 ms solo hasta unos cientos de miles de contactos.
+
+        :param nombre: texto buscado
+        :param limite: máximo de resultados (top-k)
+        :param umbral: similitud mínima del nombre completo, entre 0 y 1
+        :return: lista de (nombre, teléfono, similitud), de mayor a menor similitud
+        """
+        consulta = trigramas(nombre)
+        if len(consulta) < 2:  # texto vacío
+            return []
+        if self._palabras is None:
+            self._palabras = {}
+            for clave in self._indice:
+                self._indexar_palabras(clave)
+
+        # Palabras de la consulta de la más rara a la más común (por contactos que la contienen)
+        grupos = []
+        for palabra in set(nombre.casefold().split()):
+            parecidas = self._palabras_parecidas(palabra, umbral)
+            grupos.append((sum(len(self._palabras[p]) for p, _ in parecidas), parecidas))
+        grupos.sort(key=lambda grupo: grupo[0])
+
+        preliminar: Counter = Counter()
+        for total, parecidas in grupos:
+            # Una palabra muy común (p. ej. 'maría') ya no agrega candidatos: solo suma puntos
+            # a los que aportaron las palabras más raras, sin recorrer sus miles de contactos
+            solo_sumar = bool(preliminar) and total > 4 * len(preliminar)
+            for parecida, similitud in parecidas:
+                nombres = self._palabras[parecida]
+                if solo_sumar:
+                    for clave in [c for c in preliminar if c in nombres]:
+                        preliminar[clave] += similitud
+                elif similitud == 1.0:
+                    preliminar.update(nombres)  # palabra exacta: +1 por contacto, en C
+                else:
+                    for clave in nombres:
+                        preliminar[clave] += similitud
+        finalistas = heapq.nlargest(max(limite * 10, 50), preliminar.items(), key=lambda par: par[1])
+
+        puntajes = []
+        for clave, _ in finalistas:
+            propios = trigramas(clave)
+            comunes = len(consulta & propios)
+            similitud = comunes / (len(consulta) + len(propios) - comunes)
+            if similitud >= umbral:
+                puntajes.append((similitud, clave))
+        mejores = heapq.nlargest(limite, puntajes)
+        return [(*self._indice[clave], round(similitud, 3)) for similitud, clave in mejores]
+
+    def _palabras_parecidas(self, palabra: str, umbral: float,
+                            maximo: int = 20) -> List[Tuple[str, float]]:
+        """Palabras del vocabulario parecidas a `palabra` (ella misma si existe tal cual)."""
+        if palabra in self._palabras:
+            return [(palabra, 1.0)]
+        consulta = trigramas(palabra)
+        comunes: Counter = Counter()
+        for t in consulta:
+            comunes.update(self._trigramas.get(t, ()))  # el conteo corre en C
+        # Para llegar al umbral hay que compartir al menos ceil(umbral * |consulta|) trigramas
+        minimo = math.ceil(umbral * len(consulta) - 1e-9)
+        parecidas = []
+        for candidata, n in comunes.items():
+            if n >= minimo:
+                # Cada palabra tiene len + 1 trigramas con relleno (menos los repetidos, raros)
+                similitud = n / (len(consulta) + len(candidata) + 1 - n)
+                if similitud >= umbral:
+                    parecidas.append((candidata, similitud))
+        return heapq.nlargest(maximo, parecidas, key=lambda par: par[1])
+
+    def cargar_csv(self, origen: Union[str, TextIO]) -> int:
+        """
+        Carga contactos desde un CSV con columnas nombre,telefono (encabezado opcional).
+
+        :param origen: ruta del archivo o flujo de texto ya abierto
+        :return: cantidad de contactos leídos
+        :raises ValueError: si una fila no tiene las dos columnas
+        """
+        if isinstance(origen, str):
+            with open(origen, newline="", encoding="utf-8") as f:
+                return self.cargar_csv(f)
+
+        def filas():
+            for numero, fila in enumerate(csv.reader(origen), start=1):
+                if not fila:
+                    continue
+                if len(fila) < 2 or not fila[0].strip():
+                    raise ValueError(f"Fila {numero} inválida: se esperaba nombre,telefono.")
+                nombre, telefono = fila[0].strip(), fila[1].strip()
+                if numero == 1 and (nombre.casefold(), telefono.casefold()) == ("nombre", "telefono"):
+                    continue  # encabezado
+                yield nombre, telefono
+
+        return self.agregar_muchos(filas())
+
+    def a_dict(self) -> Dict[str, str]:
+        """Regresa los contactos como diccionario {nombre: teléfono}."""
+        return dict(self._indice.values())
+
+    def _indexar_palabras(self, clave: str) -> None:
+        if self._palabras is None:
+            return
+        for palabra in clave.split():
+            nombres = self._palabras.get(palabra)
+            if nombres is None:  # palabra nueva en el vocabulario
+                nombres = self._palabras[palabra] = set()
+                for t in trigramas(palabra):
+                    self._trigramas.setdefault(t, set()).add(palabra)
+            nombres.add(clave)
+
+    def _ordenar(self) -> None:
+        if not self._claves_ordenadas:
+            self._claves.sort()
+            self._claves_ordenadas = True
+
+
+def buscar_contacto(contactos: Union[Dict[str, str], DirectorioContactos], nombre: str) -> str | None:
     """
     Busca un contacto por nombre (clave) y retorna su teléfono si existe.
 
-    :param contactos: diccionario {nombre: telefono}
+    :param contactos: diccionario {nombre: telefono} o DirectorioContactos (búsqueda O(1))
     :param nombre: nombre a buscar (no sensible a mayúsculas/minúsculas)
     :return: número telefónico o None si no existe
     """
-    # Búsqueda no sensible a mayúsculas/minúsculas
+    if isinstance(contactos, DirectorioContactos):
+        return contactos.buscar(nombre)
+    # Diccionario simple: búsqueda lineal no sensible a mayúsculas/minúsculas
     nombre_normalizado = nombre.casefold()
     for k, v in contactos.items():
         if k.casefold() == nombre_normalizado:
@@ -92,12 +421,14 @@ def demo_diccionarios():
         "Carla": "55-1111-2222",
     }
     print("Diccionario inicial:", contactos)
+    directorio = DirectorioContactos(contactos)  # índice para búsquedas rápidas
 
     # 2) Agregar un nuevo contacto vía captura
     nombre = input("Nombre del nuevo contacto: ").strip()
     telefono = input("Teléfono del nuevo contacto: ").strip()
     if nombre:
         contactos[nombre] = telefono
+        directorio.agregar(nombre, telefono)
     print("Diccionario actualizado:", contactos)
 
     # 3) Iterar sobre claves e imprimir nombres
@@ -109,11 +440,20 @@ def demo_diccionarios():
 
     # 5) Aplicar la función para buscar un número
     buscar = input("¿Qué contacto deseas buscar?: ").strip()
-    numero = buscar_contacto(contactos, buscar)
+    numero = buscar_contacto(directorio, buscar)
     if numero is not None:
         print(f"Teléfono de {buscar}: {numero}")
     else:
         print(f"No se encontró el contacto '{buscar}'.")
+        parecidos = directorio.buscar_aproximado(buscar, limite=3) if buscar else []
+        if parecidos:
+            print("¿Quisiste decir?")
+            for nombre_parecido, telefono_parecido, similitud in parecidos:
+                print(f"- {nombre_parecido}: {telefono_parecido} (similitud {similitud:.0%})")
+        else:
+            sugerencias = directorio.buscar_prefijo(buscar, limite=3) if buscar else []
+            if sugerencias:
+                print("Contactos que empiezan así:", ", ".join(n for n, _ in sugerencias))
 
 
 # --------------------------
@@ -130,6 +470,69 @@ def dividir(a: int, b: int) -> float:
     return a / b
 
 
+POLITICAS_DIVISION = ("error", "nan", "omitir")
+
+
+@dataclass
+class ResultadoDivision:
+    """
+    Resultado de dividir_lote.
+
+    - valores: cocientes (ndarray de float64 con NumPy, lista en otro caso). Con la política
+      "omitir" solo incluye las filas con divisor distinto de cero.
+    - ceros: índices (0-indexados) de las filas cuyo divisor era cero.
+    """
+    valores: Sequence[float]
+    ceros: Sequence[int]
+
+
+def dividir_lote(a: Sequence[float], b: Sequence[float], politica: str = "error") -> ResultadoDivision:
+    """
+    Divide a[i] / b[i] para todas las filas en una sola llamada (vectorizado con NumPy si
+    está disponible), sin un try/except por fila.
+
+    :param a: dividendos (secuencia o arreglo numérico)
+    :param b: divisores, del mismo largo que `a`
+    :param politica: qué hacer con los divisores cero:
+        "error"  -> lanza DivisionEntreCeroError con la primera fila en cero (modo estricto),
+        "nan"    -> esas filas quedan como NaN,
+        "omitir" -> esas filas no aparecen en `valores`.
+    :return: ResultadoDivision con los cocientes y los índices de las filas en cero
+    :raises ValueError: si la política no existe o los largos no coinciden
+    :raises TypeError: si los datos no son numéricos
+    """
+    if politica not in POLITICAS_DIVISION:
+        raise ValueError(f"Política desconocida: {politica}. Opciones: {', '.join(POLITICAS_DIVISION)}")
+    if len(a) != len(b):
+        raise ValueError("Los dividendos y divisores deben tener el mismo largo.")
+
+    if np is not None:
+        dividendos, divisores = np.asarray(a), np.asarray(b)
+        if dividendos.dtype.kind not in "biuf" or divisores.dtype.kind not in "biuf":
+            raise TypeError("Los dividendos y divisores deben ser numéricos.")
+        cero = divisores == 0
+        ceros = np.flatnonzero(cero)
+        if ceros.size and politica == "error":
+            raise DivisionEntreCeroError(f"No es posible dividir entre cero (fila {ceros[0]}).")
+        if politica == "omitir":
+            validas = ~cero
+            return ResultadoDivision(np.true_divide(dividendos[validas], divisores[validas],
+                                                    dtype=np.float64), ceros)
+        # Las filas en cero se dividen entre 1 y después se marcan como NaN
+        valores = np.true_divide(dividendos, np.where(cero, 1, divisores), dtype=np.float64)
+        valores[cero] = np.nan
+        return ResultadoDivision(valores, ceros)
+
+    ceros = [i for i, divisor in enumerate(b) if divisor == 0]
+    if ceros and politica == "error":
+        raise DivisionEntreCeroError(f"No es posible dividir entre cero (fila {ceros[0]}).")
+    if politica == "omitir":
+        valores = [x / y for x, y in zip(a, b) if y != 0]
+    else:
+        valores = [x / y if y != 0 else math.nan for x, y in zip(a, b)]
+    return ResultadoDivision(valores, ceros)
+
+
 def demo_excepciones():
     print("\n--- DEMO: Excepciones ---")
     try:
@@ -162,6 +565,263 @@ def contar_palabras(texto: str) -> int:
     return len(texto.split())
 
 
+# Palabras que demo_strings reemplaza; estadisticas_texto cuenta sus apariciones
+OBJETIVOS_REEMPLAZO = ("poderosa",)
+PUNTUACION = ".,;:!?¿¡\"'()[]{}«»…-—"
+TAM_BLOQUE = 1024 * 1024
+_ESPACIOS_ASCII = b" \t\n\r\x0b\x0c"
+
+
+def _se_solapa(objetivo: str) -> bool:
+    """True si dos apariciones del objetivo pueden encimarse ('aa', 'abab')."""
+    return any(objetivo[:k] == objetivo[-k:] for k in range(1, len(objetivo)))
+
+
+def _contar_desde(texto: str, objetivo: str, inicio: int, se_solapa: bool) -> Tuple[int, int]:
+    """
+    Apariciones de `objetivo` en texto[inicio:] sin encimarse, de izquierda a derecha (como
+    str.count), y la posición justo después de la última (`inicio` si no hay ninguna).
+    """
+    n = texto.count(objetivo, inicio)
+    if not n:
+        return 0, inicio
+    if not se_solapa:
+        return n, texto.rfind(objetivo, inicio) + len(objetivo)
+    fin = inicio
+    for _ in range(n):
+        fin = texto.find(objetivo, fin) + len(objetivo)
+    return n, fin
+
+
+@dataclass
+class EstadisticasTexto:
+    """
+    Resultado del conteo por bloques.
+
+    - palabras: igual que contar_palabras (separación por espacios en blanco).
+    - caracteres: igual que len(texto).
+    - frecuencias: palabras sin mayúsculas ni puntuación alrededor (crece con el vocabulario,
+      no con el texto; se puede desactivar).
+    - reemplazos: apariciones de cada objetivo, como las que reemplazaría str.replace.
+    """
+    palabras: int = 0
+    caracteres: int = 0
+    frecuencias: Counter = field(default_factory=Counter)
+    reemplazos: Dict[str, int] = field(default_factory=dict)
+    # Primeros/últimos caracteres del texto: permiten contar objetivos que cruzan el corte
+    # entre dos rangos procesados por separado (ver estadisticas_archivo)
+    borde_inicial: str = field(default="", repr=False)
+    borde_final: str = field(default="", repr=False)
+    # Por objetivo y por cada inicio posible s < len(objetivo): (apariciones contando desde s,
+    # posición tras la última). Así combinar sigue el mismo recorrido que str.count aunque
+    # una aparición cruce el corte y mueva el punto de partida de la parte siguiente.
+    inicios: Dict[str, List[Tuple[int, int]]] = field(default_factory=dict, repr=False)
+
+    def mas_frecuentes(self, n: int = 10) -> List[Tuple[str, int]]:
+        """
+        Las `n` palabras más frecuentes.
+
+        :param n: cantidad de palabras
+        :return: lista de (palabra, veces), de mayor a menor
+        """
+        return self.frecuencias.most_common(n)
+
+    def combinar(self, siguiente: "EstadisticasTexto") -> "EstadisticasTexto":
+        """
+        Junta las estadísticas de dos partes consecutivas de un mismo texto.
+        El corte entre ambas debe caer en un espacio en blanco (ninguna palabra se parte) y cada
+        parte no vacía debe tener al menos tantos caracteres como el objetivo más largo.
+        """
+        if not siguiente.caracteres:
+            return self
+        if not self.caracteres:
+            return siguiente
+        solape = max((len(o) for o in self.reemplazos), default=1) - 1
+        cola = self.borde_final
+        union = cola + siguiente.borde_inicial
+        base = self.caracteres - len(cola)   # posición de `cola` dentro de esta parte
+        inicios = {}
+        for objetivo, estados in self.inicios.items():
+            combinados = []
+            for n, fin in estados:
+                # La primera aparición desde `fin` cruza el corte si empieza antes de él (las que
+                # caben completas en esta parte ya están contadas); la siguiente parte se
+                # recorre desde donde termina esa aparición
+                i = union.find(objetivo, max(0, fin - base))
+                cruza = 0 <= i < len(cola)
+                n_sig, fin_sig = siguiente.inicios[objetivo][i + len(objetivo) - len(cola) if cruza else 0]
+                combinados.append((n + cruza + n_sig, self.caracteres + fin_sig))
+            inicios[objetivo] = combinados
+        reemplazos = {objetivo: estados[0][0] for objetivo, estados in inicios.items()}
+        borde_inicial = (self.borde_inicial + siguiente.borde_inicial)[:solape]
+        borde_final = (self.borde_final + siguiente.borde_final)[-solape:] if solape else ""
+        return EstadisticasTexto(
+            self.palabras + siguiente.palabras,
+            self.caracteres + siguiente.caracteres,
+            self.frecuencias + siguiente.frecuencias,
+            reemplazos, borde_inicial, borde_final, inicios,
+        )
+
+
+def estadisticas_texto(bloques: Union[str, Iterable[str], TextIO],
+                       objetivos: Iterable[str] = OBJETIVOS_REEMPLAZO,
+                       frecuencias: bool = True, tam_bloque: int = TAM_BLOQUE) -> EstadisticasTexto:
+    """
+    Calcula palabras, caracteres, frecuencias y apariciones de `objetivos` leyendo el texto
+    por bloques (un str, una lista de bloques o un archivo de texto abierto).
+
+    Una palabra partida entre dos bloques se guarda como pendiente y se completa con el
+    siguiente. Los objetivos se buscan sobre el final del bloque anterior + el bloque nuevo,
+    continuando justo después de la última aparición contada: el resultado es el de str.count
+    también para objetivos que se enciman ('aa' en 'aaaaa' cuenta 2).
+
+    :param bloques: texto completo, iterable de fragmentos consecutivos o archivo de texto
+                    (se lee con read(tam_bloque), no por líneas: un texto sin saltos de línea
+                    tampoco se carga completo)
+    :param objetivos: subcadenas a contar (sensible a mayúsculas, como str.replace)
+    :param frecuencias: False para no llevar el conteo por palabra (memoria constante)
+    :param tam_bloque: caracteres leídos por bloque cuando `bloques` es un archivo
+    :return: EstadisticasTexto
+    """
+    if isinstance(bloques, str):
+        bloques = (bloques,)
+    elif hasattr(bloques, "read"):
+        bloques = iter(functools.partial(bloques.read, tam_bloque), "")
+    objetivos = tuple(o for o in objetivos if o)
+    solape = max((len(o) for o in objetivos), default=1) - 1
+    resultado = EstadisticasTexto(reemplazos=dict.fromkeys(objetivos, 0))
+    solapados = {o: _se_solapa(o) for o in objetivos}
+    # [apariciones, posición desde la que se sigue buscando] por objetivo; los que se enciman
+    # llevan un recorrido por cada inicio posible (ver EstadisticasTexto.inicios)
+    recorridos = {o: [[0, s] for s in range(len(o) if solapados[o] else 1)] for o in objetivos}
+    primeras: Dict[str, int] = {}   # posición de la primera aparición de cada objetivo
+    pendiente = ""   # palabra (sin casefold) que quedó abierta al final del bloque anterior
+    cola = ""        # últimos `solape` caracteres ya procesados
+    for bloque in bloques:
+        if not bloque:
+            continue
+        if resultado.caracteres < solape:
+            resultado.borde_inicial = (resultado.borde_inicial + bloque)[:solape]
+        if objetivos:
+            ventana = cola + bloque
+            base = resultado.caracteres - len(cola)   # posición de `ventana` en el texto
+            for objetivo, estados in recorridos.items():
+                for estado in estados:
+                    desde = max(0, estado[1] - base)
+                    n, fin = _contar_desde(ventana, objetivo, desde, solapados[objetivo])
+                    if n:
+                        if objetivo not in primeras:
+                            primeras[objetivo] = base + ventana.find(objetivo, desde)
+                        estado[0] += n
+                        estado[1] = base + fin
+            cola = ventana[-solape:] if solape else ""
+        resultado.caracteres += len(bloque)
+
+        texto = pendiente + bloque
+        partes = texto.split()
+        pendiente = partes.pop() if partes and not texto[-1].isspace() else ""
+        resultado.palabras += len(partes)
+        if frecuencias and partes:
+            # Se cuentan los tokens tal cual (en C) y solo se normalizan los distintos
+            for palabra, veces in Counter(partes).items():
+                resultado.frecuencias[palabra.strip(PUNTUACION).casefold()] += veces
+    if pendiente:
+        resultado.palabras += 1
+        if frecuencias:
+            resultado.frecuencias[pendiente.strip(PUNTUACION).casefold()] += 1
+    resultado.frecuencias.pop("", None)  # tokens que eran solo puntuación
+    resultado.borde_final = cola
+    for objetivo, estados in recorridos.items():
+        n, fin = estados[0]
+        resultado.reemplazos[objetivo] = n
+        if solapados[objetivo]:
+            resultado.inicios[objetivo] = [(n_s, fin_s) for n_s, fin_s in estados]
+        else:
+            # Sin encimarse, empezar en s < len(objetivo) solo puede saltar la primera aparición
+            primera = primeras.get(objetivo, len(objetivo))
+            resultado.inicios[objetivo] = [
+                (n - 1, fin if n > 1 else s) if primera < s else (n, fin if n else s)
+                for s in range(len(objetivo))
+            ]
+    return resultado
+
+
+def _bloques_rango(ruta: str, inicio: int, fin: int, tam_bloque: int) -> Iterator[str]:
+    """Decodifica (UTF-8) los bytes [inicio, fin) del archivo en bloques de texto."""
+    decodificador = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with open(ruta, "rb") as f:
+        f.seek(inicio)
+        restantes = fin - inicio
+        while restantes > 0:
+            datos = f.read(min(tam_bloque, restantes))
+            if not datos:
+                break
+            restantes -= len(datos)
+            yield decodificador.decode(datos)
+        yield decodificador.decode(b"", final=True)
+
+
+def _estadisticas_rango(ruta: str, inicio: int, fin: int, objetivos: Tuple[str, ...],
+                        frecuencias: bool, tam_bloque: int) -> EstadisticasTexto:
+    return estadisticas_texto(_bloques_rango(ruta, inicio, fin, tam_bloque), objetivos, frecuencias)
+
+
+def _cortes_en_espacios(ruta: str, partes: int) -> List[int]:
+    """
+    Divide el archivo en `partes` rangos de bytes parecidos. Cada corte se recorre hasta el
+    siguiente espacio ASCII: así ninguna palabra se parte y el corte nunca cae a la mitad
+    de un carácter UTF-8 de varios bytes.
+    """
+    tamano = os.path.getsize(ruta)
+    cortes = [0]
+    with open(ruta, "rb") as f:
+        for i in range(1, partes):
+            posicion = max(tamano * i // partes, cortes[-1])
+            f.seek(posicion)
+            while True:
+                datos = f.read(64 * 1024)
+                if not datos:
+                    posicion = tamano
+                    break
+                saltos = [datos.find(bytes([b])) for b in _ESPACIOS_ASCII]
+                saltos = [s for s in saltos if s >= 0]
+                if saltos:
+                    posicion += min(saltos)
+                    break
+                posicion += len(datos)
+            cortes.append(posicion)
+    cortes.append(tamano)
+    return cortes
+
+
+def estadisticas_archivo(ruta: str, objetivos: Iterable[str] = OBJETIVOS_REEMPLAZO,
+                         frecuencias: bool = True, procesos: int = 1,
+                         tam_bloque: int = TAM_BLOQUE) -> EstadisticasTexto:
+    """
+    Estadísticas de un archivo de texto UTF-8 de cualquier tamaño, con memoria constante.
+
+    :param ruta: ruta del archivo
+    :param objetivos: subcadenas a contar
+    :param frecuencias: False para no llevar el conteo por palabra
+    :param procesos: >1 reparte rangos de bytes entre varios procesos y junta los resultados
+    :param tam_bloque: bytes leídos por bloque
+    :return: EstadisticasTexto
+    """
+    objetivos = tuple(objetivos)
+    if procesos <= 1:
+        return _estadisticas_rango(ruta, 0, os.path.getsize(ruta), objetivos, frecuencias, tam_bloque)
+    cortes = _cortes_en_espacios(ruta, procesos)
+    rangos = list(zip(cortes, cortes[1:]))
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        futuros = [ejecutor.submit(_estadisticas_rango, ruta, inicio, fin, objetivos, frecuencias, tam_bloque)
+                   for inicio, fin in rangos]
+        partes = [futuro.result() for futuro in futuros]
+    resultado = partes[0]
+    for parte in partes[1:]:
+        resultado = resultado.combinar(parte)
+    return resultado
+
+
 def demo_strings():
     print("\n--- DEMO: Strings ---")
 
@@ -183,6 +843,11 @@ def demo_strings():
     # 6) Aplicar función al mensaje
     print("Cantidad de palabras en el mensaje:", contar_palabras(mensaje))
 
+    # 7) Las mismas métricas por bloques (la versión que sirve para archivos grandes)
+    stats = estadisticas_texto(mensaje)
+    print("Palabras más frecuentes:", stats.mas_frecuentes(3))
+    print("Apariciones de 'poderosa':", stats.reemplazos["poderosa"])
+
 
 # --------------------------
 # Menú principal